@@ -1,13 +1,70 @@
 import sys
 import os
-from flask import Flask, render_template, request, redirect, url_for
+import json
+import threading
+from contextlib import closing
+from pathlib import Path
+from flask import Flask, Response, jsonify, render_template, request, redirect, url_for, stream_with_context
 
 # Import our fixed summarizer functions
-from summarizer_llm import get_text_from_url, summarize_text, check_model_availability, MODEL_NAME, test_ollama_connection
+from summarizer_llm import get_text_from_url, summarize_text, summarize_text_stream, check_model_availability, MODEL_NAME, test_ollama_connection, transport_stats
+from jobs import JobQueue, QueueFullError
+from pipeline import summarize_urls
+from metrics import JOBS, REGISTRY
 
 # Initialize the Flask application
 app = Flask(__name__)
 
+# Render the result page right away and stream the summary into it as it is
+# generated, so the first words show up as soon as the model produces them.
+# False falls back to waiting for the full summary before responding.
+STREAM_SUMMARIES = True
+
+# Background jobs for the submit/poll API
+JOBS_PATH = Path(os.environ.get("SUMMARIZER_JOBS_PATH") or Path(__file__).parent / ".cache" / "jobs.sqlite3")
+JOB_WORKERS = 2  # concurrent fetch + summarize jobs
+JOB_QUEUE_SIZE = 100  # maximum number of jobs waiting to run
+
+# Batch summarization API
+BATCH_MAX_URLS = 500
+
+def summarize_job(params: dict) -> dict:
+    """Runs one summarization job from the job queue."""
+    url = params['url']
+    article_text = get_text_from_url(url)
+
+    if article_text is None:
+        raise ValueError("Could not fetch or read content from the URL.")
+    if len(article_text.strip()) < 100:
+        raise ValueError("The page doesn't seem to have enough content to summarize.")
+
+    summary = summarize_text(article_text, use_cache=params.get('use_cache', True))
+    if summary.startswith("Error:"):
+        raise RuntimeError(summary)
+
+    return {'url': url, 'summary': summary, 'original_length': len(article_text)}
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """Returns the job queue, opening JOBS_PATH and starting the workers on first use."""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(summarize_job, JOBS_PATH, max_workers=JOB_WORKERS, max_queued=JOB_QUEUE_SIZE)
+            _job_queue.start()
+        return _job_queue
+
+def serves_requests() -> bool:
+    """False in the watcher process of the debug reloader, which only restarts the server."""
+    return __name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+
+def sse_event(data: dict, event: str | None = None) -> str:
+    """Formats one server-sent event."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     """Handles the main page, both for displaying the form and processing it."""
@@ -20,6 +77,13 @@ def index():
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
 
+        use_cache = request.form.get('no_cache') is None
+
+        if STREAM_SUMMARIES:
+            # The page fetches and summarizes through /stream
+            stream_url = url_for('stream_summary', url=url, no_cache=None if use_cache else 1)
+            return render_template('result.html', summary="", url=url, stream_url=stream_url)
+
         # 1. Get text from the URL
         print(f"Fetching content from: {url}")
         article_text = get_text_from_url(url)
@@ -30,9 +94,9 @@ def index():
         if len(article_text.strip()) < 100:
             return render_template('index.html', error="The page doesn't seem to have enough content to summarize. Please try a different URL.")
         
-        # 2. Summarize the text using the model
+        # 2. Summarize the text using the model (repeat submissions hit the summary cache)
         print("Content fetched. Summarizing with Ollama...")
-        summary = summarize_text(article_text)
+        summary = summarize_text(article_text, use_cache=use_cache)
         print("Summary generated.")
 
         # 3. Show the result page
@@ -44,6 +108,107 @@ def index():
     # For a GET request, just show the main page
     return render_template('index.html')
 
+@app.route('/stream')
+def stream_summary():
+    """Streams the summary of ?url= as server-sent events while Ollama generates it."""
+    url = request.args.get('url', '')
+    use_cache = request.args.get('no_cache') is None
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+
+    def generate():
+        print(f"Fetching content from: {url}")
+        article_text = get_text_from_url(url)
+
+        if article_text is None:
+            yield sse_event({'error': "Could not fetch or read content from the URL. Please check the URL and try again."}, 'error')
+            return
+        if len(article_text.strip()) < 100:
+            yield sse_event({'error': "The page doesn't seem to have enough content to summarize. Please try a different URL."}, 'error')
+            return
+
+        yield sse_event({'original_length': len(article_text)}, 'meta')
+
+        print("Content fetched. Streaming summary from Ollama...")
+        try:
+            for token in summarize_text_stream(article_text, use_cache=use_cache):
+                yield sse_event({'token': token})
+        except Exception as e:
+            print(f"Error communicating with Ollama model: {e}")
+            yield sse_event({'error': f"Failed to get a summary from the AI model. Details: {str(e)}"}, 'error')
+            return
+        print("Summary generated.")
+        yield sse_event({}, 'done')
+
+    return Response(stream_with_context(generate()),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queues a summarization job and returns its id right away."""
+    data = request.get_json(silent=True) or request.form
+    url = (data.get('url') or '').strip()
+    if not url:
+        return jsonify(error="Please provide a URL."), 400
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+
+    try:
+        job_id = get_job_queue().submit(url=url, use_cache=not data.get('no_cache'))
+    except QueueFullError as e:
+        return jsonify(error=str(e)), 503
+
+    return jsonify(id=job_id, status='queued', status_url=url_for('get_job', job_id=job_id)), 202
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Reports a job's status and, once finished, its result."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify(error="Unknown job id."), 404
+    return jsonify(job)
+
+@app.route('/api/jobs')
+def job_stats():
+    """Reports queue depth and job counts."""
+    return jsonify(get_job_queue().stats())
+
+@app.route('/api/batch', methods=['POST'])
+def batch_summarize():
+    """Summarizes a list of URLs, streaming one JSON line per URL as each completes."""
+    data = request.get_json(silent=True) or {}
+    urls = data.get('urls')
+    if not isinstance(urls, list) or not urls:
+        return jsonify(error="Please provide a non-empty list of URLs."), 400
+    if len(urls) > BATCH_MAX_URLS:
+        return jsonify(error=f"At most {BATCH_MAX_URLS} URLs per batch."), 400
+
+    urls = [u if u.startswith(('http://', 'https://')) else 'https://' + u
+            for u in (str(u).strip() for u in urls) if u]
+    use_cache = not data.get('no_cache')
+
+    def generate():
+        # Closing the results stops the batch when the client disconnects
+        with closing(summarize_urls(urls, use_cache=use_cache)) as results:
+            for result in results:
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/transport', methods=['GET'])
+def transport_status():
+    """Returns connection pool statistics of the shared HTTP clients."""
+    return jsonify(transport_stats())
+
+@app.route('/metrics')
+def metrics():
+    """Exposes fetch, parse, queue and LLM metrics in the Prometheus text format."""
+    job_stats = get_job_queue().stats()
+    for status in ('queued', 'running', 'done', 'failed'):
+        JOBS.set(job_stats[status], status=status)
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/test')
 def test_connection():
     """Debug route to test Ollama connection."""
@@ -53,6 +218,9 @@ def test_connection():
 def start_app():
     """Checks for model availability and starts the Flask app."""
     print("--- AI Web Summarizer ---")
+    if serves_requests():
+        # Jobs left over from the last run start right away, not on the first job request
+        get_job_queue()
     print("Checking if Ollama and the model are available...")
     
     # First, let's test the connection
@@ -0,0 +1,137 @@
+"""
+Crawl Benchmark
+
+Crawls the generated fixture site (see fixtures.py) over local HTTP and
+reports throughput, per-stage times and peak memory for:
+- crawl_recursive with one worker (sequential) and with several (async engine)
+- crawl_concurrent over every page URL, parsing in the fetching threads and
+  in one parse worker process per CPU core
+- page extraction alone (WebScraper.parse_page on the fixture pages)
+
+Every case runs in a fresh process so peak RSS is not inherited from the
+previous one.
+
+Usage:
+    python benchmarks/bench_crawl.py [--pages 2000] [--workers 8] [--parse-workers <cores>]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fixtures import serve_site, site_urls  # noqa: E402
+
+DEFAULT_SITE_DIR = Path(tempfile.gettempdir()) / "llm-scraper-bench-site"
+MAX_DEPTH = 50  # deep enough to reach every page of the fixture site
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _make_scraper(workers: int, parse_workers: int = 0):
+    from scrapper import WebScraper
+
+    logging.getLogger().setLevel(logging.WARNING)
+    return WebScraper(delay=0, max_workers=workers, max_depth=MAX_DEPTH, timeout=10, parse_workers=parse_workers)
+
+
+def _crawl_result(scraper, pages: int, seconds: float) -> Dict[str, float]:
+    timings = scraper.timings.summary()
+    return {
+        "pages": pages,
+        "seconds": round(seconds, 3),
+        "pages_per_sec": round(pages / seconds, 1),
+        "fetch_ms": round(timings.get("fetch", {}).get("mean_seconds", 0) * 1000, 3),
+        "parse_ms": round(timings.get("parse", {}).get("mean_seconds", 0) * 1000, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def crawl_recursive_case(base_url: str, workers: int) -> Dict[str, float]:
+    """Crawl the site from its index page"""
+    scraper = _make_scraper(workers)
+    start = time.perf_counter()
+    pages = scraper.crawl_recursive(f"{base_url}/index.html")
+    return _crawl_result(scraper, len(pages), time.perf_counter() - start)
+
+
+def crawl_concurrent_case(base_url: str, pages: int, workers: int, parse_workers: int = 0) -> Dict[str, float]:
+    """Fetch every page URL of the site in parallel"""
+    scraper = _make_scraper(workers, parse_workers)
+    start = time.perf_counter()
+    results = scraper.crawl_concurrent(site_urls(base_url, pages))
+    return _crawl_result(scraper, len(results), time.perf_counter() - start)
+
+
+def extract_case(site_dir: str, pages: int) -> Dict[str, float]:
+    """Time parse_page (extraction, link resolution, hashing) on the fixture pages"""
+    scraper = _make_scraper(1)
+    docs = [(url, (Path(site_dir) / url.split("/", 3)[3]).read_bytes())
+            for url in site_urls("http://127.0.0.1", min(pages, 500))]
+    start = time.perf_counter()
+    for url, html in docs:
+        scraper.parse_page(url, html)
+    seconds = time.perf_counter() - start
+    return {
+        "pages": len(docs),
+        "avg_page_kb": round(sum(len(html) for _, html in docs) / len(docs) / 1024, 1),
+        "extract_ms": round(seconds / len(docs) * 1000, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def in_fresh_process(fn: Callable, *args) -> Dict[str, float]:
+    """Run a benchmark case in a new interpreter and return its result"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(fn, *args).result()
+
+
+def run(base_url: str, site_dir: str, pages: int, workers: int = 8,
+        parse_workers: int = None) -> Dict[str, Dict[str, float]]:
+    """Run every crawl case against a served fixture site"""
+    parse_workers = parse_workers or os.cpu_count() or 1
+    # Peak RSS of the parse worker processes is not included
+    return {
+        "crawl_recursive[workers=1]": in_fresh_process(crawl_recursive_case, base_url, 1),
+        f"crawl_recursive[workers={workers}]": in_fresh_process(crawl_recursive_case, base_url, workers),
+        f"crawl_concurrent[workers={workers}]": in_fresh_process(crawl_concurrent_case, base_url, pages, workers),
+        f"crawl_concurrent[workers={workers},parse_workers={parse_workers}]":
+            in_fresh_process(crawl_concurrent_case, base_url, pages, max(workers, parse_workers), parse_workers),
+        "extract": in_fresh_process(extract_case, site_dir, pages),
+    }
+
+
+def print_results(results: Dict[str, Dict[str, float]]) -> None:
+    for name, row in results.items():
+        print(f"  {name:32s} " + "  ".join(f"{key}={value}" for key, value in row.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--parse-workers", type=int, help="parse processes (default: CPU cores)")
+    parser.add_argument("--site-dir", default=str(DEFAULT_SITE_DIR))
+    args = parser.parse_args()
+
+    with serve_site(args.site_dir, args.pages) as site:
+        print(f"Fixture site: {args.pages} pages on {site.base_url}")
+        print_results(run(site.base_url, args.site_dir, args.pages, args.workers, args.parse_workers))
+
+
+if __name__ == "__main__":
+    main()
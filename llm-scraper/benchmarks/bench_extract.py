@@ -0,0 +1,141 @@
+"""
+Extraction Benchmark
+
+Compares the single-pass extraction engine (extractor.py) against the
+previous BeautifulSoup implementation of WebScraper.extract_content /
+extract_links and get_text_from_url on the fixture site's generated
+documentation pages (see fixtures.py), and checks that both produce the same output.
+
+Usage:
+    python benchmarks/bench_extract.py [--pages 200] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from extractor import ARTICLE_SELECTORS, available_parsers, extract_page  # noqa: E402
+from fixtures import make_page  # noqa: E402
+
+
+def legacy_extract_content(soup: BeautifulSoup) -> dict:
+    """WebScraper.extract_content before the extraction engine"""
+    title = soup.title.get_text().strip() if soup.title else ""
+    meta_desc = ""
+    meta_tag = soup.find('meta', attrs={'name': 'description'})
+    if meta_tag and meta_tag.get('content'):
+        meta_desc = meta_tag['content'].strip()
+    headers = []
+    for tag in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+        header_text = tag.get_text().strip()
+        if header_text:
+            headers.append(f"{tag.name.upper()}: {header_text}")
+    for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe', 'noscript']):
+        element.decompose()
+    content_element = None
+    for selector in ['main', 'article', '[role="main"]', '.content', '.main-content',
+                     '.post-content', '.entry-content', '#content', '#main']:
+        content_element = soup.select_one(selector)
+        if content_element:
+            break
+    if not content_element:
+        content_element = soup.find('body')
+    main_content = ""
+    if content_element:
+        main_content = re.sub(r'\s+', ' ', content_element.get_text(separator=' ', strip=True)).strip()
+    return {'title': title, 'content': main_content, 'meta_description': meta_desc, 'headers': headers}
+
+
+def legacy_scraper_parse(html: bytes) -> tuple:
+    """Parse + extract_content + extract_links (raw hrefs) as fetch_page used to"""
+    soup = BeautifulSoup(html, 'html.parser')
+    data = legacy_extract_content(soup)
+    hrefs = [a['href'] for a in soup.find_all('a', href=True)]
+    return data, hrefs
+
+
+def legacy_article_text(html: bytes) -> str:
+    """get_text_from_url's extraction before the extraction engine"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.decompose()
+    main_content = None
+    for selector in ['main', 'article', '.content', '.post-content', '.entry-content']:
+        main_content = soup.select_one(selector)
+        if main_content:
+            break
+    paragraphs = main_content.find_all('p') if main_content else soup.find_all('p')
+    if not paragraphs:
+        return soup.get_text(strip=True, separator=' ')
+    return ' '.join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
+
+
+def engine_scraper_parse(html: bytes, parser: str) -> tuple:
+    page = extract_page(html, parser=parser)
+    data = {'title': page.title, 'content': page.content,
+            'meta_description': page.meta_description, 'headers': page.headers}
+    return data, page.links
+
+
+def engine_article_text(html: bytes, parser: str) -> str:
+    return extract_page(html, content_selectors=ARTICLE_SELECTORS, boilerplate_tags=(), parser=parser).article_text()
+
+
+def timed(fn, docs, repeat: int) -> float:
+    """Best-of-N seconds per document"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in docs:
+            fn(doc)
+        best = min(best, time.perf_counter() - start)
+    return best / len(docs)
+
+
+def run(pages: int = 200, repeat: int = 3) -> dict:
+    rng = random.Random(0)
+    docs = [make_page(i, pages, rng).encode("utf-8") for i in range(pages)]
+    size_kb = sum(len(d) for d in docs) / len(docs) / 1024
+
+    for doc in docs[:20]:
+        for parser in available_parsers():
+            if legacy_scraper_parse(doc) != engine_scraper_parse(doc, parser):
+                raise AssertionError(f"scraper extraction differs ({parser})")
+            if legacy_article_text(doc) != engine_article_text(doc, parser):
+                raise AssertionError(f"article extraction differs ({parser})")
+
+    results = {"pages": pages, "avg_page_kb": round(size_kb, 1), "timings_ms": {}}
+    results["timings_ms"]["scraper/beautifulsoup"] = timed(legacy_scraper_parse, docs, repeat) * 1000
+    results["timings_ms"]["article/beautifulsoup"] = timed(legacy_article_text, docs, repeat) * 1000
+    for parser in available_parsers():
+        results["timings_ms"][f"scraper/engine-{parser}"] = timed(
+            lambda d: engine_scraper_parse(d, parser), docs, repeat) * 1000
+        results["timings_ms"][f"article/engine-{parser}"] = timed(
+            lambda d: engine_article_text(d, parser), docs, repeat) * 1000
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run(args.pages, args.repeat)
+    print(f"{results['pages']} pages, {results['avg_page_kb']} KB average")
+    timings = results["timings_ms"]
+    for name, ms in timings.items():
+        kind = name.split("/")[0]
+        speedup = timings[f"{kind}/beautifulsoup"] / ms
+        print(f"{name:32s} {ms:8.3f} ms/page  {speedup:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
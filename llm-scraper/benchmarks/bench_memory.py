@@ -0,0 +1,165 @@
+"""
+Crawl Memory Benchmark
+
+Measures the memory used by the crawler's bookkeeping structures for a
+large synthetic crawl:
+- visited set: set of URL strings vs FingerprintSet vs BloomFilter
+- frontier: links queued unless already visited (as before) vs
+  deduplicated on enqueue
+- page records: with and without __slots__, and with and without
+  interned links, measured separately on the same link data
+
+Usage:
+    python benchmarks/bench_memory.py [--urls 1000000] [--pages 20000]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapper import PageContent  # noqa: E402
+from urlset import BloomFilter, FingerprintSet  # noqa: E402
+
+
+@dataclass
+class LegacyPageContent:
+    """PageContent before __slots__"""
+    url: str
+    title: str
+    content: str
+    links: List[str]
+    meta_description: str
+    headers: List[str]
+    timestamp: str
+    status_code: int
+    content_hash: str
+    duplicate_of: Optional[str] = None
+
+
+def make_urls(count: int) -> List[str]:
+    return [f"https://docs.example.com/section-{i % 97}/page-{i}.html" for i in range(count)]
+
+
+def measure(build):
+    """Peak traced bytes and seconds needed to build a structure"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, elapsed
+
+
+def bench_visited(count: int) -> dict:
+    def fill(structure):
+        # URL strings are created on the fly, as a crawler receives them
+        for i in range(count):
+            url = f"https://docs.example.com/section-{i % 97}/page-{i}.html"
+            if url not in structure:
+                structure.add(url)
+        return structure
+
+    builders = {
+        "set[str]": lambda: fill(set()),
+        "FingerprintSet": lambda: fill(FingerprintSet(capacity=count)),
+        "BloomFilter(0.1%)": lambda: fill(BloomFilter(count, 0.001)),
+    }
+    results = {}
+    for name, build in builders.items():
+        peak, elapsed = measure(build)
+        results[name] = {"bytes_per_url": peak / count, "us_per_url": elapsed / count * 1e6}
+    return results
+
+
+def bench_frontier(pages: int, links_per_page: int = 60) -> dict:
+    rng = random.Random(0)
+    site = make_urls(pages)
+    page_links = [[site[rng.randrange(pages)] for _ in range(links_per_page)] for _ in range(pages)]
+
+    def legacy():
+        # A page joins visited when it is crawled, so links to pages still
+        # waiting in the frontier are queued again
+        visited = set()
+        frontier = []
+        for page, links in zip(site, page_links):
+            visited.add(page)
+            frontier.extend(link for link in links if link not in visited)
+        return frontier
+
+    def deduplicated():
+        # Links join visited when they are queued
+        visited = set(site[:1])
+        frontier = []
+        for links in page_links:
+            for link in links:
+                if link not in visited:
+                    visited.add(link)
+                    frontier.append(link)
+        return frontier
+
+    results = {}
+    for name, build in (("visited on crawl", legacy), ("visited on enqueue", deduplicated)):
+        entries = len(build())
+        peak, _ = measure(build)
+        results[name] = {"entries": entries, "bytes": peak}
+    return results
+
+
+def bench_pages(pages: int, links_per_page: int = 60) -> dict:
+    site = make_urls(pages)
+
+    def build(cls, intern):
+        # Every case draws the same links; the strings are created per page,
+        # as parsing creates them
+        rng = random.Random(0)
+        records = []
+        for i in range(pages):
+            links = [f"https://docs.example.com/section-{j % 97}/page-{j}.html"
+                     for j in (rng.randrange(pages) for _ in range(links_per_page))]
+            if intern:
+                links = [sys.intern(link) for link in links]
+            records.append(cls(url=site[i], title="Page", content="", links=links,
+                               meta_description="", headers=[], timestamp="2024-01-01T00:00:00",
+                               status_code=200, content_hash=""))
+        return records
+
+    results = {}
+    for name, cls, intern in (("dict-backed, plain links", LegacyPageContent, False),
+                              ("__slots__, plain links", PageContent, False),
+                              ("dict-backed, interned links", LegacyPageContent, True),
+                              ("__slots__, interned links", PageContent, True)):
+        peak, _ = measure(lambda: build(cls, intern))
+        results[name] = {"bytes_per_page": peak / pages}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--urls", type=int, default=1000000)
+    parser.add_argument("--pages", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"Visited set, {args.urls} URLs")
+    for name, row in bench_visited(args.urls).items():
+        print(f"  {name:20s} {row['bytes_per_url']:8.1f} bytes/URL  {row['us_per_url']:6.2f} us/URL")
+
+    print(f"Frontier, {args.pages} pages x 60 links")
+    for name, row in bench_frontier(args.pages).items():
+        print(f"  {name:20s} {row['entries']:9d} entries  {row['bytes'] / 2**20:8.1f} MiB")
+
+    print(f"Page records, {args.pages} pages x 60 links")
+    for name, row in bench_pages(args.pages).items():
+        print(f"  {name:28s} {row['bytes_per_page']:8.0f} bytes/page")
+
+
+if __name__ == "__main__":
+    main()
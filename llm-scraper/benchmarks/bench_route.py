@@ -0,0 +1,127 @@
+"""
+Route Benchmark
+
+End-to-end latency of the web app's summarization routes against the
+fixture site (see fixtures.py) and the stub Ollama server (see
+stub_ollama.py):
+- POST / without streaming, with the summary cache bypassed and hit
+- GET /stream, time to the first summary token and to the end
+
+The app runs in a fresh process that talks to the stubs through
+SUMMARIZER_OLLAMA_HOSTS and keeps its caches in a temporary directory.
+With --backends N, N stub servers are started and the app balances its
+requests over them.
+
+Usage:
+    python benchmarks/bench_route.py [--requests 10] [--latency 0.1] [--tokens-per-second 100] [--backends 1]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_crawl import DEFAULT_SITE_DIR, in_fresh_process, peak_rss_mb, print_results  # noqa: E402
+from fixtures import serve_site, site_urls  # noqa: E402
+from stub_ollama import StubOllama  # noqa: E402
+
+
+def _latency_stats(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "requests": len(samples),
+        "mean_ms": round(statistics.mean(samples) * 1000, 1),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 1),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1),
+    }
+
+
+def route_case(ollama_urls: List[str], urls: List[str]) -> Dict[str, Dict[str, float]]:
+    """Send every URL through POST / and GET /stream of a freshly imported app"""
+    os.environ["SUMMARIZER_OLLAMA_HOSTS"] = ",".join(ollama_urls)
+    cache_dir = tempfile.mkdtemp(prefix="llm-scraper-bench-")
+
+    import app
+    import summarizer_llm
+    from http_cache import HTTPCache
+    from summary_cache import SummaryCache
+
+    logging.getLogger().setLevel(logging.WARNING)
+    summarizer_llm.http_cache = HTTPCache(Path(cache_dir) / "http_cache.sqlite3")
+    summarizer_llm.summary_cache = SummaryCache(Path(cache_dir) / "summary_cache.sqlite3")
+    app.STREAM_SUMMARIES = False
+    client = app.app.test_client()
+
+    def post(url: str, use_cache: bool) -> float:
+        form = {"url": url} if use_cache else {"url": url, "no_cache": "1"}
+        start = time.perf_counter()
+        response = client.post("/", data=form)
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200 or b"Error:" in response.data:
+            raise RuntimeError(f"POST / failed for {url}: {response.status_code}")
+        return elapsed
+
+    results = {
+        "route[no_cache]": _latency_stats([post(url, use_cache=False) for url in urls]),
+        "route[summary_cached]": _latency_stats([post(url, use_cache=True) for url in urls]),
+    }
+
+    first_token, total = [], []
+    for url in urls:
+        start = time.perf_counter()
+        response = client.get("/stream", query_string={"url": url, "no_cache": "1"}, buffered=False)
+        first = None
+        for chunk in response.response:
+            if first is None and b'"token"' in chunk:
+                first = time.perf_counter() - start
+        total.append(time.perf_counter() - start)
+        first_token.append(first if first is not None else total[-1])
+        response.close()
+    results["stream[no_cache]"] = {**_latency_stats(total),
+                                   "first_token_ms": round(statistics.mean(first_token) * 1000, 1)}
+
+    results["route[no_cache]"]["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return results
+
+
+def run(base_url: str, pages: int, requests: int = 10, latency: float = 0.1,
+        tokens_per_second: float = 100.0, backends: int = 1) -> Dict[str, Dict[str, float]]:
+    """Benchmark the routes against a served fixture site and new stub Ollama servers"""
+    # Every other page, so requests are spread over pages of different sizes
+    urls = site_urls(base_url, pages)[1:requests * 2:2]
+    with ExitStack() as stack:
+        stubs = [stack.enter_context(StubOllama(latency=latency, tokens_per_second=tokens_per_second))
+                 for _ in range(backends)]
+        results = in_fresh_process(route_case, [stub.url for stub in stubs], urls)
+        for number, stub in enumerate(stubs):
+            results["ollama_stub" if number == 0 else f"ollama_stub[{number}]"] = stub.stats()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.1, help="stub seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0)
+    parser.add_argument("--backends", type=int, default=1, help="stub Ollama servers to balance over")
+    parser.add_argument("--site-dir", default=str(DEFAULT_SITE_DIR))
+    args = parser.parse_args()
+
+    with serve_site(args.site_dir, args.pages) as site:
+        print(f"Fixture site on {site.base_url}, stub Ollama: {args.latency}s latency, "
+              f"{args.tokens_per_second} tokens/s, {args.backends} backends")
+        print_results(run(site.base_url, args.pages, args.requests, args.latency, args.tokens_per_second,
+                          args.backends))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Benchmark Fixtures
+
+A generated static documentation site and a local server for it, so
+crawls can be benchmarked without touching the network.
+
+Features:
+- Deterministic site generation from a seed: thousands of pages in
+  sections, with navigation, breadcrumbs and in-text links whose targets
+  follow a power law (a few hub pages, a long tail)
+- Realistic page sizes (log-normal around ~25 KB of HTML) and the noise a
+  crawler has to filter: fragments, tracking query strings, external
+  links, PDFs and admin pages
+- robots.txt and sitemap.xml matching the generated pages
+- Threaded static HTTP server with Last-Modified / If-Modified-Since
+  support, run in a background thread
+
+Usage:
+    python benchmarks/fixtures.py /tmp/site --pages 2000 [--serve 8765]
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import random
+import threading
+from datetime import datetime, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, List
+
+WORDS = ("crawler", "request", "session", "token", "cache", "summary", "model", "parser",
+         "document", "section", "header", "content", "install", "configure", "python",
+         "server", "latency", "worker", "queue", "result", "page", "link", "the", "a",
+         "of", "and", "to", "in", "is", "for", "with", "on", "returns", "option",
+         "default", "value", "error", "timeout", "client", "response", "example")
+
+SECTIONS = 20
+MANIFEST = "site.json"
+ROBOTS_TXT = "User-agent: *\nDisallow: /admin\nSitemap: {origin}/sitemap.xml\n"
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 22))).capitalize() + "."
+
+
+def _page_name(index: int) -> str:
+    return "index.html" if index == 0 else f"docs/section-{index % SECTIONS}/page-{index}.html"
+
+
+def _popular_page(rng: random.Random, pages: int) -> int:
+    """Pick a link target; low page numbers are linked far more often (Zipf-like)"""
+    return min(pages - 1, int(math.exp(rng.random() * math.log(pages))) - 1)
+
+
+def make_page(index: int, pages: int, rng: random.Random) -> str:
+    """Generate one documentation page with navigation, body text and links"""
+    section = index % SECTIONS
+    # Log-normal body size: median ~40 paragraphs, a few pages several times larger
+    paragraphs = max(3, min(200, int(rng.lognormvariate(math.log(40), 0.6))))
+
+    nav = "".join(f'<li><a href="/docs/section-{s}/page-{s if s else SECTIONS}.html">Section {s}</a></li>'
+                  for s in range(SECTIONS))
+    body = []
+    for i in range(paragraphs):
+        if i % 6 == 0:
+            body.append(f"<h2 id=\"topic-{i // 6}\">Topic {i // 6}</h2>")
+        text = " ".join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+        roll = rng.random()
+        if roll < 0.5:
+            target = _popular_page(rng, pages)
+            text += f' See <a href="/{_page_name(target)}">page {target}</a>.'
+        elif roll < 0.6:
+            text += f' Jump to <a href="#topic-{rng.randrange(paragraphs // 6 + 1)}">a topic</a>.'
+        elif roll < 0.65:
+            text += f' Also <a href="/{_page_name(rng.randrange(pages))}?utm_source=docs&amp;ref={index}">related</a>.'
+        elif roll < 0.7:
+            text += f' Read <a href="https://external-{rng.randrange(50)}.example.org/article">elsewhere</a>.'
+        elif roll < 0.73:
+            text += f' Download the <a href="/files/guide-{rng.randrange(100)}.pdf">PDF</a>.'
+        body.append(f"<p>{text}</p>")
+        if rng.random() < 0.1:
+            body.append("<pre><code>" + " ".join(rng.choice(WORDS) for _ in range(40)) + "</code></pre>")
+
+    # Neighbours in the section keep the link graph connected
+    prev_page = _page_name(max(0, index - SECTIONS))
+    next_page = _page_name(index + SECTIONS) if index + SECTIONS < pages else "index.html"
+    related = "".join(f'<li><a href="/{_page_name(_popular_page(rng, pages))}">Related</a></li>'
+                      for _ in range(8))
+
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Docs page {index} - Section {section}</title>
+<meta name="description" content="Documentation page {index} of section {section}">
+<link rel="stylesheet" href="/static/site.css">
+<style>body {{ font-family: sans-serif; max-width: 60em; }} pre {{ background: #eee; }}</style>
+<script>window.analytics = {{ page: {index}, section: {section} }};</script></head>
+<body><header><a href="/index.html">Project Docs</a><nav><ul>{nav}</ul></nav>
+<a href="/admin/login">Admin</a> <a href="/search?q=docs">Search</a></header>
+<div class="layout"><aside class="sidebar"><ul>{related}</ul></aside>
+<main><article class="post-content"><p class="breadcrumbs"><a href="/index.html">Home</a> /
+<a href="/docs/section-{section}/page-{section if section else SECTIONS}.html">Section {section}</a></p>
+<h1>Page {index}</h1>{''.join(body)}
+<p><a href="/{prev_page}">Previous</a> <a href="/{next_page}">Next</a></p></article></main></div>
+<footer><p>Copyright</p><a href="/about.html">About</a></footer>
+<script src="/static/app.js"></script></body></html>"""
+
+
+def generate_site(directory: str, pages: int = 2000, seed: int = 0) -> dict:
+    """
+    Write the fixture site, robots.txt and sitemap.xml
+
+    Generation is deterministic, so an existing site with the same
+    parameters is reused.
+
+    Args:
+        directory: Output directory
+        pages: Number of documentation pages
+        seed: Random seed
+
+    Returns:
+        Site manifest: parameters, page count and total bytes
+    """
+    root = Path(directory)
+    manifest_path = root / MANIFEST
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if manifest["pages"] == pages and manifest["seed"] == seed:
+            return manifest
+
+    rng = random.Random(seed)
+    total_bytes = 0
+    for index in range(pages):
+        path = root / _page_name(index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        html = make_page(index, pages, rng).encode("utf-8")
+        path.write_bytes(html)
+        total_bytes += len(html)
+
+    lastmod = datetime(2024, 1, 1, tzinfo=timezone.utc).strftime("%Y-%m-%d")
+    entries = "".join(f"<url><loc>{{origin}}/{_page_name(i)}</loc><lastmod>{lastmod}</lastmod></url>"
+                      for i in range(pages))
+    # The origin is only known once the site is served, see SiteServer
+    (root / "sitemap.xml.in").write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>\n')
+
+    manifest = {"pages": pages, "seed": seed, "bytes": total_bytes,
+                "avg_page_kb": round(total_bytes / pages / 1024, 1)}
+    manifest_path.write_text(json.dumps(manifest))
+    return manifest
+
+
+def site_urls(base_url: str, pages: int) -> List[str]:
+    """URLs of every generated page"""
+    return [f"{base_url}/{_page_name(i)}" for i in range(pages)]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class SiteServer:
+    """Static HTTP server for a fixture site, running in a background thread"""
+
+    def __init__(self, directory: str, host: str = "127.0.0.1", port: int = 0):
+        """
+        Bind the server (port 0 picks a free port)
+
+        Args:
+            directory: Site directory from generate_site
+            host: Interface to listen on
+            port: Port to listen on
+        """
+        handler = partial(_QuietHandler, directory=str(directory))
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://{host}:{self.server.server_address[1]}"
+
+        root = Path(directory)
+        template = root / "sitemap.xml.in"
+        if template.exists():
+            (root / "sitemap.xml").write_text(template.read_text().replace("{origin}", self.base_url))
+        (root / "robots.txt").write_text(ROBOTS_TXT.format(origin=self.base_url))
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> "SiteServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+@contextlib.contextmanager
+def serve_site(directory: str, pages: int = 2000, seed: int = 0) -> Iterator[SiteServer]:
+    """Generate (or reuse) a fixture site and serve it for the duration of the block"""
+    generate_site(directory, pages, seed)
+    with SiteServer(directory) as server:
+        yield server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--serve", type=int, metavar="PORT", help="serve the site on this port")
+    args = parser.parse_args()
+
+    manifest = generate_site(args.directory, args.pages, args.seed)
+    print(f"{manifest['pages']} pages, {manifest['avg_page_kb']} KB average, in {args.directory}")
+    if args.serve is not None:
+        server = SiteServer(args.directory, port=args.serve)
+        print(f"Serving on {server.base_url} (Ctrl+C to stop)")
+        try:
+            server.server.serve_forever()
+        except KeyboardInterrupt:
+            server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark Runner
+
+Runs the offline benchmark suite (crawl throughput, extraction time,
+route latency, peak memory and the memory of the crawl bookkeeping)
+against the local fixture site and stub
+Ollama server, saves the results as JSON and compares them with an
+earlier run.
+
+Features:
+- No network access and no model needed
+- Results saved with the git commit, Python version and parameters
+- Comparison against a previous results file, flagging metrics that got
+  worse by more than a threshold (non-zero exit status for CI)
+
+Usage:
+    python benchmarks/run_benchmarks.py [--pages 2000] [--skip-route] [--skip-memory]
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<earlier>.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bench_crawl  # noqa: E402
+import bench_extract  # noqa: E402
+import bench_memory  # noqa: E402
+import bench_route  # noqa: E402
+from fixtures import serve_site  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+Results = Dict[str, Dict[str, float]]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _direction(metric: str) -> int:
+    """+1 if higher is better, -1 if lower is better, 0 if not compared"""
+    if metric.endswith("_per_sec"):
+        return 1
+    if metric.endswith(("_ms", "_mb")) or metric.startswith(("bytes", "us_per_")) or metric == "seconds":
+        return -1
+    return 0
+
+
+def extract_results(pages: int, repeat: int) -> Results:
+    """Extraction times per page of bench_extract, one case per implementation"""
+    timings = bench_extract.run(pages, repeat)["timings_ms"]
+    return {f"extract[{name}]": {"page_ms": round(ms, 3)} for name, ms in timings.items()}
+
+
+def memory_results(urls: int, pages: int) -> Results:
+    """Memory of the crawl bookkeeping structures of bench_memory, one case per structure"""
+    results: Results = {}
+    for group, rows in (("visited", bench_memory.bench_visited(urls)),
+                        ("frontier", bench_memory.bench_frontier(pages)),
+                        ("pages", bench_memory.bench_pages(pages))):
+        for name, row in rows.items():
+            results[f"memory[{group}: {name}]"] = {key: round(value, 2) for key, value in row.items()}
+    return results
+
+
+def compare(previous: Results, current: Results, threshold: float) -> List[str]:
+    """
+    Compare two result sets
+
+    Args:
+        previous: Results of the earlier run
+        current: Results of this run
+        threshold: Relative change beyond which a metric counts as regressed
+
+    Returns:
+        Descriptions of the regressed metrics
+    """
+    regressions = []
+    for case, row in current.items():
+        for metric, value in row.items():
+            direction = _direction(metric)
+            before = previous.get(case, {}).get(metric)
+            if not direction or not before:
+                continue
+            change = (value - before) / before
+            worse = -change * direction > threshold
+            marker = "  REGRESSION" if worse else ""
+            print(f"  {case:32s} {metric:16s} {before:10.1f} -> {value:10.1f}  {change:+7.1%}{marker}")
+            if worse:
+                regressions.append(f"{case} {metric}: {before} -> {value} ({change:+.1%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--parse-workers", type=int, help="parse processes (default: CPU cores)")
+    parser.add_argument("--requests", type=int, default=10, help="route requests per case")
+    parser.add_argument("--latency", type=float, default=0.1, help="stub Ollama seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0)
+    parser.add_argument("--backends", type=int, default=1, help="stub Ollama servers the app balances over")
+    parser.add_argument("--extract-pages", type=int, default=200, help="pages parsed by the extraction cases")
+    parser.add_argument("--repeat", type=int, default=3, help="extraction runs, best counts")
+    parser.add_argument("--memory-urls", type=int, default=200000, help="URLs in the visited set cases")
+    parser.add_argument("--memory-pages", type=int, default=5000, help="pages in the frontier and record cases")
+    parser.add_argument("--skip-crawl", action="store_true")
+    parser.add_argument("--skip-extract", action="store_true")
+    parser.add_argument("--skip-route", action="store_true")
+    parser.add_argument("--skip-memory", action="store_true")
+    parser.add_argument("--site-dir", default=str(bench_crawl.DEFAULT_SITE_DIR))
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    results: Results = {}
+    with serve_site(args.site_dir, args.pages) as site:
+        print(f"Fixture site: {args.pages} pages on {site.base_url}")
+        if not args.skip_crawl:
+            results.update(bench_crawl.run(site.base_url, args.site_dir, args.pages, args.workers,
+                                           args.parse_workers))
+        if not args.skip_route:
+            results.update(bench_route.run(site.base_url, args.pages, args.requests,
+                                           args.latency, args.tokens_per_second, args.backends))
+    if not args.skip_extract:
+        results.update(extract_results(args.extract_pages, args.repeat))
+    if not args.skip_memory:
+        results.update(memory_results(args.memory_urls, args.memory_pages))
+    bench_crawl.print_results(results)
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {key: value for key, value in vars(args).items()
+                       if key not in ("output", "compare", "threshold", "site_dir")
+                       and not key.startswith("skip_")},
+        },
+        "results": results,
+    }
+    output = Path(args.output) if args.output else \
+        RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{commit or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())
+        if previous["meta"]["params"] != report["meta"]["params"]:
+            print("Warning: the runs used different parameters")
+        print(f"Compared with {args.compare} (commit {previous['meta'].get('commit')}):")
+        regressions = compare(previous["results"], results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metrics regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
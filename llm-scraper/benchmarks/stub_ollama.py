@@ -0,0 +1,191 @@
+"""
+Stub Ollama Server
+
+A local stand-in for the Ollama HTTP API with configurable latency and
+generation speed, so summarization can be benchmarked without a model.
+
+Features:
+- /api/chat and /api/generate, streaming (NDJSON) and non-streaming
+- /api/tags and /api/version for model checks
+- Time to first token and tokens/sec configurable; replies carry
+  prompt_eval_count, eval_count and eval_duration like the real server
+- Request and peak concurrency counters
+- Runs in a background thread or standalone
+
+Usage:
+    python benchmarks/stub_ollama.py [--port 11434] [--latency 0.2] [--tokens-per-second 50]
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable
+
+DEFAULT_MODELS = ("phi3:mini",)
+
+
+class StubOllama:
+    """Fake Ollama server running in a background thread"""
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: float = 0.2,
+                 tokens_per_second: float = 50.0,
+                 response_tokens: int = 60,
+                 models: Iterable[str] = DEFAULT_MODELS):
+        """
+        Bind the server (port 0 picks a free port)
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on
+            latency: Seconds before the first token (prompt processing)
+            tokens_per_second: Generation speed; 0 returns tokens instantly
+            response_tokens: Tokens in every reply
+            models: Model names reported by /api/tags
+        """
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.models = list(models)
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json({"models": [{"name": name, "model": name} for name in stub.models]})
+                elif self.path == "/api/version":
+                    self._send_json({"version": "0.0.0-stub"})
+                else:
+                    self._send_json({"error": "not found"}, 404)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path not in ("/api/chat", "/api/generate"):
+                    self._send_json({"error": "not found"}, 404)
+                    return
+                if body.get("model") not in stub.models:
+                    self._send_json({"error": f"model '{body.get('model')}' not found"}, 404)
+                    return
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                try:
+                    stub._reply(self, body, chat=self.path == "/api/chat")
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _send_json(self, data: Dict, status: int = 200):
+                payload = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _reply(self, handler: BaseHTTPRequestHandler, body: Dict, chat: bool) -> None:
+        if chat:
+            prompt = " ".join(message.get("content", "") for message in body.get("messages", []))
+        else:
+            prompt = body.get("prompt", "")
+        prompt_tokens = max(1, len(prompt) // 4)
+        time.sleep(self.latency)
+
+        def message(text: str) -> Dict:
+            return {"message": {"role": "assistant", "content": text}} if chat else {"response": text}
+
+        def final(text: str, eval_seconds: float) -> Dict:
+            return {"model": body["model"], "created_at": "2024-01-01T00:00:00Z", **message(text),
+                    "done": True, "done_reason": "stop",
+                    "total_duration": int((self.latency + eval_seconds) * 1e9),
+                    "prompt_eval_count": prompt_tokens, "prompt_eval_duration": int(self.latency * 1e9),
+                    "eval_count": self.response_tokens, "eval_duration": max(1, int(eval_seconds * 1e9))}
+
+        token_delay = 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+        tokens = [f"word{i} " for i in range(self.response_tokens)]
+        start = time.perf_counter()
+
+        if body.get("stream", True):
+            handler.send_response(200)
+            handler.send_header("Content-Type", "application/x-ndjson")
+            handler.send_header("Transfer-Encoding", "chunked")
+            handler.end_headers()
+
+            def send(data: Dict):
+                line = json.dumps(data).encode() + b"\n"
+                handler.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                handler.wfile.flush()
+
+            for token in tokens:
+                if token_delay:
+                    time.sleep(token_delay)
+                send({"model": body["model"], "created_at": "2024-01-01T00:00:00Z", **message(token), "done": False})
+            send(final("", time.perf_counter() - start))
+            handler.wfile.write(b"0\r\n\r\n")
+            return
+
+        if token_delay:
+            time.sleep(token_delay * len(tokens))
+        handler._send_json(final("".join(tokens).strip(), time.perf_counter() - start))
+
+    def stats(self) -> Dict[str, int]:
+        """Requests served and the highest number handled at once"""
+        with self._lock:
+            return {"requests": self.requests, "peak_in_flight": self.peak_in_flight}
+
+    def start(self) -> "StubOllama":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--response-tokens", type=int, default=60)
+    parser.add_argument("--model", action="append", help="model name to report (repeatable)")
+    args = parser.parse_args()
+
+    stub = StubOllama(args.host, args.port, args.latency, args.tokens_per_second,
+                      args.response_tokens, args.model or DEFAULT_MODELS)
+    print(f"Stub Ollama on {stub.url} (Ctrl+C to stop)")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
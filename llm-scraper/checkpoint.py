@@ -0,0 +1,175 @@
+"""
+Crawl Checkpoint Module
+
+Persists the state of a recursive crawl to a local SQLite file so that a
+crawl that dies can be resumed where it stopped.
+
+The crawlers work breadth-first one depth level at a time. A checkpoint
+holds:
+- the crawl parameters (start URL, maximum depth) and the current depth
+- the visited set
+- the URLs of the current level and the fetch result of every URL of that
+  level completed so far
+- every page emitted by earlier levels, in order, so outputs can be rebuilt
+
+Level boundaries are written in a single transaction and fetch results are
+committed every ``interval`` pages, so the file is always consistent.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+class CrawlCheckpoint:
+    """
+    SQLite-backed crawl state
+    """
+
+    def __init__(self, path: Union[str, Path], interval: int = 50):
+        """
+        Open (or create) a checkpoint file
+
+        Args:
+            path: SQLite file to store the crawl state in
+            interval: Commit fetch results after this many pages
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.interval = max(1, interval)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS level (seq INTEGER PRIMARY KEY, url TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS level_done (url TEXT PRIMARY KEY, page TEXT);
+            CREATE TABLE IF NOT EXISTS pages (seq INTEGER PRIMARY KEY AUTOINCREMENT, page TEXT NOT NULL);
+        """)
+        self._conn.commit()
+
+    def _meta(self) -> Dict[str, Any]:
+        return {key: json.loads(value) for key, value in self._conn.execute("SELECT key, value FROM meta")}
+
+    def load(self, start_url: str, max_depth: int) -> Optional[Dict[str, Any]]:
+        """
+        Load the saved state of a crawl
+
+        Args:
+            start_url: Start URL of the crawl to resume
+            max_depth: Maximum depth of the crawl to resume
+
+        Returns:
+            Dictionary with ``depth``, ``level``, ``visited``, ``done`` and
+            ``complete``, or None if the file holds no state for this crawl
+        """
+        with self._lock:
+            meta = self._meta()
+            if meta.get('start_url') != start_url or meta.get('max_depth') != max_depth:
+                return None
+            done = {}
+            for url, page in self._conn.execute("SELECT url, page FROM level_done"):
+                done[url] = json.loads(page) if page is not None else None
+            return {
+                'depth': meta.get('depth', 0),
+                'complete': meta.get('complete', False),
+                'level': [url for (url,) in self._conn.execute("SELECT url FROM level ORDER BY seq")],
+                'visited': {url for (url,) in self._conn.execute("SELECT url FROM visited")},
+                'done': done,
+            }
+
+    def pages(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the pages emitted before the checkpoint, in order
+
+        Returns:
+            Iterator of page dictionaries
+        """
+        cursor = self._conn.cursor()
+        for (page,) in cursor.execute("SELECT page FROM pages ORDER BY seq"):
+            yield json.loads(page)
+
+    def reset(self, start_url: str, max_depth: int) -> None:
+        """
+        Discard any saved state and start a new crawl
+
+        Args:
+            start_url: Start URL of the new crawl
+            max_depth: Maximum depth of the new crawl
+        """
+        with self._lock:
+            for table in ('meta', 'visited', 'level', 'level_done', 'pages'):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._set_meta(start_url=start_url, max_depth=max_depth, depth=0, complete=False)
+            self._conn.commit()
+            self._pending = 0
+
+    def start_level(self, depth: int, urls: List[str]) -> None:
+        """
+        Record the start of a new depth level
+
+        Commits, together with the new level, every page emitted since the
+        previous level started.
+
+        Args:
+            depth: Depth of the level
+            urls: URLs to fetch at this depth (they join the visited set)
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM level")
+            self._conn.execute("DELETE FROM level_done")
+            self._conn.executemany("INSERT INTO level (seq, url) VALUES (?, ?)", enumerate(urls))
+            self._conn.executemany("INSERT OR IGNORE INTO visited (url) VALUES (?)", ((url,) for url in urls))
+            self._set_meta(depth=depth)
+            self._conn.commit()
+            self._pending = 0
+
+    def record(self, url: str, page: Optional[Dict[str, Any]]) -> None:
+        """
+        Record the fetch result of a URL of the current level
+
+        Args:
+            url: Fetched URL
+            page: Page dictionary, or None if the fetch failed
+        """
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO level_done (url, page) VALUES (?, ?)",
+                               (url, json.dumps(page, ensure_ascii=False) if page is not None else None))
+            self._pending += 1
+            if self._pending >= self.interval:
+                self._conn.commit()
+                self._pending = 0
+
+    def add_page(self, page: Dict[str, Any]) -> None:
+        """
+        Append an emitted page (committed with the next level or at the end)
+
+        Args:
+            page: Page dictionary
+        """
+        with self._lock:
+            self._conn.execute("INSERT INTO pages (page) VALUES (?)", (json.dumps(page, ensure_ascii=False),))
+
+    def finish(self) -> None:
+        """Mark the crawl as complete"""
+        with self._lock:
+            self._conn.execute("DELETE FROM level")
+            self._conn.execute("DELETE FROM level_done")
+            self._set_meta(complete=True)
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        """Commit outstanding results and close the file"""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def _set_meta(self, **values) -> None:
+        # Caller holds the lock
+        self._conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                               ((key, json.dumps(value)) for key, value in values.items()))
@@ -0,0 +1,186 @@
+"""
+Context Packing Module
+
+Extractive pre-compression of long texts: the most informative sentences
+are packed into a token budget, in their original order, before the text
+is sent to the LLM.
+
+Features:
+- Sentence scoring by TF-IDF centrality (cosine similarity to the
+  document centroid), which ranks navigation, cookie notices and other
+  boilerplate below the article body
+- Near-duplicate sentences packed only once
+- Greedy packing by score into a token budget, output in document order
+  with the original paragraph breaks; low-scoring sentences are dropped
+  even when budget is left
+- Pure Python and linear in the length of the text (apart from the
+  duplicate check against the few sentences already packed)
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+CHARS_PER_TOKEN = 4  # rough average for English text with common LLM tokenizers
+MAX_SENTENCE_CHARS = 600  # longer runs of text without punctuation are split
+MIN_SENTENCE_WORDS = 5  # shorter sentences (menu items, captions) score lower
+REDUNDANCY_THRESHOLD = 0.8  # cosine similarity above which a sentence repeats a packed one
+MIN_RELATIVE_SCORE = 0.1  # sentences scoring below this fraction of the best are never packed
+
+STOPWORDS = frozenset("""
+    a about above after again against all also am an and any are as at be because been before
+    being below between both but by can could did do does doing down during each few for from
+    further had has have having he her here hers herself him himself his how i if in into is it
+    its itself just me more most my myself no nor not now of off on once only or other our ours
+    ourselves out over own same she should so some such than that the their theirs them
+    themselves then there these they this those through to too under until up very was we were
+    what when where which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+_WORD_RE = re.compile(r"\w{2,}")
+_PARAGRAPH_RE = re.compile(r'\n\s*\n')
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+Vector = Dict[str, float]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the number of LLM tokens in a text
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """
+    Split a text into sentences
+
+    Args:
+        text: Text with paragraphs separated by blank lines
+
+    Returns:
+        List of (paragraph number, sentence) in document order
+    """
+    sentences = []
+    for number, paragraph in enumerate(_PARAGRAPH_RE.split(text)):
+        for sentence in _SENTENCE_RE.split(paragraph.strip()):
+            sentence = ' '.join(sentence.split())
+            while len(sentence) > MAX_SENTENCE_CHARS:
+                cut = sentence.rfind(' ', 0, MAX_SENTENCE_CHARS)
+                if cut <= 0:
+                    cut = MAX_SENTENCE_CHARS
+                sentences.append((number, sentence[:cut]))
+                sentence = sentence[cut:].lstrip()
+            if sentence:
+                sentences.append((number, sentence))
+    return sentences
+
+
+def _dot(a: Vector, b: Vector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def score_sentences(sentences: List[str]) -> Tuple[List[float], List[Vector]]:
+    """
+    Score sentences by TF-IDF centrality
+
+    Every sentence becomes a unit-length TF-IDF vector (sentences are the
+    documents for the IDF); its score is the cosine similarity to the
+    centroid of all sentences, so sentences about what most of the text is
+    about score highest. Repeats of a sentence (boilerplate repeated on the
+    page) score zero and do not pull the centroid towards themselves.
+
+    Args:
+        sentences: Sentences of one text
+
+    Returns:
+        Tuple of (scores, sentence vectors)
+    """
+    words = [_WORD_RE.findall(sentence.lower()) for sentence in sentences]
+    seen = set()
+    term_counts = []
+    for sentence_words in words:
+        key = ' '.join(sentence_words)
+        term_counts.append(Counter(word for word in sentence_words if word not in STOPWORDS)
+                           if key not in seen else Counter())
+        seen.add(key)
+    document_frequency = Counter(term for counts in term_counts for term in counts)
+    total = len(sentences)
+    idf = {term: math.log((1 + total) / (1 + count)) + 1 for term, count in document_frequency.items()}
+
+    vectors: List[Vector] = []
+    centroid: Vector = {}
+    for counts in term_counts:
+        vector = {term: (1 + math.log(count)) * idf[term] for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm:
+            vector = {term: weight / norm for term, weight in vector.items()}
+        vectors.append(vector)
+        for term, weight in vector.items():
+            centroid[term] = centroid.get(term, 0.0) + weight
+
+    centroid_norm = math.sqrt(sum(weight * weight for weight in centroid.values())) or 1.0
+    scores = []
+    for vector, sentence_words in zip(vectors, words):
+        score = _dot(vector, centroid) / centroid_norm
+        scores.append(score * min(1.0, len(sentence_words) / MIN_SENTENCE_WORDS))
+    return scores, vectors
+
+
+def pack_context(text: str, token_budget: int) -> str:
+    """
+    Reduce a text to its most informative sentences within a token budget
+
+    Sentences are taken by descending score as long as they fit and do not
+    repeat an already packed sentence, then put back in document order.
+    Sentences scoring far below the best one are left out even when budget
+    remains, so the prompt is not padded with boilerplate. Texts that
+    already fit are returned unchanged.
+
+    Args:
+        text: Text to compress
+        token_budget: Maximum estimated tokens of the result
+
+    Returns:
+        Packed text
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    sentences = split_sentences(text)
+    scores, vectors = score_sentences([sentence for _, sentence in sentences])
+
+    packed: List[int] = []
+    used = 0
+    min_score = max(scores, default=0.0) * MIN_RELATIVE_SCORE
+    for index in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+        if scores[index] < min_score or scores[index] <= 0:
+            break
+        cost = estimate_tokens(sentences[index][1]) + 1  # separator
+        if used + cost > token_budget:
+            continue
+        if any(_dot(vectors[index], vectors[other]) > REDUNDANCY_THRESHOLD for other in packed):
+            continue
+        packed.append(index)
+        used += cost
+        if token_budget - used < 2:
+            break
+
+    parts = []
+    previous_paragraph = None
+    for index in sorted(packed):
+        paragraph, sentence = sentences[index]
+        if previous_paragraph is not None:
+            parts.append('\n\n' if paragraph != previous_paragraph else ' ')
+        parts.append(sentence)
+        previous_paragraph = paragraph
+    return ''.join(parts)
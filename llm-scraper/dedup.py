@@ -0,0 +1,170 @@
+"""
+Near-Duplicate Detection Module
+
+SimHash fingerprints with LSH band buckets to spot pages whose content is
+nearly identical (versioned copies, print views, pages that only differ in
+navigation) before they are processed by the LLM.
+
+Features:
+- 64-bit SimHash over word shingles
+- Banded LSH index: candidates are found by bucket lookup, not a full scan
+- Exact Hamming-distance check on candidates
+- Duplicate clusters keyed by the first page seen
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_BITS = 64
+
+
+# Bit numbers (0 = least significant) set in each byte value
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def _feature_digest(feature: str) -> bytes:
+    return hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Compute the 64-bit SimHash of a text
+
+    Instead of updating 64 bit weights per feature, the feature hashes are
+    joined into one byte string and the byte values of each of the 8 byte
+    positions are counted in C (Counter over a bytes slice); the bit sums
+    are then taken from at most 256 distinct values per position.
+
+    Args:
+        text: Text to fingerprint
+        shingle_size: Number of consecutive words per feature
+
+    Returns:
+        Fingerprint as an integer
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < shingle_size:
+        features = Counter([' '.join(words)]) if words else Counter()
+    else:
+        features = Counter(map(' '.join, zip(*(words[i:] for i in range(shingle_size)))))
+
+    # One 8-byte big-endian digest per occurrence of a feature
+    digests = b''.join(_feature_digest(feature) * count for feature, count in features.items())
+    total = len(digests) // 8
+
+    fingerprint = 0
+    for position in range(8):
+        ones = [0] * 8
+        for value, count in Counter(digests[position::8]).items():
+            for bit in _BYTE_BITS[value]:
+                ones[bit] += count
+        shift = (7 - position) * 8
+        for bit in range(8):
+            # The bit's weight (occurrences with the bit set minus those without) is positive
+            if 2 * ones[bit] > total:
+                fingerprint |= 1 << (shift + bit)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(a ^ b).count('1')
+
+
+class NearDuplicateIndex:
+    """
+    Index of SimHash fingerprints supporting near-duplicate lookups
+
+    Fingerprints are split into ``max_distance + 1`` bands. Two fingerprints
+    within ``max_distance`` bits of each other must agree on at least one
+    band (pigeonhole principle), so looking up each band's bucket finds every
+    near duplicate. A single instance is safe to share between threads.
+    """
+
+    def __init__(self, max_distance: int = 3, shingle_size: int = 3):
+        """
+        Initialize the index
+
+        Args:
+            max_distance: Maximum Hamming distance for two pages to count as duplicates
+            shingle_size: Number of consecutive words per SimHash feature
+        """
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+        bands = max_distance + 1
+        self._band_bits = [(_BITS * i // bands, _BITS * (i + 1) // bands) for i in range(bands)]
+        self._buckets: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in range(bands)]
+        self.clusters: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def _bands(self, fingerprint: int):
+        for i, (lo, hi) in enumerate(self._band_bits):
+            yield i, (fingerprint >> lo) & ((1 << (hi - lo)) - 1)
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """
+        Find an indexed key whose fingerprint is within max_distance
+
+        Args:
+            fingerprint: SimHash to look up
+
+        Returns:
+            Key of the closest match or None
+        """
+        best = None
+        best_distance = self.max_distance + 1
+        for i, band in self._bands(fingerprint):
+            for other, key in self._buckets[i].get(band, ()):
+                distance = hamming_distance(fingerprint, other)
+                if distance < best_distance:
+                    best, best_distance = key, distance
+        return best
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """
+        Check a page against the index and register it if it is new
+
+        Args:
+            key: Page identifier (usually its URL)
+            text: Page content
+
+        Returns:
+            Key of the page this one duplicates, or None if it was added as new
+        """
+        return self.add_fingerprint(key, simhash(text, self.shingle_size))
+
+    def add_fingerprint(self, key: str, fingerprint: int) -> Optional[str]:
+        """
+        Like add, for a SimHash computed beforehand (e.g. in another process)
+
+        Args:
+            key: Page identifier (usually its URL)
+            fingerprint: SimHash of the page content, with this index's shingle size
+
+        Returns:
+            Key of the page this one duplicates, or None if it was added as new
+        """
+        with self._lock:
+            canonical = self.find(fingerprint)
+            if canonical is not None:
+                self.clusters[canonical].append(key)
+                return canonical
+            for i, band in self._bands(fingerprint):
+                self._buckets[i].setdefault(band, []).append((fingerprint, key))
+            self.clusters[key] = []
+            return None
+
+    def duplicate_count(self) -> int:
+        """Number of pages recognized as duplicates so far"""
+        return sum(len(members) for members in self.clusters.values())
+
+    def clear(self) -> None:
+        """Forget every indexed page"""
+        with self._lock:
+            for buckets in self._buckets:
+                buckets.clear()
+            self.clusters.clear()
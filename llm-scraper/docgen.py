@@ -0,0 +1,395 @@
+"""
+Documentation Generation Module
+
+Turns crawl results into hierarchical site documentation with the LLM:
+page summaries, section summaries grouped by URL path, and a site
+overview.
+
+Features:
+- Page summaries keyed by the page's content_hash, so a recrawl only
+  re-summarizes pages whose content changed
+- Section and overview summaries keyed by a hash of their inputs, so only
+  sections with changed, added or removed pages (and the overview above
+  them) are regenerated
+- Near-duplicate pages (``duplicate_of`` set) left out
+- Concurrent page and section summarization
+- Markdown output
+- Command-line entry point for JSON written by WebScraper.export_to_json
+
+Usage:
+    python docgen.py scraped_content.json -o docs.md
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from scrapper import PageContent
+from summarizer_llm import MODEL_NAME, summarize_text
+from summary_cache import summary_key
+
+logger = logging.getLogger(__name__)
+
+PAGE_PROMPT_TEMPLATE = """
+    The following is one page of a documentation website. In one short paragraph,
+    describe what the page covers: its purpose, the key concepts, and any APIs,
+    commands or settings it documents. Do not add an introduction.
+
+    --- PAGE ---
+    {text}
+    --- END PAGE ---
+
+    Summary:
+    """
+
+SECTION_PROMPT_TEMPLATE = """
+    The following are summaries of the pages in one section of a documentation
+    website. Write a concise overview of the section (one or two paragraphs):
+    what it is about and which topics its pages cover.
+
+    --- PAGE SUMMARIES ---
+    {text}
+    --- END PAGE SUMMARIES ---
+
+    Section overview:
+    """
+
+SITE_PROMPT_TEMPLATE = """
+    The following are overviews of the sections of a documentation website.
+    Write an overview of the whole site (2-4 paragraphs): what the documented
+    project is, what it offers, and where in the documentation to find what.
+
+    --- SECTION OVERVIEWS ---
+    {text}
+    --- END SECTION OVERVIEWS ---
+
+    Site overview:
+    """
+
+
+@dataclass
+class PageDoc:
+    """Summary of one page"""
+    url: str
+    title: str
+    summary: str
+
+
+@dataclass
+class SectionDoc:
+    """Summary of a group of pages sharing a URL path prefix"""
+    path: str
+    summary: str
+    pages: List[PageDoc] = field(default_factory=list)
+
+
+@dataclass
+class SiteDocs:
+    """Generated documentation of a crawled site"""
+    overview: str
+    sections: List[SectionDoc]
+    stats: Dict[str, int]
+
+    def to_markdown(self, title: str = "Site Documentation") -> str:
+        """
+        Render the documentation as Markdown
+
+        Args:
+            title: Top-level heading
+
+        Returns:
+            Markdown text
+        """
+        parts = [f"# {title}\n\n{self.overview.strip()}\n"]
+        for section in self.sections:
+            parts.append(f"\n## {section.path}\n\n{section.summary.strip()}\n")
+            for page in section.pages:
+                parts.append(f"\n### [{page.title or page.url}]({page.url})\n\n{page.summary.strip()}\n")
+        return "".join(parts)
+
+
+def section_path(url: str, depth: int = 2) -> str:
+    """
+    Get the section a page belongs to: its host and the first ``depth``
+    directories of its path
+
+    Args:
+        url: Page URL
+        depth: Number of path directories that make up a section
+
+    Returns:
+        Section path, e.g. ``docs.example.com/guide/install``
+    """
+    parts = urlsplit(url)
+    directories = [segment for segment in parts.path.split('/')[:-1] if segment]
+    return '/'.join([parts.netloc] + directories[:depth])
+
+
+class DocStore:
+    """
+    SQLite store of generated summaries and the input hash each was made from
+
+    A single instance is safe to share between threads.
+    """
+
+    def __init__(self, path: Union[str, Path] = ".cache/docgen.sqlite3"):
+        """
+        Open (or create) the store
+
+        Args:
+            path: SQLite file to store summaries in
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS docs (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, key: str, input_hash: str) -> Optional[str]:
+        """
+        Look up a summary
+
+        Args:
+            key: Page, section or site key
+            input_hash: Hash of the inputs the summary must have been made from
+
+        Returns:
+            Stored summary, or None if missing or made from other inputs
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT input_hash, summary FROM docs WHERE key = ?", (key,)).fetchone()
+        return row[1] if row is not None and row[0] == input_hash else None
+
+    def put(self, key: str, kind: str, input_hash: str, summary: str) -> None:
+        """
+        Store a summary
+
+        Args:
+            key: Page, section or site key
+            kind: "page", "section" or "site"
+            input_hash: Hash of the inputs the summary was made from
+            summary: Generated summary
+        """
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?, ?)",
+                               (key, kind, input_hash, summary, time.time()))
+            self._conn.commit()
+
+    def prune(self, kind: str, keep: Iterable[str]) -> int:
+        """
+        Delete the summaries of one kind whose keys are not in ``keep``
+
+        Args:
+            kind: "page", "section" or "site"
+            keep: Keys still in use
+
+        Returns:
+            Number of deleted summaries
+        """
+        keep = set(keep)
+        with self._lock:
+            stale = [key for (key,) in self._conn.execute("SELECT key FROM docs WHERE kind = ?", (kind,))
+                     if key not in keep]
+            self._conn.executemany("DELETE FROM docs WHERE key = ?", [(key,) for key in stale])
+            self._conn.commit()
+        return len(stale)
+
+    def close(self) -> None:
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+class DocGenerator:
+    """
+    Incremental page -> section -> site summarization of crawl results
+    """
+
+    def __init__(self,
+                 store: Optional[DocStore] = None,
+                 model: str = MODEL_NAME,
+                 section_depth: int = 2,
+                 workers: int = 2,
+                 use_cache: bool = True):
+        """
+        Initialize the generator
+
+        Args:
+            store: Where summaries are kept between runs
+                (default: .cache/docgen.sqlite3)
+            model: Ollama model used for summaries
+            section_depth: Number of URL path directories that make up a section
+            workers: Concurrent Ollama requests
+            use_cache: Whether LLM calls go through the summary cache
+        """
+        self.store = store or DocStore()
+        self.model = model
+        self.section_depth = section_depth
+        self.workers = max(1, workers)
+        self.use_cache = use_cache
+        self._stats_lock = threading.Lock()
+
+    def generate(self, pages: Iterable[Union[PageContent, Dict]]) -> SiteDocs:
+        """
+        Summarize a crawl, reusing every stored summary whose inputs are unchanged
+
+        Pages missing from the crawl are dropped from the store, so their
+        sections are regenerated without them.
+
+        Args:
+            pages: Crawl results (PageContent objects or their dictionaries)
+
+        Returns:
+            SiteDocs with the overview, section and page summaries, and
+            counts of generated and reused summaries
+        """
+        stats = {"pages": 0, "pages_summarized": 0, "pages_failed": 0,
+                 "sections": 0, "sections_summarized": 0, "site_summarized": 0}
+        unique = {}
+        for page in pages:
+            if isinstance(page, dict):
+                page = PageContent(**page)
+            if not page.duplicate_of and page.content.strip():
+                unique.setdefault(page.url, page)
+        stats["pages"] = len(unique)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            page_docs = list(executor.map(lambda page: self._page(page, stats), unique.values()))
+
+            # Sections in URL order, pages in URL order within them
+            grouped: Dict[str, List[Tuple[PageDoc, str]]] = {}
+            for page_doc in sorted((doc for doc in page_docs if doc is not None), key=lambda doc: doc[0].url):
+                grouped.setdefault(section_path(page_doc[0].url, self.section_depth), []).append(page_doc)
+            sections = list(executor.map(lambda item: self._section(item[0], item[1], stats),
+                                         sorted(grouped.items())))
+
+        overview = self._site(sections, stats)
+        stats["sections"] = len(sections)
+        self.store.prune("page", (f"page:{url}" for url in unique))
+        self.store.prune("section", (f"section:{section.path}" for section, _ in sections))
+        logger.info(f"Generated docs for {stats['pages']} pages: {stats['pages_summarized']} pages and "
+                    f"{stats['sections_summarized']}/{stats['sections']} sections summarized")
+        return SiteDocs(overview, [section for section, _ in sections], stats)
+
+    def _summarize(self, text: str, prompt_template: str, chunked: Optional[bool] = None) -> str:
+        summary = summarize_text(text, model=self.model, use_cache=self.use_cache,
+                                 chunked=chunked, prompt_template=prompt_template)
+        if summary.startswith("Error:"):
+            raise RuntimeError(summary)
+        return summary
+
+    def _count(self, stats: Dict[str, int], counter: str) -> None:
+        with self._stats_lock:
+            stats[counter] += 1
+
+    def _cached(self, key: str, kind: str, input_hash: str, text: str, prompt_template: str,
+                chunked: Optional[bool], stats: Dict[str, int], counter: str) -> str:
+        """Return the stored summary for unchanged inputs, or generate and store a new one"""
+        summary = self.store.get(key, input_hash)
+        if summary is None:
+            summary = self._summarize(text, prompt_template, chunked)
+            self.store.put(key, kind, input_hash, summary)
+            self._count(stats, counter)
+        return summary
+
+    def _page(self, page: PageContent, stats: Dict[str, int]) -> Optional[Tuple[PageDoc, str]]:
+        """Summarize a page; returns its summary and input hash (None if it failed)"""
+        input_hash = summary_key(f"{page.title}\n{page.content_hash}", self.model, PAGE_PROMPT_TEMPLATE)
+        text = f"Title: {page.title}\n\n{page.content}"
+        try:
+            summary = self._cached(f"page:{page.url}", "page", input_hash, text, PAGE_PROMPT_TEMPLATE,
+                                   None, stats, "pages_summarized")
+        except Exception as e:
+            logger.error(f"Could not summarize {page.url}: {e}")
+            self._count(stats, "pages_failed")
+            return None
+        return PageDoc(page.url, page.title, summary), input_hash
+
+    def _section(self, path: str, pages: List[Tuple[PageDoc, str]],
+                 stats: Dict[str, int]) -> Tuple[SectionDoc, str]:
+        """Summarize a section from its page summaries; returns it with its input hash"""
+        page_docs = [page_doc for page_doc, _ in pages]
+        input_hash = summary_key("\n".join(f"{doc.url}\t{page_hash}" for doc, page_hash in pages),
+                                 self.model, SECTION_PROMPT_TEMPLATE)
+        if len(page_docs) == 1:
+            # A one-page section is described by its page summary
+            return SectionDoc(path, page_docs[0].summary, page_docs), input_hash
+
+        text = f"Section: {path}\n\n" + "\n\n".join(f"{doc.title} ({doc.url}): {doc.summary.strip()}"
+                                                    for doc in page_docs)
+        summary = self._cached(f"section:{path}", "section", input_hash, text,
+                               SECTION_PROMPT_TEMPLATE, True, stats, "sections_summarized")
+        return SectionDoc(path, summary, page_docs), input_hash
+
+    def _site(self, sections: List[Tuple[SectionDoc, str]], stats: Dict[str, int]) -> str:
+        """Summarize the site from its section summaries"""
+        if not sections:
+            return ""
+        if len(sections) == 1:
+            return sections[0][0].summary
+        input_hash = summary_key("\n".join(f"{section.path}\t{section_hash}" for section, section_hash in sections),
+                                 self.model, SITE_PROMPT_TEMPLATE)
+        text = "\n\n".join(f"Section {section.path}: {section.summary.strip()}" for section, _ in sections)
+        return self._cached("site", "site", input_hash, text, SITE_PROMPT_TEMPLATE, True, stats, "site_summarized")
+
+
+def generate_docs(pages: Iterable[Union[PageContent, Dict]], **kwargs) -> SiteDocs:
+    """
+    Generate hierarchical documentation for crawl results
+
+    Args:
+        pages: Crawl results (PageContent objects or their dictionaries)
+        **kwargs: Additional arguments for DocGenerator
+
+    Returns:
+        SiteDocs
+    """
+    return DocGenerator(**kwargs).generate(pages)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate site documentation from crawl results.")
+    parser.add_argument("input", help="JSON file written by WebScraper.export_to_json")
+    parser.add_argument("-o", "--output", help="Output Markdown file (default: stdout)")
+    parser.add_argument("--store", default=".cache/docgen.sqlite3", help="SQLite file of stored summaries")
+    parser.add_argument("--title", default="Site Documentation")
+    parser.add_argument("--section-depth", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the summary cache")
+    args = parser.parse_args(argv)
+
+    with open(args.input, encoding="utf-8") as f:
+        pages = json.load(f)
+
+    docs = generate_docs(pages, store=DocStore(args.store), model=args.model, section_depth=args.section_depth,
+                         workers=args.workers, use_cache=not args.no_cache)
+    markdown = docs.to_markdown(args.title)
+    if args.output:
+        Path(args.output).write_text(markdown, encoding="utf-8")
+    else:
+        sys.stdout.write(markdown)
+    logger.info(f"Docs stats: {docs.stats}")
+    return 0 if docs.stats["pages_failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
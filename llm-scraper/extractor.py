@@ -0,0 +1,357 @@
+"""
+HTML Extraction Engine
+
+Extracts everything the scraper and the summarizer need from a page in a
+single streaming pass over the HTML, without building a document tree.
+
+Features:
+- Title, meta description, headers, links, main content and paragraphs
+  collected in one traversal
+- Content container chosen by a prioritized list of simple CSS selectors
+  (``tag``, ``.class``, ``#id``, ``[attr="value"]``)
+- Boilerplate elements (navigation, footers, ...) skipped while parsing
+  instead of being removed from a tree afterwards
+- Uses lxml's event parser when installed, the standard library parser otherwise
+"""
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional
+    etree = None
+
+# Containers tried, in order, for the scraper's main content
+CONTENT_SELECTORS = (
+    'main', 'article', '[role="main"]', '.content', '.main-content',
+    '.post-content', '.entry-content', '#content', '#main'
+)
+
+# Containers tried, in order, for the summarizer's article paragraphs
+ARTICLE_SELECTORS = ('main', 'article', '.content', '.post-content', '.entry-content')
+
+# Elements whose text never counts as page content
+BOILERPLATE_TAGS = ('nav', 'footer', 'header', 'aside', 'iframe', 'noscript')
+
+_HIDDEN_TAGS = frozenset({'script', 'style', 'template'})
+_HEADER_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+_VOID_TAGS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr'
+})
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+_SELECTOR_RE = re.compile(r'^\[([\w-]+)=["\']?([^"\'\]]*)["\']?\]$')
+
+
+@dataclass
+class ExtractedPage:
+    """Everything extracted from one HTML document"""
+    title: str = ""
+    meta_description: str = ""
+    headers: List[str] = field(default_factory=list)
+    links: List[str] = field(default_factory=list)
+    content: str = ""
+    paragraphs: List[str] = field(default_factory=list)
+    text: str = ""
+
+    def article_text(self) -> str:
+        """Paragraph text of the page, or all of its text if it has no paragraphs"""
+        if self.paragraphs:
+            return ' '.join(self.paragraphs)
+        return self.text
+
+
+def _compile_selector(selector: str) -> Tuple[str, str, str]:
+    """Turn a simple CSS selector into a (kind, name, value) rule"""
+    if selector.startswith('.'):
+        return ('class', 'class', selector[1:])
+    if selector.startswith('#'):
+        return ('attr', 'id', selector[1:])
+    match = _SELECTOR_RE.match(selector)
+    if match:
+        return ('attr', match.group(1).lower(), match.group(2))
+    return ('tag', selector.lower(), '')
+
+
+class _PageBuilder:
+    """
+    Event target shared by both parser backends
+
+    Receives start/end/data events and keeps just enough state to build an
+    ExtractedPage when the document ends.
+    """
+
+    def __init__(self, selectors: Sequence[Tuple[str, str, str]], boilerplate_tags: Iterable[str]):
+        self.selectors = selectors
+        self.boilerplate_tags = frozenset(boilerplate_tags)
+        # One capture per selector plus one for <body>; None until matched
+        self.captures: List[Optional[List[str]]] = [None] * (len(selectors) + 1)
+        self.open_captures: List[int] = []
+        self.stack: List[Tuple[str, Tuple]] = []
+        self.hidden = 0
+        self.removed = 0
+        self.title: Optional[List[str]] = None
+        self.title_open = False
+        self.meta_description = ""
+        self.headers: List[str] = []
+        self.header_parts: Optional[List[str]] = None
+        self.header_tag = ""
+        self.links: List[str] = []
+        self.paragraphs: List[Tuple[int, List[str]]] = []
+        self.open_paragraphs: List[Tuple[int, List[str]]] = []
+        self.text: List[str] = []
+
+    def start(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+        tag = tag.lower()
+        undo = []
+
+        if tag in _HIDDEN_TAGS:
+            self.hidden += 1
+            undo.append('hidden')
+        elif tag in self.boilerplate_tags:
+            self.removed += 1
+            undo.append('removed')
+
+        if tag == 'title' and self.title is None:
+            self.title = []
+            self.title_open = True
+            undo.append('title')
+        elif tag == 'meta':
+            if attrs.get('name') == 'description' and not self.meta_description and attrs.get('content'):
+                self.meta_description = attrs['content'].strip()
+        elif tag in _HEADER_TAGS and self.header_parts is None:
+            self.header_parts = []
+            self.header_tag = tag
+            undo.append('header')
+
+        if not self.removed and not self.hidden:
+            if tag == 'a' and attrs.get('href') is not None:
+                self.links.append(attrs['href'])
+
+            # Containers this element is inside of (not counting itself)
+            mask = 0
+            for i in self.open_captures:
+                mask |= 1 << i
+            for i, (kind, name, value) in enumerate(self.selectors):
+                if self.captures[i] is not None:
+                    continue
+                if kind == 'tag':
+                    matched = tag == name
+                elif kind == 'class':
+                    matched = value in (attrs.get('class') or '').split()
+                else:
+                    matched = attrs.get(name) == value
+                if matched:
+                    self.captures[i] = []
+                    self.open_captures.append(i)
+                    undo.append(('capture', i))
+            if tag == 'body' and self.captures[-1] is None:
+                i = len(self.selectors)
+                self.captures[i] = []
+                self.open_captures.append(i)
+                undo.append(('capture', i))
+
+            if tag == 'p':
+                paragraph = (mask, [])
+                self.paragraphs.append(paragraph)
+                self.open_paragraphs.append(paragraph)
+                undo.append('p')
+
+        self.stack.append((tag, tuple(undo)))
+
+    def end(self, tag: str) -> None:
+        tag = tag.lower()
+        # Tolerate unbalanced markup: close up to the matching open tag, ignore stray end tags
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > depth:
+            self._close(self.stack.pop()[1])
+
+    def _close(self, undo: Tuple) -> None:
+        for action in undo:
+            if action == 'hidden':
+                self.hidden -= 1
+            elif action == 'removed':
+                self.removed -= 1
+            elif action == 'title':
+                self.title_open = False
+            elif action == 'header':
+                header_text = ''.join(self.header_parts).strip()
+                if header_text:
+                    self.headers.append(f"{self.header_tag.upper()}: {header_text}")
+                self.header_parts = None
+            elif action == 'p':
+                self.open_paragraphs.pop()
+            else:
+                self.open_captures.remove(action[1])
+
+    def data(self, text: str) -> None:
+        if self.hidden:
+            return
+        if self.title_open:
+            self.title.append(text)
+        if self.header_parts is not None:
+            self.header_parts.append(text)
+
+        stripped = text.strip()
+        if not stripped or self.removed:
+            return
+
+        self.text.append(stripped)
+        for _, parts in self.open_paragraphs:
+            parts.append(stripped)
+        for i in self.open_captures:
+            self.captures[i].append(stripped)
+
+    def close(self) -> ExtractedPage:
+        while self.stack:
+            self._close(self.stack.pop()[1])
+
+        content_parts: List[str] = []
+        for parts in self.captures:
+            if parts is not None:
+                content_parts = parts
+                break
+
+        # Paragraphs of the first selector that matched, or of the whole page
+        paragraphs = self.paragraphs
+        for i, parts in enumerate(self.captures[:-1]):
+            if parts is not None:
+                paragraphs = [p for p in paragraphs if p[0] & (1 << i)]
+                break
+
+        return ExtractedPage(
+            title=''.join(self.title or ()).strip(),
+            meta_description=self.meta_description,
+            headers=self.headers,
+            links=self.links,
+            content=_WHITESPACE_RE.sub(' ', ' '.join(content_parts)).strip(),
+            paragraphs=[text for text in (''.join(parts) for _, parts in paragraphs) if text],
+            text=' '.join(self.text)
+        )
+
+
+class _StdlibParser(HTMLParser):
+    """Adapter feeding html.parser events into a _PageBuilder"""
+
+    def __init__(self, builder: _PageBuilder):
+        super().__init__(convert_charrefs=True)
+        self.builder = builder
+
+    def handle_starttag(self, tag, attrs):
+        self.builder.start(tag, dict(attrs))
+        if tag in _VOID_TAGS:
+            self.builder.end(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.builder.start(tag, dict(attrs))
+        self.builder.end(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in _VOID_TAGS:
+            self.builder.end(tag)
+
+    def handle_data(self, data):
+        self.builder.data(data)
+
+
+def decode_html(content: Union[bytes, str]) -> str:
+    """
+    Decode an HTML body using its BOM or <meta charset>, falling back to UTF-8
+
+    Args:
+        content: Raw response body
+
+    Returns:
+        Decoded document
+    """
+    if isinstance(content, str):
+        return content
+    if content.startswith(b'\xef\xbb\xbf'):
+        return content[3:].decode('utf-8', errors='replace')
+    if content.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return content.decode('utf-16', errors='replace')
+
+    match = _CHARSET_RE.search(content[:2048])
+    if match:
+        try:
+            return content.decode(match.group(1).decode('ascii'), errors='replace')
+        except LookupError:
+            pass
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content.decode('windows-1252', errors='replace')
+
+
+def available_parsers() -> List[str]:
+    """Names of the parser backends usable in this environment"""
+    return ['lxml', 'html.parser'] if etree is not None else ['html.parser']
+
+
+def extract_page(html: Union[bytes, str],
+                 content_selectors: Sequence[str] = CONTENT_SELECTORS,
+                 boilerplate_tags: Iterable[str] = BOILERPLATE_TAGS,
+                 parser: str = "auto") -> ExtractedPage:
+    """
+    Extract title, meta description, headers, links and content in one pass
+
+    Headers are collected from the whole page; links, content, paragraphs
+    and text skip boilerplate elements as well as script/style contents.
+
+    Args:
+        html: Raw or decoded HTML document
+        content_selectors: Selectors tried in order for the main content container
+            (falls back to <body>)
+        boilerplate_tags: Elements whose contents are skipped
+        parser: "lxml", "html.parser" or "auto" (lxml when installed)
+
+    Returns:
+        ExtractedPage with the extracted data
+    """
+    if parser == "auto":
+        parser = "lxml" if etree is not None else "html.parser"
+
+    builder = _PageBuilder([_compile_selector(s) for s in content_selectors], boilerplate_tags)
+
+    if parser == "lxml":
+        if etree is None:
+            raise ImportError("lxml is not installed; use parser='html.parser'")
+        lxml_parser = etree.HTMLParser(target=_LxmlTarget(builder))
+        lxml_parser.feed(decode_html(html))
+        return lxml_parser.close()
+
+    stdlib_parser = _StdlibParser(builder)
+    stdlib_parser.feed(decode_html(html))
+    stdlib_parser.close()
+    return builder.close()
+
+
+class _LxmlTarget:
+    """Adapter feeding lxml parser target events into a _PageBuilder"""
+
+    def __init__(self, builder: _PageBuilder):
+        self.builder = builder
+
+    def start(self, tag, attrib):
+        self.builder.start(tag, dict(attrib))
+
+    def end(self, tag):
+        self.builder.end(tag)
+
+    def data(self, data):
+        self.builder.data(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return self.builder.close()
@@ -0,0 +1,310 @@
+"""
+HTTP Response Cache Module
+
+Persistent on-disk cache for fetched pages with conditional revalidation.
+
+Features:
+- Responses stored in a local SQLite file, keyed by normalized URL
+- Size bound with least-recently-used eviction
+- ETag / Last-Modified revalidation (If-None-Match / If-Modified-Since),
+  so unchanged pages come back as 304s and are served from disk
+- Optional freshness window to skip the network entirely
+- Hit / miss / revalidation counters
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+
+from transport import fetch_limited
+
+
+def cache_key(url: str) -> str:
+    """
+    Normalize a URL into a cache key
+
+    Lowercases scheme and host, drops the fragment and trailing slash and
+    sorts query parameters so equivalent URLs share one entry.
+
+    Args:
+        url: Raw URL string
+
+    Returns:
+        Normalized URL string
+    """
+    parsed = urlparse(url)
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((
+        parsed.scheme.lower(),
+        parsed.netloc.lower(),
+        parsed.path.rstrip('/') or '/',
+        parsed.params,
+        query,
+        ''
+    ))
+
+
+@dataclass
+class CachedResponse:
+    """Response returned by HTTPCache.fetch, either from the network or from disk"""
+    url: str
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def raise_for_status(self) -> None:
+        """Raise requests.HTTPError for 4xx/5xx responses, like requests.Response"""
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=None)
+
+
+class HTTPCache:
+    """
+    Size-bounded on-disk HTTP cache with conditional revalidation
+
+    A single instance is safe to share between threads.
+    """
+
+    def __init__(self,
+                 path: Union[str, Path] = ".cache/http_cache.sqlite3",
+                 max_bytes: int = 256 * 1024 * 1024,
+                 max_age: float = 0):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file to store responses in
+            max_bytes: Maximum total size of stored bodies before LRU eviction
+            max_age: Seconds an entry is served without revalidation (0 = always revalidate)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def fetch(self,
+              session: requests.Session,
+              url: str,
+              headers: Optional[Dict[str, str]] = None,
+              fresh_since: Optional[float] = None,
+              max_bytes: Optional[int] = None,
+              content_types: Optional[Iterable[str]] = None,
+              **kwargs) -> CachedResponse:
+        """
+        GET a URL through the cache
+
+        Args:
+            session: requests session used for network requests
+            url: URL to fetch
+            headers: Extra request headers
+            fresh_since: Unix time the page last changed (e.g. a sitemap
+                lastmod); a copy stored after it is served without a request
+            max_bytes: Abandon downloads larger than this (streamed, see
+                transport.fetch_limited)
+            content_types: Accepted media types of downloads (streamed, see
+                transport.fetch_limited)
+            **kwargs: Additional arguments for session.get (e.g. timeout)
+
+        Returns:
+            CachedResponse with the page body
+        """
+        key = cache_key(url)
+        entry = self._load(key)
+        request_headers = dict(headers or {})
+
+        if entry is not None:
+            fresh = bool(self.max_age) and time.time() - entry['stored_at'] < self.max_age
+            if fresh_since is not None and entry['stored_at'] >= fresh_since:
+                fresh = True
+            if fresh:
+                self._touch(key, refresh=False)
+                with self._lock:
+                    self.hits += 1
+                return self._to_response(url, entry)
+
+            if entry['etag']:
+                request_headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request_headers['If-Modified-Since'] = entry['last_modified']
+            if entry['etag'] or entry['last_modified']:
+                with self._lock:
+                    self.revalidations += 1
+
+        if max_bytes is not None or content_types is not None:
+            response = fetch_limited(session, url, max_bytes=max_bytes, content_types=content_types,
+                                     headers=request_headers, **kwargs)
+        else:
+            response = session.get(url, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self._touch(key, refresh=True)
+            with self._lock:
+                self.hits += 1
+                self.not_modified += 1
+            return self._to_response(url, entry)
+
+        with self._lock:
+            self.misses += 1
+
+        if response.status_code == 200 and self._cacheable(response):
+            self.store(url, response)
+
+        return CachedResponse(
+            url=url,
+            status_code=response.status_code,
+            content=response.content,
+            headers=dict(response.headers),
+            from_cache=False
+        )
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """
+        Store a response body and its validators
+
+        Args:
+            url: Requested URL
+            response: Response with status 200
+        """
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+
+        key = cache_key(url)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, response.status_code,
+                 response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'),
+                 response.headers.get('Content-Type'),
+                 sqlite3.Binary(body), len(body), now, now)
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hit/miss/revalidation counters and cache size
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "not_modified": self.not_modified,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_bytes": self._size,
+            }
+
+    def clear(self) -> None:
+        """Remove every stored response"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._size = 0
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
+
+    def _load(self, key: str) -> Optional[Dict[str, object]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status_code, etag, last_modified, content_type, body, stored_at "
+                "FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'url': row[0], 'status_code': row[1], 'etag': row[2], 'last_modified': row[3],
+            'content_type': row[4], 'body': bytes(row[5]), 'stored_at': row[6]
+        }
+
+    def _touch(self, key: str, refresh: bool) -> None:
+        now = time.time()
+        with self._lock:
+            if refresh:
+                self._conn.execute("UPDATE responses SET last_access = ?, stored_at = ? WHERE key = ?",
+                                   (now, now, key))
+            else:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        while self._size > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._size = 0
+                return
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._size -= row[1]
+            self.evictions += 1
+
+    @staticmethod
+    def _cacheable(response: requests.Response) -> bool:
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        return 'no-store' not in cache_control
+
+    @staticmethod
+    def _to_response(url: str, entry: Dict[str, object]) -> CachedResponse:
+        headers = {}
+        if entry['content_type']:
+            headers['Content-Type'] = entry['content_type']
+        if entry['etag']:
+            headers['ETag'] = entry['etag']
+        if entry['last_modified']:
+            headers['Last-Modified'] = entry['last_modified']
+        return CachedResponse(
+            url=url,
+            status_code=entry['status_code'],
+            content=entry['body'],
+            headers=headers,
+            from_cache=True
+        )
@@ -0,0 +1,228 @@
+"""
+Background Job Queue Module
+
+Persistent submit/poll job queue for long-running summarization work.
+
+Features:
+- Jobs stored in a local SQLite file so they survive restarts
+- Bounded worker pool and bounded queue depth
+- Jobs that were queued or running when the process stopped are picked up again
+- Queue statistics (queued / running / done / failed)
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from metrics import QUEUE_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue processed by a pool of worker threads
+
+    ``handler`` receives the job's parameters as a dict and returns a
+    JSON-serializable result. Exceptions mark the job as failed with the
+    exception message as its error.
+    """
+
+    def __init__(self,
+                 handler: Callable[[Dict[str, Any]], Any],
+                 path: Union[str, Path] = ".cache/jobs.sqlite3",
+                 max_workers: int = 2,
+                 max_queued: int = 100,
+                 retention: float = 7 * 24 * 3600):
+        """
+        Initialize the job queue (workers start with ``start``)
+
+        Args:
+            handler: Function that runs a job
+            path: SQLite file to store jobs in
+            max_workers: Number of worker threads
+            max_queued: Maximum number of jobs waiting to run
+            retention: Seconds finished jobs are kept before being pruned
+        """
+        self.handler = handler
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.retention = retention
+        self._pending: "queue.Queue[str]" = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                params TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+        self._conn.commit()
+
+    def start(self) -> None:
+        """Recover unfinished jobs and start the worker threads (idempotent)"""
+        with self._lock:
+            if self._workers:
+                return
+
+            # Jobs that were running when the process died start over
+            self._conn.execute("UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?",
+                               (QUEUED, RUNNING))
+            self._conn.execute("DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                               (DONE, FAILED, time.time() - self.retention))
+            self._conn.commit()
+            for (job_id,) in self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall():
+                self._pending.put(job_id)
+
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+        logger.info(f"Job queue started with {self.max_workers} workers, "
+                    f"{self._pending.qsize()} jobs pending")
+
+    def submit(self, **params) -> str:
+        """
+        Queue a new job
+
+        Args:
+            **params: JSON-serializable parameters passed to the handler
+
+        Returns:
+            Job id
+
+        Raises:
+            QueueFullError: If max_queued jobs are already waiting
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            queued = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+            if queued >= self.max_queued:
+                raise QueueFullError(f"Job queue is full ({queued} jobs waiting)")
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, params, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(params), time.time())
+            )
+            self._conn.commit()
+        self._pending.put(job_id)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job
+
+        Args:
+            job_id: Id returned by submit
+
+        Returns:
+            Dictionary describing the job or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, params, result, error, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            position = None
+            if row is not None and row[1] == QUEUED:
+                position = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at < ?", (QUEUED, row[5])
+                ).fetchone()[0]
+        if row is None:
+            return None
+
+        job = {
+            "id": row[0],
+            "status": row[1],
+            "params": json.loads(row[2]),
+            "result": json.loads(row[3]) if row[3] is not None else None,
+            "error": row[4],
+            "created_at": row[5],
+            "started_at": row[6],
+            "finished_at": row[7],
+        }
+        if position is not None:
+            job["queue_position"] = position
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get queue statistics
+
+        Returns:
+            Dictionary with job counts per status and the worker count
+        """
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {
+            "queued": counts.get(QUEUED, 0),
+            "running": counts.get(RUNNING, 0),
+            "done": counts.get(DONE, 0),
+            "failed": counts.get(FAILED, 0),
+            "workers": len(self._workers),
+            "max_queued": self.max_queued,
+        }
+
+    def _claim(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # Only one worker (or process) may move a job from queued to running
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, time.time(), job_id, QUEUED)
+            )
+            self._conn.commit()
+            if cursor.rowcount != 1:
+                return None
+            row = self._conn.execute("SELECT params, created_at, started_at FROM jobs WHERE id = ?",
+                                     (job_id,)).fetchone()
+        QUEUE_WAIT_SECONDS.observe(max(0.0, row[2] - row[1]), queue="jobs")
+        return json.loads(row[0])
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._pending.get()
+            params = self._claim(job_id)
+            if params is None:
+                continue
+            try:
+                result = self.handler(params)
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                self._finish(job_id, FAILED, error=str(e))
+            else:
+                self._finish(job_id, DONE, result=result)
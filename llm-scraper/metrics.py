@@ -0,0 +1,270 @@
+"""
+Metrics Module
+
+Counters and histograms for every stage of scraping and summarization,
+rendered in the Prometheus text exposition format.
+
+Features:
+- Thread-safe counters, gauges and histograms with labels
+- Histogram timers usable as context managers
+- A process-wide registry rendered by the app's /metrics route
+- Predefined metrics for fetch latency, bytes downloaded, parse time,
+  queue wait, LLM token throughput and Ollama backend load
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Buckets in seconds, from fast cache hits to slow LLM calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+TOKEN_RATE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class holding one value (or histogram) per label combination"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional["MetricsRegistry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key: LabelValues, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing total"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Add to the counter for the given label values"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Current total for the given label values"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        """Set the gauge for the given label values"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, registry: Optional["MetricsRegistry"] = None):
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, **labels) -> None:
+        """Record one observation for the given label values"""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [bucket counts..., sum, count]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the with block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self, **labels) -> Dict[str, float]:
+        """Count, sum and mean of the observations for the given label values"""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            count, total = (state[-1], state[-2]) if state else (0, 0.0)
+        return {"count": count, "sum": total, "mean": total / count if count else 0.0}
+
+    def _render_sample(self, key: LabelValues, state) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+        lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class StageTimer:
+    """
+    Thread-safe running totals of time (and bytes) spent per stage
+
+    Used for per-instance statistics next to the process-wide histograms.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float, size: int = 0) -> None:
+        """Record one run of a stage"""
+        with self._lock:
+            totals = self._stages.setdefault(stage, [0, 0.0, 0.0, 0])  # count, sum, max, bytes
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+            totals[3] += size
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, total, mean and max seconds (and bytes, if any) per stage"""
+        with self._lock:
+            stages = {stage: list(totals) for stage, totals in self._stages.items()}
+        result = {}
+        for stage, (count, total, longest, size) in stages.items():
+            result[stage] = {
+                "count": count,
+                "total_seconds": round(total, 4),
+                "mean_seconds": round(total / count, 4) if count else 0.0,
+                "max_seconds": round(longest, 4),
+            }
+            if size:
+                result[stage]["bytes"] = size
+        return result
+
+    def clear(self) -> None:
+        """Reset every total"""
+        with self._lock:
+            self._stages.clear()
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        """Add a metric (names must be unique)"""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric name: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# --- Scraping ---
+FETCH_SECONDS = Histogram("scraper_fetch_seconds", "Time spent downloading a page", ["source"])
+FETCHES = Counter("scraper_fetches_total", "Page downloads by outcome", ["outcome"])
+FETCH_BYTES = Counter("scraper_fetch_bytes_total", "Bytes of page bodies downloaded or served from cache", ["source"])
+PARSE_SECONDS = Histogram("scraper_parse_seconds", "Time spent extracting content and links from a page")
+
+# --- Queues ---
+QUEUE_WAIT_SECONDS = Histogram("queue_wait_seconds", "Time items wait in a queue before a worker takes them",
+                               ["queue"])
+JOBS = Gauge("jobs", "Jobs in the background job queue by status", ["status"])
+SINGLE_FLIGHT_SHARED = Counter("singleflight_shared_total",
+                               "Calls answered by an identical call already in flight", ["flight"])
+
+# --- LLM ---
+LLM_REQUEST_SECONDS = Histogram("llm_request_seconds", "Duration of LLM generation requests", ["model"])
+LLM_PROMPT_TOKENS = Counter("llm_prompt_tokens_total", "Prompt tokens evaluated by the LLM", ["model"])
+LLM_EVAL_TOKENS = Counter("llm_eval_tokens_total", "Tokens generated by the LLM", ["model"])
+LLM_EVAL_SECONDS = Counter("llm_eval_seconds_total", "Time the LLM spent generating tokens", ["model"])
+LLM_TOKENS_PER_SECOND = Histogram("llm_tokens_per_second", "Generation speed of each LLM request", ["model"],
+                                  buckets=TOKEN_RATE_BUCKETS)
+LLM_BACKEND_IN_FLIGHT = Gauge("llm_backend_in_flight", "Requests running on each Ollama backend", ["backend"])
+LLM_BACKEND_UP = Gauge("llm_backend_up", "Whether an Ollama backend is in rotation (1) or ejected (0)", ["backend"])
+
+
+def record_llm_response(model: str, response, seconds: float) -> None:
+    """
+    Record duration and token counts of an Ollama chat response
+
+    Args:
+        model: Model name
+        response: Final (``done``) chat response carrying Ollama's counters
+        seconds: Wall-clock duration of the request
+    """
+    LLM_REQUEST_SECONDS.observe(seconds, model=model)
+    prompt_tokens = response.get('prompt_eval_count') or 0
+    eval_tokens = response.get('eval_count') or 0
+    eval_seconds = (response.get('eval_duration') or 0) / 1e9
+    LLM_PROMPT_TOKENS.inc(prompt_tokens, model=model)
+    LLM_EVAL_TOKENS.inc(eval_tokens, model=model)
+    LLM_EVAL_SECONDS.inc(eval_seconds, model=model)
+    if eval_tokens and eval_seconds:
+        LLM_TOKENS_PER_SECOND.observe(eval_tokens / eval_seconds, model=model)
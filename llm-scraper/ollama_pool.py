@@ -0,0 +1,419 @@
+"""
+Ollama Backend Pool Module
+
+Spreads LLM requests over several Ollama servers instead of queueing them
+all on one.
+
+Features:
+- Least-outstanding-requests routing among the backends that have the
+  requested model installed
+- Per-backend concurrency cap: when every backend is busy, callers wait for
+  a free slot instead of overloading a server
+- Health checks against /api/tags that also discover each backend's models
+- Backends that fail a request or a health check are ejected and probed
+  again after a backoff that doubles with every failed probe
+- Failed requests are retried on another backend, also streamed ones as
+  long as no token has been produced yet
+- Per-backend request, failure and in-flight statistics
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import httpx
+import ollama
+
+from metrics import LLM_BACKEND_IN_FLIGHT, LLM_BACKEND_UP
+
+logger = logging.getLogger(__name__)
+
+HEALTH_TIMEOUT = 5  # seconds a health check may take
+RETRY_AFTER = 5  # seconds before an ejected backend is probed the first time
+MAX_RETRY_AFTER = 300  # longest wait between probes of an ejected backend
+ACQUIRE_TIMEOUT = 300  # seconds a request waits for a free backend slot
+
+
+class NoBackendAvailable(RuntimeError):
+    """No healthy backend has the requested model, or none had a free slot in time"""
+
+
+class OllamaBackend:
+    """
+    One Ollama server of a pool
+
+    The pool updates the state of its backends; read it through stats().
+    """
+
+    def __init__(self,
+                 host: str,
+                 max_concurrency: int = 4,
+                 models: Optional[Sequence[str]] = None,
+                 retries: int = 2,
+                 event_hooks: Optional[Dict[str, list]] = None):
+        """
+        Create the client of one server
+
+        Args:
+            host: Base URL of the Ollama server
+            max_concurrency: Requests sent to the server at the same time
+                (match the server's OLLAMA_NUM_PARALLEL)
+            models: Models to route to this server; by default those its
+                health checks report
+            retries: Retries when connecting to the server fails
+            event_hooks: httpx event hooks of the client
+        """
+        self.host = host.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.configured_models = list(models) if models else None
+        self.client = ollama.Client(
+            host=self.host,
+            transport=httpx.HTTPTransport(
+                retries=retries,
+                limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+            ),
+            event_hooks=event_hooks or {}
+        )
+
+        self.healthy = True  # until a request or health check fails
+        self.models: Optional[List[dict]] = None  # as reported by /api/tags, once checked
+        self.checked_at: Optional[float] = None
+        self.retry_at = 0.0
+        self.retry_after = RETRY_AFTER
+        self.probing = False
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def serves(self, model: str) -> bool:
+        """Whether requests for a model may be routed to this backend"""
+        if self.configured_models is not None:
+            return any(name.startswith(model) or model.startswith(name) for name in self.configured_models)
+        if self.models is None:
+            return True  # not checked yet
+        return any(entry.get('name', '').startswith(model) for entry in self.models)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current state and counters of the backend"""
+        return {
+            'host': self.host,
+            'healthy': self.healthy,
+            'in_flight': self.in_flight,
+            'max_concurrency': self.max_concurrency,
+            'requests': self.requests,
+            'failures': self.failures,
+            'ejections': self.ejections,
+            'models': [entry.get('name') for entry in self.models] if self.models is not None else None,
+        }
+
+
+class BackendPool:
+    """
+    Load-balanced set of Ollama backends
+
+    A single instance is safe to share between threads.
+    """
+
+    def __init__(self,
+                 backends: Iterable[OllamaBackend],
+                 health_timeout: float = HEALTH_TIMEOUT,
+                 acquire_timeout: float = ACQUIRE_TIMEOUT,
+                 max_retry_after: float = MAX_RETRY_AFTER):
+        """
+        Initialize the pool
+
+        Args:
+            backends: Servers to spread requests over
+            health_timeout: Seconds a health check may take
+            acquire_timeout: Seconds a request waits for a free backend slot
+            max_retry_after: Longest wait between probes of an ejected backend
+        """
+        self.backends = list(backends)
+        if not self.backends:
+            raise ValueError("A backend pool needs at least one backend")
+        self.health_timeout = health_timeout
+        self.acquire_timeout = acquire_timeout
+        self.max_retry_after = max_retry_after
+        self._http = httpx.Client(timeout=health_timeout)
+        self._condition = threading.Condition()
+        for backend in self.backends:
+            self._update_gauges(backend)
+
+    @classmethod
+    def from_hosts(cls, hosts: Iterable[str], max_concurrency: int = 4, **kwargs) -> "BackendPool":
+        """
+        Create a pool of servers with the same concurrency cap
+
+        Args:
+            hosts: Base URLs of the Ollama servers
+            max_concurrency: Concurrent requests per server
+            **kwargs: Additional arguments for OllamaBackend
+
+        Returns:
+            BackendPool
+        """
+        return cls(OllamaBackend(host, max_concurrency=max_concurrency, **kwargs) for host in hosts)
+
+    @property
+    def hosts(self) -> List[str]:
+        """Base URLs of the backends"""
+        return [backend.host for backend in self.backends]
+
+    def check_health(self, max_age: float = 0) -> None:
+        """
+        Health-check the backends and refresh their model lists
+
+        Ejected backends are probed regardless of their backoff.
+
+        Args:
+            max_age: Skip backends checked successfully in the last max_age seconds
+        """
+        now = time.monotonic()
+        for backend in self.backends:
+            fresh = backend.healthy and backend.checked_at is not None and now - backend.checked_at < max_age
+            if not fresh:
+                self._probe(backend)
+
+    def models(self) -> List[dict]:
+        """Models installed on the healthy backends (as reported by /api/tags), without duplicates"""
+        seen = {}
+        for backend in self.backends:
+            if backend.healthy and backend.models:
+                for entry in backend.models:
+                    seen.setdefault(entry.get('name'), entry)
+        return list(seen.values())
+
+    def healthy(self) -> List[OllamaBackend]:
+        """Backends that are not ejected"""
+        return [backend for backend in self.backends if backend.healthy]
+
+    @contextmanager
+    def acquire(self, model: str, exclude: Sequence[OllamaBackend] = ()) -> Iterator[OllamaBackend]:
+        """
+        Reserve a slot on the least busy backend serving a model
+
+        Ejected backends whose backoff has passed are probed first and, if
+        they answer, take requests again.
+
+        Args:
+            model: Model the request is for
+            exclude: Backends not to use (e.g. ones that just failed)
+
+        Returns:
+            Context manager yielding the backend; the slot is freed on exit
+
+        Raises:
+            NoBackendAvailable: No healthy backend serves the model, or no
+                slot was free within acquire_timeout
+        """
+        backend = self._reserve(model, exclude)
+        try:
+            yield backend
+        finally:
+            self._release(backend)
+
+    def chat(self, model: str, messages: List[dict], **kwargs) -> Any:
+        """
+        Run a non-streaming chat request on the pool
+
+        Connection errors and server errors eject the backend and the request
+        is retried on the next one.
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            **kwargs: Additional arguments for ollama.Client.chat
+
+        Returns:
+            The chat response
+        """
+        tried: List[OllamaBackend] = []
+        while True:
+            backend = self._reserve_retry(model, tried)
+            try:
+                return backend.client.chat(model=model, messages=messages, stream=False, **kwargs)
+            except Exception as error:
+                if not self._failed(backend, model, error):
+                    raise
+                tried.append(backend)
+                logger.warning(f"Retrying on another backend after {backend.host} failed: {error}")
+            finally:
+                self._release(backend)
+
+    def chat_stream(self, model: str, messages: List[dict], **kwargs) -> Iterator[Any]:
+        """
+        Run a streaming chat request on the pool
+
+        The request moves to another backend if it fails before the first
+        chunk arrives; later errors are raised. The backend slot is held
+        until the stream is exhausted or closed.
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            **kwargs: Additional arguments for ollama.Client.chat
+
+        Returns:
+            Iterator over the response chunks
+        """
+        tried: List[OllamaBackend] = []
+        while True:
+            backend = self._reserve_retry(model, tried)
+            try:
+                try:
+                    stream = backend.client.chat(model=model, messages=messages, stream=True, **kwargs)
+                    first = next(stream, None)
+                except Exception as error:
+                    if not self._failed(backend, model, error):
+                        raise
+                    tried.append(backend)
+                    logger.warning(f"Retrying on another backend after {backend.host} failed: {error}")
+                    continue
+
+                try:
+                    if first is not None:
+                        yield first
+                    yield from stream
+                except Exception as error:
+                    self._failed(backend, model, error)
+                    raise
+                return
+            finally:
+                self._release(backend)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-backend state and totals of the pool"""
+        with self._condition:
+            backends = [backend.stats() for backend in self.backends]
+        return {
+            'backends': backends,
+            'healthy': sum(1 for backend in backends if backend['healthy']),
+            'in_flight': sum(backend['in_flight'] for backend in backends),
+            'max_concurrency': sum(backend['max_concurrency'] for backend in backends if backend['healthy']),
+        }
+
+    def _reserve_retry(self, model: str, tried: List[OllamaBackend]) -> OllamaBackend:
+        """_reserve(), reporting the failed backends once none is left to retry on"""
+        try:
+            return self._reserve(model, tried)
+        except NoBackendAvailable:
+            if tried:
+                raise NoBackendAvailable(f"All backends serving {model} failed: "
+                                         f"{', '.join(backend.host for backend in tried)}") from None
+            raise
+
+    def _reserve(self, model: str, exclude: Sequence[OllamaBackend]) -> OllamaBackend:
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                candidates = [backend for backend in self.backends
+                              if backend not in exclude and backend.serves(model)]
+                due = [backend for backend in candidates
+                       if not backend.healthy and not backend.probing and backend.retry_at <= now]
+                if due:
+                    for backend in due:
+                        backend.probing = True
+                    self._condition.release()
+                    try:
+                        for backend in due:
+                            self._probe(backend)
+                    finally:
+                        self._condition.acquire()
+                    continue
+
+                # Re-check serves(): a probe may have updated the model list
+                healthy = [backend for backend in candidates if backend.healthy and backend.serves(model)]
+                if not healthy:
+                    if any(backend.probing for backend in candidates):
+                        self._condition.wait(self.health_timeout)
+                        continue
+                    raise NoBackendAvailable(f"No healthy Ollama backend serves {model} "
+                                             f"(backends: {', '.join(self.hosts)})")
+
+                free = [backend for backend in healthy if backend.in_flight < backend.max_concurrency]
+                if free:
+                    backend = min(free, key=lambda b: (b.in_flight, b.requests))
+                    backend.in_flight += 1
+                    backend.requests += 1
+                    self._update_gauges(backend)
+                    return backend
+
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise NoBackendAvailable(f"No Ollama backend slot for {model} "
+                                             f"became free within {self.acquire_timeout}s")
+                self._condition.wait(remaining)
+
+    def _release(self, backend: OllamaBackend) -> None:
+        with self._condition:
+            backend.in_flight -= 1
+            self._update_gauges(backend)
+            self._condition.notify_all()
+
+    def _probe(self, backend: OllamaBackend) -> bool:
+        """Health-check one backend; takes it back or (keeps it) out of rotation"""
+        try:
+            response = self._http.get(f"{backend.host}/api/tags")
+            response.raise_for_status()
+            models = response.json().get('models', [])
+        except (httpx.HTTPError, ValueError) as error:
+            with self._condition:
+                backend.probing = False
+                self._eject(backend, f"health check failed: {error}")
+                self._condition.notify_all()
+            return False
+
+        with self._condition:
+            if not backend.healthy:
+                logger.info(f"Ollama backend {backend.host} is back")
+            backend.models = models
+            backend.checked_at = time.monotonic()
+            backend.healthy = True
+            backend.probing = False
+            backend.retry_after = RETRY_AFTER
+            self._update_gauges(backend)
+            self._condition.notify_all()
+        return True
+
+    def _failed(self, backend: OllamaBackend, model: str, error: Exception) -> bool:
+        """
+        Account for a failed request
+
+        Returns:
+            True if the request may be retried on another backend
+        """
+        if isinstance(error, ollama.ResponseError) and error.status_code == 404:
+            # The model is not installed there (any more); drop it from the routing
+            with self._condition:
+                if backend.models is not None:
+                    backend.models = [entry for entry in backend.models
+                                      if not entry.get('name', '').startswith(model)]
+            return True
+        server_error = isinstance(error, ollama.ResponseError) and error.status_code >= 500
+        if isinstance(error, (ConnectionError, httpx.TransportError)) or server_error:
+            with self._condition:
+                backend.failures += 1
+                self._eject(backend, str(error))
+            return True
+        return False
+
+    def _eject(self, backend: OllamaBackend, reason: str) -> None:
+        """Take a backend out of rotation until its next probe (call with the lock held)"""
+        if backend.healthy:
+            backend.ejections += 1
+            backend.retry_after = RETRY_AFTER
+            logger.warning(f"Ejecting Ollama backend {backend.host}: {reason}")
+        else:
+            backend.retry_after = min(backend.retry_after * 2, self.max_retry_after)
+        backend.healthy = False
+        backend.retry_at = time.monotonic() + backend.retry_after
+        self._update_gauges(backend)
+
+    @staticmethod
+    def _update_gauges(backend: OllamaBackend) -> None:
+        LLM_BACKEND_IN_FLIGHT.set(backend.in_flight, backend=backend.host)
+        LLM_BACKEND_UP.set(1 if backend.healthy else 0, backend=backend.host)
@@ -0,0 +1,321 @@
+"""
+Batch Summarization Pipeline
+
+Summarizes many URLs at once by running fetching, extraction and LLM
+summarization as separate pipeline stages.
+
+Features:
+- One worker pool per stage, each with its own concurrency limit
+  (many fetchers for network I/O, few extractors for CPU, and as many
+  summarizers as Ollama can serve in parallel)
+- Extraction runs in the scraper's parse worker processes, so parsing
+  is not serialized by the GIL with the fetch threads
+- Pages are downloaded by one scraper shared by every batch of the
+  process, with its per-host delay, rate limiter and robots.txt rules
+- Bounded queues between stages so a slow stage applies backpressure
+  instead of buffering the whole batch in memory
+- Results are yielded as soon as each URL completes, in completion order
+- Near-duplicate pages are detected after extraction and never reach the LLM
+- Closing the result iterator stops the batch
+- Command-line entry point that writes results as JSONL
+
+Usage:
+    python pipeline.py urls.txt -o summaries.jsonl
+    cat urls.txt | python pipeline.py - > summaries.jsonl
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from dedup import NearDuplicateIndex
+from metrics import QUEUE_WAIT_SECONDS
+from scrapper import WebScraper
+from summarizer_llm import MODEL_NAME, summarize_text, transport
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # end-of-stream marker passed between stages
+_POLL_SECONDS = 0.1  # how often blocked stages check whether the batch was stopped
+
+# Pages are downloaded by one scraper per process, so every batch shares its
+# connection pool, rate limiter and robots.txt cache
+SCRAPER_WORKERS = 16
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+_shared_scraper: Optional[WebScraper] = None
+_shared_scraper_lock = threading.Lock()
+
+
+def shared_scraper() -> WebScraper:
+    """
+    The scraper used by pipelines that are not given one
+
+    Returns:
+        WebScraper on the summarizer's shared HTTP transport
+    """
+    global _shared_scraper
+    with _shared_scraper_lock:
+        if _shared_scraper is None:
+            _shared_scraper = WebScraper(max_workers=SCRAPER_WORKERS, parse_workers=PARSE_WORKERS,
+                                         transport=transport)
+        return _shared_scraper
+
+
+class SummaryPipeline:
+    """
+    Three-stage fetch -> extract -> summarize pipeline
+    """
+
+    def __init__(self,
+                 fetch_workers: Optional[int] = None,
+                 extract_workers: Optional[int] = None,
+                 summarize_workers: int = 2,
+                 queue_size: int = 64,
+                 scraper: Optional[WebScraper] = None,
+                 model: str = MODEL_NAME,
+                 use_cache: bool = True,
+                 min_chars: int = 100,
+                 dedup: bool = True):
+        """
+        Initialize the pipeline
+
+        Args:
+            fetch_workers: Concurrent downloads (default: the scraper's ``max_workers``)
+            extract_workers: Pages parsed at the same time (default: the
+                scraper's ``parse_workers``, or 4 if it parses in-process)
+            summarize_workers: Concurrent Ollama requests
+            queue_size: Capacity of each queue between stages
+            scraper: WebScraper used to download and parse pages; its delay,
+                rate limiter, robots.txt rules, HTTP cache and parse worker
+                processes apply (default: the process-wide ``shared_scraper()``)
+            model: Ollama model used for summaries
+            use_cache: Whether to use the summary cache
+            min_chars: Pages with less text than this are reported as errors
+            dedup: Report near duplicates of pages already in the batch with
+                status ``duplicate`` instead of summarizing them again
+        """
+        self.scraper = scraper or shared_scraper()
+        self.fetch_workers = fetch_workers or self.scraper.max_workers
+        self.extract_workers = extract_workers or self.scraper.parse_workers or 4
+        self.summarize_workers = summarize_workers
+        self.queue_size = queue_size
+        self.model = model
+        self.use_cache = use_cache
+        self.min_chars = min_chars
+        self.dedup = dedup
+
+    def run(self, urls: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Summarize URLs, yielding one result per URL as it completes
+
+        Closing the iterator (or abandoning it) stops the batch: no further
+        URLs are fetched and no further summaries are requested.
+
+        Args:
+            urls: URLs to summarize (may be a lazy iterable)
+
+        Returns:
+            Iterator of result dictionaries with ``url``, its position
+            ``index`` in urls and ``status`` (``ok``, ``duplicate`` or
+            ``error``) plus the summary, the URL of the page it duplicates,
+            or an error message
+        """
+        dedup_index = NearDuplicateIndex() if self.dedup else None
+        url_queue = queue.Queue(self.queue_size)
+        fetched_queue = queue.Queue(self.queue_size)
+        extracted_queue = queue.Queue(self.queue_size)
+        results = queue.Queue()
+        stop = threading.Event()
+
+        # The parse worker processes stay up until the extract stage is done
+        parsing = ExitStack()
+        parsing.enter_context(self.scraper.parsing_processes())
+
+        threading.Thread(target=self._feed, args=(urls, url_queue, stop), name="pipeline-feed", daemon=True).start()
+        self._start_stage("fetch", self._fetch, self.fetch_workers, url_queue, fetched_queue, results, stop)
+        self._start_stage("extract", partial(self._extract, dedup_index=dedup_index), self.extract_workers,
+                          fetched_queue, extracted_queue, results, stop, on_finish=parsing.close)
+        self._start_stage("summarize", self._summarize, self.summarize_workers,
+                          extracted_queue, results, results, stop)
+
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    return
+                item.pop('started', None)
+                item.pop('queued_at', None)
+                yield item
+        finally:
+            stop.set()
+
+    def _feed(self, urls: Iterable[str], outbox: queue.Queue, stop: threading.Event) -> None:
+        """Pass the URLs to the fetch stage, numbered by their position in the input"""
+        try:
+            for index, url in enumerate(urls):
+                url = url.strip()
+                if not url:
+                    continue
+                now = time.monotonic()
+                if not _put(outbox, {'url': url, 'index': index, 'started': now, 'queued_at': now}, stop):
+                    return
+        except Exception as e:
+            logger.error(f"reading URLs failed: {e}")
+        finally:
+            _put(outbox, _DONE, stop)
+
+    def _start_stage(self,
+                     name: str,
+                     work: Callable[[Dict[str, Any]], Dict[str, Any]],
+                     workers: int,
+                     inbox: queue.Queue,
+                     outbox: queue.Queue,
+                     results: queue.Queue,
+                     stop: threading.Event,
+                     on_finish: Optional[Callable[[], Any]] = None) -> None:
+        """Start a stage's workers; the last worker to finish calls on_finish and passes _DONE downstream"""
+        workers = max(1, workers)
+        remaining = [workers]
+        lock = threading.Lock()
+
+        def run():
+            try:
+                while not stop.is_set():
+                    try:
+                        item = inbox.get(timeout=_POLL_SECONDS)
+                    except queue.Empty:
+                        continue
+                    if item is _DONE:
+                        inbox.put(_DONE)  # let the other workers of this stage see it
+                        break
+                    QUEUE_WAIT_SECONDS.observe(time.monotonic() - item['queued_at'], queue=f"pipeline_{name}")
+                    try:
+                        item = work(item)
+                    except Exception as e:
+                        logger.error(f"{name} failed for {item['url']}: {e}")
+                        item = {**item, 'status': 'error', 'stage': name, 'error': str(e)}
+                    # Items with a final status (failed, duplicate, done) skip the remaining stages
+                    item['queued_at'] = time.monotonic()
+                    if not _put(results if 'status' in item else outbox, item, stop):
+                        break
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    if on_finish is not None:
+                        on_finish()
+                    _put(outbox, _DONE, stop)
+
+        for i in range(workers):
+            threading.Thread(target=run, name=f"pipeline-{name}-{i}", daemon=True).start()
+
+    def _fetch(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.scraper.download(item['url'])
+        return {**item, 'content': response.content, 'status_code': response.status_code}
+
+    def _extract(self, item: Dict[str, Any], dedup_index: Optional[NearDuplicateIndex]) -> Dict[str, Any]:
+        page = self.scraper.parse_page(item['url'], item.pop('content'), item.pop('status_code'))
+        if len(page.content.strip()) < self.min_chars:
+            raise ValueError("Not enough content to summarize")
+        if dedup_index is not None:
+            canonical = dedup_index.add(item['url'], page.content)
+            if canonical is not None:
+                return {**item, 'status': 'duplicate', 'title': page.title, 'duplicate_of': canonical}
+        return {**item, 'title': page.title, 'text': page.content, 'content_hash': page.content_hash}
+
+    def _summarize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        text = item.pop('text')
+        summary = summarize_text(text, model=self.model, use_cache=self.use_cache)
+        if summary.startswith("Error:"):
+            raise RuntimeError(summary)
+        return {
+            **item,
+            'status': 'ok',
+            'summary': summary,
+            'original_length': len(text),
+            'elapsed': round(time.monotonic() - item['started'], 3),
+        }
+
+
+def _put(destination: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put an item on a bounded queue unless the batch is stopped first"""
+    while not stop.is_set():
+        try:
+            destination.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def summarize_urls(urls: Iterable[str], **kwargs) -> Iterator[Dict[str, Any]]:
+    """
+    Summarize many URLs through the pipeline
+
+    Args:
+        urls: URLs to summarize
+        **kwargs: Additional arguments for SummaryPipeline
+
+    Returns:
+        Iterator of result dictionaries in completion order
+    """
+    return SummaryPipeline(**kwargs).run(urls)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize a list of URLs and write the results as JSONL.")
+    parser.add_argument("input", help="File with one URL per line, or - for stdin")
+    parser.add_argument("-o", "--output", help="Output JSONL file (default: stdout)")
+    parser.add_argument("--fetch-workers", type=int, default=SCRAPER_WORKERS)
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS,
+                        help="Processes parsing pages (0: in the extract threads)")
+    parser.add_argument("--extract-workers", type=int, help="Pages parsed at the same time")
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds between requests to the same host")
+    parser.add_argument("--summarize-workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the summary cache")
+    parser.add_argument("--no-dedup", action="store_true", help="Summarize near-duplicate pages too")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    ok = failed = 0
+    try:
+        scraper = WebScraper(delay=args.delay, max_workers=args.fetch_workers, parse_workers=args.parse_workers,
+                             transport=transport)
+        for result in summarize_urls(source,
+                                     scraper=scraper,
+                                     extract_workers=args.extract_workers,
+                                     summarize_workers=args.summarize_workers,
+                                     queue_size=args.queue_size,
+                                     model=args.model,
+                                     use_cache=not args.no_cache,
+                                     dedup=not args.no_dedup):
+            sink.write(json.dumps(result, ensure_ascii=False) + "\n")
+            sink.flush()
+            if result['status'] == 'error':
+                failed += 1
+            else:
+                ok += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    logger.info(f"Batch completed: {ok} summarized, {failed} failed")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
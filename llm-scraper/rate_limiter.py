@@ -0,0 +1,154 @@
+"""
+Rate Limiting Module for Respectful Crawling
+
+Token-bucket rate limiting shared across threads and asyncio tasks.
+
+Features:
+- Token buckets with a configurable rate (requests/sec) and burst size
+- One bucket per domain, created lazily on first use
+- Per-domain overrides (e.g. to honor a slower Crawl-delay)
+- Blocking acquisition for threads and non-blocking reservations for asyncio
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``. Taking a
+    token never fails: when the bucket is empty the caller is told how long to
+    wait, and the token is reserved for it so that concurrent callers queue up
+    behind each other instead of racing for the same refill.
+    """
+
+    def __init__(self, rate: Optional[float], burst: int = 1):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second, None or 0 for no limit
+            burst: Maximum number of tokens that can be taken back to back
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Take tokens from the bucket without blocking
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Number of seconds the caller has to wait before using the tokens
+        """
+        if not self.rate:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Take tokens from the bucket, sleeping until they are available
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class DomainRateLimiter:
+    """
+    Collection of token buckets keyed by domain
+
+    A single instance can be shared by several scrapers and worker threads;
+    all of them draw from the same per-domain budget.
+    """
+
+    def __init__(self, requests_per_second: Optional[float] = None, burst: int = 1):
+        """
+        Initialize the rate limiter
+
+        Args:
+            requests_per_second: Default rate for every domain, None for no limit
+            burst: Default burst size for every domain
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._overrides: Dict[str, Tuple[Optional[float], int]] = {}
+        self._lock = threading.Lock()
+
+    def set_rate(self, domain: str, requests_per_second: Optional[float], burst: int = 1) -> None:
+        """
+        Override the rate for a single domain
+
+        Args:
+            domain: Domain (netloc) to configure
+            requests_per_second: Rate for this domain, None for no limit
+            burst: Burst size for this domain
+        """
+        with self._lock:
+            self._overrides[domain] = (requests_per_second, burst)
+            self._buckets[domain] = TokenBucket(requests_per_second, burst)
+
+    def bucket(self, domain: str) -> TokenBucket:
+        """
+        Get the bucket for a domain, creating it on first use
+
+        Args:
+            domain: Domain (netloc)
+
+        Returns:
+            TokenBucket for the domain
+        """
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                rate, burst = self._overrides.get(domain, (self.requests_per_second, self.burst))
+                bucket = self._buckets[domain] = TokenBucket(rate, burst)
+            return bucket
+
+    def reserve(self, domain: str) -> float:
+        """
+        Reserve a request slot for a domain without blocking
+
+        Args:
+            domain: Domain (netloc) the request is going to
+
+        Returns:
+            Number of seconds the caller has to wait before sending the request
+        """
+        return self.bucket(domain).reserve()
+
+    def acquire(self, domain: str) -> float:
+        """
+        Block until a request to the domain is allowed
+
+        Args:
+            domain: Domain (netloc) the request is going to
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        return self.bucket(domain).acquire()
@@ -0,0 +1,552 @@
+"""
+Incremental Recrawl Module
+
+Keeps a crawled site up to date without crawling it again from scratch.
+The state of every known page (content hash, HTTP validators, schedule) is
+kept in a SQLite file; each recrawl only requests the pages that are due
+and reports what was added, changed or removed.
+
+Features:
+- Conditional requests (If-None-Match / If-Modified-Since): unchanged
+  pages cost a 304 without a body
+- Change detection on the extracted content's hash, so pages whose markup
+  changes but whose text does not count as unchanged
+- Adaptive schedule per page: the recheck interval shrinks each time a page
+  is seen to change and grows each time it is found unchanged
+- Sitemap ``lastmod`` hints make pages due early and add new pages
+- New links of added and changed pages are followed, up to the crawl depth
+- Pages answering 404 or 410 are reported as removed and forgotten
+- Pages disallowed by robots.txt or rejected by type or size are skipped
+  until they are due again, not reported as failures
+- Only added and changed pages are passed to the scraper's sinks
+- The state of a site can be seeded from an earlier crawl (checkpoint file
+  or JSON, JSONL or CSV export), so the first recrawl does not refetch it
+
+Usage:
+    python recrawl.py https://docs.example.com --state .cache/recrawl.sqlite3 -o changes.jsonl
+    python recrawl.py https://docs.example.com --seed scraped_content.json
+"""
+
+import argparse
+import csv
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+
+from metrics import FETCH_BYTES, FETCH_SECONDS, FETCHES
+from scrapper import PageContent, WebScraper
+from transport import ResponseRejected, fetch_limited
+
+logger = logging.getLogger(__name__)
+
+REMOVED_STATUSES = (404, 410)
+SQLITE_MAGIC = b"SQLite format 3\x00"
+
+
+@dataclass
+class PageState:
+    """What a recrawl remembers about one page"""
+    url: str
+    depth: int
+    content_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    checked_at: float
+    changed_at: float
+    interval: float
+    next_due: float
+    changes: int = 0
+    checks: int = 0
+
+
+@dataclass
+class RecrawlResult:
+    """Outcome of one recrawl"""
+    added: List[PageContent] = field(default_factory=list)
+    changed: List[PageContent] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    not_modified: int = 0  # unchanged pages answered with a 304
+    failed: int = 0
+    skipped: int = 0  # disallowed by robots.txt, or rejected by content type or size
+    not_due: int = 0  # known pages skipped because they are not due yet
+    requests: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Union[int, float]]:
+        """Counts of the result, without the pages"""
+        return {
+            "added": len(self.added), "changed": len(self.changed), "removed": len(self.removed),
+            "unchanged": self.unchanged, "not_modified": self.not_modified, "failed": self.failed,
+            "skipped": self.skipped, "not_due": self.not_due, "requests": self.requests, "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+class RecrawlStore:
+    """
+    SQLite-backed page state of one or more sites
+
+    A single instance is safe to share between threads.
+    """
+
+    def __init__(self, path: Union[str, Path] = ".cache/recrawl.sqlite3"):
+        """
+        Open (or create) a state file
+
+        Args:
+            path: SQLite file to store page states in
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                site TEXT NOT NULL,
+                url TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                checked_at REAL NOT NULL,
+                changed_at REAL NOT NULL,
+                interval REAL NOT NULL,
+                next_due REAL NOT NULL,
+                changes INTEGER NOT NULL,
+                checks INTEGER NOT NULL,
+                PRIMARY KEY (site, url)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_due ON pages (site, next_due)")
+        self._conn.commit()
+
+    def pages(self, site: str) -> Dict[str, PageState]:
+        """
+        Load every known page of a site
+
+        Args:
+            site: Start URL the site was crawled from
+
+        Returns:
+            Page states by URL
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, depth, content_hash, etag, last_modified, checked_at, changed_at, "
+                "interval, next_due, changes, checks FROM pages WHERE site = ?", (site,)
+            ).fetchall()
+        return {row[0]: PageState(*row) for row in rows}
+
+    def save(self, site: str, states: List[PageState]) -> None:
+        """
+        Insert or update page states
+
+        Args:
+            site: Start URL the site was crawled from
+            states: Page states to write
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(site, s.url, s.depth, s.content_hash, s.etag, s.last_modified, s.checked_at,
+                  s.changed_at, s.interval, s.next_due, s.changes, s.checks) for s in states]
+            )
+            self._conn.commit()
+
+    def delete(self, site: str, urls: List[str]) -> None:
+        """
+        Forget pages
+
+        Args:
+            site: Start URL the site was crawled from
+            urls: URLs of the pages
+        """
+        with self._lock:
+            self._conn.executemany("DELETE FROM pages WHERE site = ? AND url = ?", [(site, url) for url in urls])
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+def load_crawl_pages(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Read the pages of an earlier crawl
+
+    Args:
+        path: Crawl checkpoint (SQLite), or a JSON, JSONL or CSV export of
+            WebScraper or its sinks
+
+    Returns:
+        Iterator of page dictionaries
+    """
+    path = Path(path)
+    with open(path, 'rb') as f:
+        head = f.read(len(SQLITE_MAGIC))
+    if head == SQLITE_MAGIC:
+        # Read-only, so the checkpoint is not migrated or switched to WAL
+        conn = sqlite3.connect(f"file:{path.resolve().as_posix()}?mode=ro", uri=True)
+        try:
+            for (page,) in conn.execute("SELECT page FROM pages ORDER BY seq"):
+                yield json.loads(page)
+        finally:
+            conn.close()
+    elif path.suffix.lower() == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                row['links'] = row['links'].split('; ') if row.get('links') else []
+                yield row
+    else:
+        with open(path, encoding='utf-8') as f:
+            if head.lstrip().startswith(b'['):
+                yield from json.load(f)
+            else:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+
+class Recrawler:
+    """
+    Incremental, schedule-driven recrawl of a site with a WebScraper
+    """
+
+    def __init__(self,
+                 scraper: WebScraper,
+                 store: Union[RecrawlStore, str, Path],
+                 initial_interval: float = 24 * 3600,
+                 min_interval: float = 3600,
+                 max_interval: float = 30 * 24 * 3600,
+                 backoff: float = 1.5,
+                 speedup: float = 0.5):
+        """
+        Initialize the recrawler
+
+        Args:
+            scraper: Scraper whose session, rate limiter, robots.txt rules,
+                URL policy, parser and sinks are used
+            store: RecrawlStore, or the path of its SQLite file
+            initial_interval: Seconds until a new page is checked again
+            min_interval: Shortest recheck interval of a frequently changing page
+            max_interval: Longest recheck interval of a stable page
+            backoff: Interval multiplier when a page is found unchanged
+            speedup: Interval multiplier when a page is found changed
+        """
+        self.scraper = scraper
+        self.store = store if isinstance(store, RecrawlStore) else RecrawlStore(store)
+        self.initial_interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.speedup = speedup
+
+    def recrawl(self, start_url: str, max_depth: Optional[int] = None, check_all: bool = False) -> RecrawlResult:
+        """
+        Bring the stored state of a site up to date
+
+        The first recrawl of a site fetches every reachable page (all are
+        reported as added). Later recrawls request only the pages that are
+        due, with conditional requests, and follow the links of added and
+        changed pages to discover new ones.
+
+        Args:
+            start_url: Start URL of the site (also identifies it in the store)
+            max_depth: Maximum link depth of new pages (default: the scraper's)
+            check_all: Check every known page, whether it is due or not
+
+        Returns:
+            RecrawlResult with the added, changed and removed pages
+        """
+        if max_depth is None:
+            max_depth = self.scraper.max_depth
+        started = time.perf_counter()
+        now = time.time()
+        result = RecrawlResult()
+        known = self.store.pages(start_url)
+
+        due_early = {}
+        if self.scraper.use_sitemaps:
+            self.scraper.sitemap_lastmod.clear()
+            sitemap_urls = self.scraper.sitemap_urls(start_url)
+            for url in sitemap_urls:
+                lastmod = self.scraper.sitemap_lastmod.get(url)
+                state = known.get(url)
+                if state is None or (lastmod is not None and lastmod > state.checked_at):
+                    due_early[url] = state.depth if state is not None else 1
+
+        level: List[Tuple[str, int]] = []
+        for url, state in known.items():
+            if check_all or state.next_due <= now or url in due_early:
+                level.append((url, state.depth))
+            else:
+                result.not_due += 1
+        if start_url not in known:
+            level.insert(0, (start_url, 0))
+        level.extend((url, depth) for url, depth in due_early.items() if url not in known)
+        seen = {url for url, _ in level} | set(known)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.scraper.max_workers)) as executor:
+            while level:
+                outcomes = list(executor.map(lambda item: self._check(item[0], known.get(item[0])), level))
+                updates, removed, next_level = [], [], []
+                for (url, depth), (outcome, page, response) in zip(level, outcomes):
+                    state = known.get(url)
+                    if response is not None:
+                        result.requests += 1
+                        result.bytes += len(response.content)
+
+                    if outcome == "removed":
+                        if state is not None:
+                            removed.append(url)
+                            result.removed.append(url)
+                        continue
+                    if outcome == "skipped":
+                        result.skipped += 1
+                        if state is not None:
+                            # Not fetchable now; look again when it is next due
+                            state.next_due = now + state.interval
+                            updates.append(state)
+                        continue
+                    if outcome == "failed":
+                        result.failed += 1
+                        if state is not None:
+                            # Try again on the next recrawl without changing the schedule
+                            state.next_due = now
+                            updates.append(state)
+                        continue
+
+                    if outcome == "not_modified":
+                        result.not_modified += 1
+                        changed = False
+                    else:
+                        changed = state is None or page.content_hash != state.content_hash
+                    updates.append(self._schedule(url, depth, state, page, response, changed, now))
+
+                    if not changed:
+                        result.unchanged += 1
+                        continue
+                    (result.added if state is None else result.changed).append(page)
+                    for sink in self.scraper.sinks:
+                        sink.write(page)
+                    if depth < max_depth:
+                        for link in page.links:
+                            if link not in seen:
+                                seen.add(link)
+                                next_level.append((link, depth + 1))
+
+                self.store.save(start_url, updates)
+                self.store.delete(start_url, removed)
+                level = next_level
+
+        result.seconds = time.perf_counter() - started
+        logger.info(f"Recrawl of {start_url}: {result.summary()}")
+        return result
+
+    def seed(self, start_url: str, pages: Iterable[Dict[str, Any]], max_depth: Optional[int] = None) -> int:
+        """
+        Import the pages of an earlier crawl as known pages of a site
+
+        Each page is scheduled as if it had been checked when it was crawled,
+        so only pages older than the initial interval are due on the next
+        recrawl. Depths are the link distances from ``start_url`` among the
+        imported pages. Pages the store already knows are left as they are.
+
+        Args:
+            start_url: Start URL of the site (also identifies it in the store)
+            pages: Page dictionaries with at least url and content_hash (see
+                load_crawl_pages)
+            max_depth: Depth of pages not reachable from start_url (default:
+                the scraper's)
+
+        Returns:
+            Number of pages imported
+        """
+        if max_depth is None:
+            max_depth = self.scraper.max_depth
+        known = self.store.pages(start_url)
+        now = time.time()
+        imported: Dict[str, Dict[str, Any]] = {}
+        for page in pages:
+            url = page.get('url')
+            if url and page.get('content_hash') and url not in known and url not in imported:
+                imported[url] = page
+
+        depths = {start_url: 0} if start_url in imported else {}
+        level = list(depths)
+        while level:
+            next_level = []
+            for url in level:
+                for link in imported[url].get('links') or []:
+                    if link in imported and link not in depths:
+                        depths[link] = depths[url] + 1
+                        next_level.append(link)
+            level = next_level
+
+        states = []
+        for url, page in imported.items():
+            try:
+                crawled_at = min(now, time.mktime(time.strptime(page['timestamp'], '%Y-%m-%d %H:%M:%S')))
+            except (KeyError, TypeError, ValueError):
+                crawled_at = now
+            states.append(PageState(url, depths.get(url, max_depth), page['content_hash'], None, None,
+                                    crawled_at, crawled_at, self.initial_interval,
+                                    crawled_at + self.initial_interval))
+        self.store.save(start_url, states)
+        logger.info(f"Seeded {len(states)} pages of {start_url}")
+        return len(states)
+
+    def _check(self, url: str, state: Optional[PageState]):
+        """
+        Fetch a page, conditionally if it is known
+
+        Returns:
+            Tuple of (outcome, PageContent or None, response or None) where
+            outcome is "fetched", "not_modified", "removed", "skipped" or
+            "failed"
+        """
+        if not self.scraper.allowed_by_robots(url):
+            return "skipped", None, None
+        self.scraper.rate_limiter.acquire(urlparse(url).netloc)
+
+        headers = dict(self.scraper.headers)
+        if state is not None:
+            if state.etag:
+                headers['If-None-Match'] = state.etag
+            if state.last_modified:
+                headers['If-Modified-Since'] = state.last_modified
+
+        start = time.perf_counter()
+        try:
+            response = fetch_limited(self.scraper.session, url, max_bytes=self.scraper.max_bytes,
+                                     content_types=self.scraper.content_types,
+                                     headers=headers, timeout=self.scraper.timeout)
+        except ResponseRejected as e:
+            FETCHES.inc(outcome="rejected")
+            logger.info(f"Skipped: {e}")
+            return "skipped", None, None
+        except requests.RequestException as e:
+            FETCHES.inc(outcome="error")
+            logger.error(f"Request error for {url}: {e}")
+            return "failed", None, None
+        elapsed = time.perf_counter() - start
+        FETCH_SECONDS.observe(elapsed, source="network")
+        FETCH_BYTES.inc(len(response.content), source="network")
+        self.scraper.timings.add("fetch", elapsed, len(response.content))
+
+        if response.status_code == 304:
+            FETCHES.inc(outcome="not_modified")
+            return "not_modified", None, response
+        if response.status_code in REMOVED_STATUSES:
+            FETCHES.inc(outcome="removed")
+            logger.info(f"Removed: {url} ({response.status_code})")
+            return "removed", None, response
+        if response.status_code >= 400:
+            FETCHES.inc(outcome="error")
+            logger.error(f"Error status {response.status_code} for {url}")
+            return "failed", None, response
+
+        FETCHES.inc(outcome="ok")
+        try:
+            page = self.scraper.parse_page(url, response.content, response.status_code)
+        except Exception as e:
+            logger.error(f"Error processing {url}: {e}")
+            return "failed", None, response
+        return "fetched", page, response
+
+    def _schedule(self, url: str, depth: int, state: Optional[PageState], page: Optional[PageContent],
+                  response: requests.Response, changed: bool, now: float) -> PageState:
+        """Record a successful check and work out when the page is due next"""
+        if state is None:
+            state = PageState(url, depth, page.content_hash, None, None, now, now,
+                              self.initial_interval, now + self.initial_interval)
+        else:
+            factor = self.speedup if changed else self.backoff
+            state.interval = min(self.max_interval, max(self.min_interval, state.interval * factor))
+            state.checks += 1
+            state.depth = min(state.depth, depth)
+            if changed:
+                state.changes += 1
+                state.changed_at = now
+                state.content_hash = page.content_hash
+
+        # A 304 may omit the validators; keep the stored ones then
+        state.etag = response.headers.get('ETag') or state.etag
+        state.last_modified = response.headers.get('Last-Modified') or state.last_modified
+        state.checked_at = now
+        state.next_due = now + state.interval
+        return state
+
+
+def recrawl_website(start_url: str, state_path: Union[str, Path] = ".cache/recrawl.sqlite3",
+                    max_depth: int = 2, check_all: bool = False,
+                    seed_path: Optional[Union[str, Path]] = None, **kwargs) -> RecrawlResult:
+    """
+    Incrementally recrawl a website
+
+    Args:
+        start_url: Starting URL
+        state_path: SQLite file with the state of earlier crawls
+        max_depth: Maximum crawling depth
+        check_all: Check every known page, whether it is due or not
+        seed_path: Checkpoint or export of an earlier crawl to import first
+            (see load_crawl_pages)
+        **kwargs: Additional arguments for WebScraper
+
+    Returns:
+        RecrawlResult
+    """
+    scraper = WebScraper(max_depth=max_depth, **kwargs)
+    recrawler = Recrawler(scraper, state_path)
+    if seed_path is not None:
+        recrawler.seed(start_url, load_crawl_pages(seed_path))
+    return recrawler.recrawl(start_url, check_all=check_all)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Recrawl a site and report added, changed and removed pages.")
+    parser.add_argument("start_url")
+    parser.add_argument("--state", default=".cache/recrawl.sqlite3", help="SQLite file with the crawl state")
+    parser.add_argument("-o", "--output", help="Output JSONL file of changes (default: stdout)")
+    parser.add_argument("--max-depth", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds between requests to the same domain")
+    parser.add_argument("--sitemaps", action="store_true", help="Use sitemap lastmod hints and new sitemap pages")
+    parser.add_argument("--all", action="store_true", help="Check every known page, not only those due")
+    parser.add_argument("--seed", metavar="PATH",
+                        help="Import pages from a crawl checkpoint or a JSON/JSONL/CSV export first")
+    args = parser.parse_args(argv)
+
+    result = recrawl_website(args.start_url, args.state, max_depth=args.max_depth, check_all=args.all,
+                             seed_path=args.seed,
+                             max_workers=args.workers, delay=args.delay, use_sitemaps=args.sitemaps)
+
+    sink = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for event, pages in (("added", result.added), ("changed", result.changed)):
+            for page in pages:
+                sink.write(json.dumps({"event": event, **asdict(page)}, ensure_ascii=False) + "\n")
+        for url in result.removed:
+            sink.write(json.dumps({"event": "removed", "url": url}) + "\n")
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    return 0 if result.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
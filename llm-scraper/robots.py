@@ -0,0 +1,212 @@
+"""
+robots.txt Module
+
+Fetches, caches and applies robots.txt rules for every host a crawl
+touches.
+
+Features:
+- One robots.txt request per host, cached for a configurable TTL, with
+  the number of cached hosts bounded
+- Concurrent workers wait for the same fetch instead of repeating it
+- robots.txt requests wait for the host's rate limit and are size-capped
+- Crawl-delay and Request-rate applied to the shared rate limiter
+- Sitemap URLs announced by robots.txt
+- Missing robots.txt allows everything; 401/403 disallow everything
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from rate_limiter import DomainRateLimiter
+from transport import fetch_limited
+
+logger = logging.getLogger(__name__)
+
+MAX_ROBOTS_BYTES = 500 * 1024  # larger robots.txt files are treated as unavailable
+
+
+class DisallowedByRobots(Exception):
+    """Raised when robots.txt forbids fetching a URL"""
+
+
+class RobotsCache:
+    """
+    Per-host robots.txt cache
+
+    A single instance is safe to share between threads.
+    """
+
+    def __init__(self,
+                 session: requests.Session,
+                 user_agent: str,
+                 rate_limiter: Optional[DomainRateLimiter] = None,
+                 ttl: float = 24 * 3600,
+                 timeout: float = 10,
+                 max_hosts: int = 10000,
+                 max_bytes: int = MAX_ROBOTS_BYTES):
+        """
+        Initialize the cache
+
+        Args:
+            session: requests session used to download robots.txt files
+            user_agent: User agent the rules are evaluated for
+            rate_limiter: Rate limiter that receives each host's Crawl-delay
+                and that robots.txt requests wait for
+            ttl: Seconds a robots.txt file is kept before it is fetched again
+            timeout: Request timeout in seconds
+            max_hosts: Number of hosts whose rules are cached; expired
+                (then the oldest) entries are dropped beyond it
+            max_bytes: Largest robots.txt accepted
+        """
+        self.session = session
+        self.user_agent = user_agent
+        self.rate_limiter = rate_limiter
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_hosts = max_hosts
+        self.max_bytes = max_bytes
+        self.blocked = 0
+        self._entries: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def rules(self, url: str) -> RobotFileParser:
+        """
+        Get the robots.txt rules of a URL's host, fetching them if needed
+
+        Args:
+            url: Any URL on the host
+
+        Returns:
+            Parsed robots.txt
+        """
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+
+        entry = self._entries.get(origin)
+        if entry is not None and time.time() - entry[1] < self.ttl:
+            return entry[0]
+
+        with self._lock:
+            host_lock = self._host_locks.setdefault(origin, threading.Lock())
+        try:
+            with host_lock:
+                # Another worker may have fetched it while we waited
+                entry = self._entries.get(origin)
+                if entry is not None and time.time() - entry[1] < self.ttl:
+                    return entry[0]
+                parser = self._fetch(origin, parts.netloc)
+                with self._lock:
+                    self._entries.pop(origin, None)  # a refreshed entry moves to the end
+                    self._entries[origin] = (parser, time.time())
+                    self._prune()
+                self._apply_delay(parts.netloc, parser)
+                return parser
+        finally:
+            # Workers already waiting hold the lock object and find the new
+            # entry; later ones do not need it, so it only lives during a fetch
+            with self._lock:
+                if self._host_locks.get(origin) is host_lock:
+                    del self._host_locks[origin]
+
+    def can_fetch(self, url: str) -> bool:
+        """
+        Check whether robots.txt allows fetching a URL
+
+        Args:
+            url: URL to check
+
+        Returns:
+            True if the URL may be fetched
+        """
+        allowed = self.rules(url).can_fetch(self.user_agent, url)
+        if not allowed:
+            with self._lock:
+                self.blocked += 1
+        return allowed
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """
+        Get the minimum delay between requests to a URL's host
+
+        Args:
+            url: Any URL on the host
+
+        Returns:
+            Delay in seconds from Crawl-delay or Request-rate, or None
+        """
+        return self._delay(self.rules(url))
+
+    def sitemaps(self, url: str) -> List[str]:
+        """
+        Get the sitemap URLs listed in a host's robots.txt
+
+        Args:
+            url: Any URL on the host
+
+        Returns:
+            Sitemap URLs (empty if robots.txt lists none)
+        """
+        return list(self.rules(url).site_maps() or [])
+
+    def clear(self) -> None:
+        """Forget every cached robots.txt"""
+        with self._lock:
+            self._entries.clear()
+
+    def _prune(self) -> None:
+        # Caller holds the lock
+        if len(self._entries) <= self.max_hosts:
+            return
+        expired = time.time() - self.ttl
+        for origin in [origin for origin, (_, fetched) in self._entries.items() if fetched <= expired]:
+            del self._entries[origin]
+        # Entries are in insertion (fetch) order, so the oldest come first
+        while len(self._entries) > self.max_hosts:
+            del self._entries[next(iter(self._entries))]
+
+    def _fetch(self, origin: str, domain: str) -> RobotFileParser:
+        robots_url = f"{origin}/robots.txt"
+        parser = RobotFileParser(robots_url)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(domain)
+        try:
+            response = fetch_limited(self.session, robots_url, max_bytes=self.max_bytes, content_types=None,
+                                     headers={'User-Agent': self.user_agent}, timeout=self.timeout)
+        except requests.RequestException as e:  # including ResponseTooLarge
+            logger.warning(f"Could not fetch {robots_url}, allowing all: {e}")
+            parser.allow_all = True
+            return parser
+
+        if response.status_code in (401, 403):
+            parser.disallow_all = True
+        elif response.status_code >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(response.content.decode('utf-8', errors='replace').splitlines())
+        logger.info(f"Loaded {robots_url} ({response.status_code})")
+        return parser
+
+    def _delay(self, parser: RobotFileParser) -> Optional[float]:
+        delay = parser.crawl_delay(self.user_agent)
+        rate = parser.request_rate(self.user_agent)
+        delays = [float(delay)] if delay else []
+        if rate and rate.requests:
+            delays.append(rate.seconds / rate.requests)
+        return max(delays) if delays else None
+
+    def _apply_delay(self, domain: str, parser: RobotFileParser) -> None:
+        delay = self._delay(parser)
+        if self.rate_limiter is None or not delay:
+            return
+        # Only ever slow a host down; a stricter configured rate wins
+        current = self.rate_limiter.bucket(domain).rate
+        if not current or 1.0 / delay < current:
+            logger.info(f"Crawl-delay for {domain}: {delay:.2f}s")
+            self.rate_limiter.set_rate(domain, 1.0 / delay)
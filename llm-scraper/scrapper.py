@@ -8,33 +8,52 @@ Features:
 - Extract HTML content from URLs
 - Parse and clean HTML content
 - Recursive link discovery and crawling
-- Rate limiting and respectful crawling
+- Rate limiting and respectful crawling (robots.txt, Crawl-delay)
+- Sitemap-seeded crawls
 - Content filtering and deduplication
 - Export functionality for LLM processing
 
 Author: Generated for documentation creation
 """
 
+import asyncio
+import multiprocessing
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse, urlunparse
-from urllib.robotparser import RobotFileParser
+from urllib.parse import urlparse
+import threading
 import time
-import re
 import json
 import hashlib
-from typing import List, Dict, Set, Optional, Tuple
+import itertools
+from typing import Iterable, Iterator, List, Dict, Set, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 import logging
 from pathlib import Path
 import csv
 
+from checkpoint import CrawlCheckpoint
+from dedup import NearDuplicateIndex, simhash
+from extractor import ExtractedPage, extract_page
+from http_cache import HTTPCache
+from metrics import FETCH_BYTES, FETCH_SECONDS, FETCHES, PARSE_SECONDS, StageTimer
+from rate_limiter import DomainRateLimiter
+from robots import DisallowedByRobots, RobotsCache
+from sinks import LLM_HEADER, PageSink, format_page_for_llm, page_to_csv_row
+from sitemap import MAX_SITEMAP_BYTES, read_sitemaps
+from transport import HTML_CONTENT_TYPES, MAX_RESPONSE_BYTES, HTTPTransport, ResponseRejected, fetch_limited
+from url_policy import URLPolicy
+from urlset import URLSet, make_url_set
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Slots make in-memory page records smaller
+@dataclass(slots=True)
 class PageContent:
     """Data class to store extracted page content"""
     url: str
@@ -46,6 +65,53 @@ class PageContent:
     timestamp: str
     status_code: int
     content_hash: str
+    duplicate_of: Optional[str] = None  # URL of the near-identical page seen first
+
+def _build_page_content(url: str, content_data: Dict[str, any], links: List[str], status_code: int) -> PageContent:
+    """Create the PageContent of a parsed page"""
+    return PageContent(
+        url=url,
+        title=content_data['title'],
+        content=content_data['content'],
+        links=links,
+        meta_description=content_data['meta_description'],
+        headers=content_data['headers'],
+        timestamp=time.strftime('%Y-%m-%d %H:%M:%S'),
+        status_code=status_code,
+        # Create content hash for deduplication
+        content_hash=hashlib.md5(content_data['content'].encode()).hexdigest()
+    )
+
+# Settings of a parse worker process, set once per process by _init_parse_worker
+_parse_worker: Dict[str, any] = {}
+
+def _init_parse_worker(parser: str, url_policy: URLPolicy, shingle_size: Optional[int]) -> None:
+    """Set up a parse worker process (see the parse_workers option of WebScraper)"""
+    _parse_worker.update(parser=parser, url_policy=url_policy, shingle_size=shingle_size)
+
+def _parse_in_worker(url: str, content: bytes, status_code: int) -> Tuple[PageContent, Optional[int], float]:
+    """
+    Parse a downloaded page in a parse worker process
+
+    Only the extracted page comes back to the crawler, not the parse tree.
+
+    Returns:
+        Tuple of (PageContent, SimHash of the content or None, seconds spent)
+    """
+    start = time.perf_counter()
+    page = extract_page(content, parser=_parse_worker['parser'])
+    content_data = {
+        'title': page.title,
+        'content': page.content,
+        'meta_description': page.meta_description,
+        'headers': page.headers
+    }
+    links = _parse_worker['url_policy'].resolve_links(page.links, url)
+    page_content = _build_page_content(url, content_data, links, status_code)
+
+    shingle_size = _parse_worker['shingle_size']
+    fingerprint = simhash(page.content, shingle_size) if shingle_size and page.content else None
+    return page_content, fingerprint, time.perf_counter() - start
 
 class WebScraper:
     """
@@ -57,30 +123,137 @@ class WebScraper:
                  max_workers: int = 5,
                  timeout: int = 30,
                  max_depth: int = 3,
-                 user_agent: str = "DocumentationBot/1.0"):
+                 user_agent: str = "DocumentationBot/1.0",
+                 requests_per_second: Optional[float] = None,
+                 burst: int = 1,
+                 rate_limiter: Optional[DomainRateLimiter] = None,
+                 http_cache: Optional[HTTPCache] = None,
+                 parser: str = "auto",
+                 dedup: Optional[str] = None,
+                 dedup_distance: int = 3,
+                 sinks: Optional[List[PageSink]] = None,
+                 keep_in_memory: bool = True,
+                 checkpoint_path: Optional[str] = None,
+                 checkpoint_interval: int = 50,
+                 url_set: str = "exact",
+                 url_set_capacity: int = 100000,
+                 url_set_error_rate: float = 0.001,
+                 url_policy: Optional[URLPolicy] = None,
+                 respect_robots: bool = True,
+                 robots_ttl: float = 24 * 3600,
+                 use_sitemaps: bool = False,
+                 max_sitemap_urls: int = 50000,
+                 transport: Optional[HTTPTransport] = None,
+                 parse_workers: int = 0,
+                 max_bytes: Optional[int] = MAX_RESPONSE_BYTES,
+                 content_types: Optional[Iterable[str]] = HTML_CONTENT_TYPES):
         """
         Initialize the web scraper
        
         Args:
-            delay: Delay between requests in seconds
+            delay: Delay between requests to the same domain in seconds
+                (used when requests_per_second is not given)
             max_workers: Maximum number of concurrent workers
             timeout: Request timeout in seconds
             max_depth: Maximum crawling depth
             user_agent: User agent string for requests
+            requests_per_second: Per-domain request rate, overrides delay
+            burst: Number of requests a domain may receive back to back
+            rate_limiter: Shared rate limiter, e.g. to share one budget
+                between several scrapers (overrides the two options above)
+            http_cache: On-disk response cache used to revalidate pages
+                instead of downloading them again
+            parser: HTML parser backend for the extraction engine:
+                "lxml", "html.parser" or "auto" (lxml when installed)
+            dedup: What to do with near-duplicate pages: "skip" drops them,
+                "cluster" keeps them with ``duplicate_of`` set; None (the
+                default) disables detection, so every page is returned as is
+            dedup_distance: Maximum SimHash Hamming distance for near duplicates
+            sinks: Outputs (see sinks.py) that receive every page as soon as
+                it is scraped
+            keep_in_memory: Keep scraped pages in ``scraped_content``; turn off
+                together with sinks to crawl with flat memory use
+            checkpoint_path: SQLite file that recursive crawls are checkpointed
+                to, so they can be resumed with ``resume=True``
+            checkpoint_interval: Pages between checkpoint commits
+            url_set: How visited URLs are remembered (see urlset.py):
+                "exact" (the default) a set of URL strings, "fingerprint"
+                64-bit hashes and "bloom" a Bloom filter that may skip a
+                small fraction of URLs; with either of the compact sets
+                ``visited_urls`` supports membership tests but cannot be
+                iterated
+            url_set_capacity: Expected number of URLs per crawl
+            url_set_error_rate: False-positive rate of the Bloom filter
+            url_policy: Link normalization and filtering rules (allowed
+                domains, include/exclude patterns, kept query parameters);
+                defaults to same-domain links without query strings
+            respect_robots: Skip URLs disallowed by robots.txt and slow down
+                to each host's Crawl-delay
+            robots_ttl: Seconds a host's robots.txt is cached
+            use_sitemaps: Seed recursive crawls with the pages listed in the
+                start host's sitemaps; with an http_cache, pages whose
+                ``lastmod`` is older than the cached copy are not requested
+            max_sitemap_urls: Maximum number of sitemap pages to seed
+            transport: Shared pooled HTTP client; by default the scraper
+                creates its own with one pooled connection per worker
+            parse_workers: Processes that parse pages during crawls, so
+                parsing, extraction and SimHash fingerprinting are not
+                serialized by the GIL; downloads stay on the ``max_workers``
+                threads, which should be at least as many. 0 parses in the
+                fetching threads. Overrides of ``extract_content`` and
+                ``extract_links`` are not used by the worker processes.
+            max_bytes: Pages are downloaded as a stream and abandoned once
+                their body exceeds this many bytes (None for no limit)
+            content_types: Accepted Content-Type media types; other responses
+                are abandoned right after their headers arrive (None accepts any)
         """
         self.delay = delay
         self.max_workers = max_workers
         self.timeout = timeout
         self.max_depth = max_depth
         self.user_agent = user_agent
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
-        self.visited_urls: Set[str] = set()
+        if rate_limiter is None:
+            if requests_per_second is None and delay > 0:
+                requests_per_second = 1.0 / delay
+            rate_limiter = DomainRateLimiter(requests_per_second, burst)
+        self.rate_limiter = rate_limiter
+        self.http_cache = http_cache
+        self.parser = parser
+        self.url_policy = url_policy or URLPolicy()
+        self.use_sitemaps = use_sitemaps
+        self.max_sitemap_urls = max_sitemap_urls
+        self.sitemap_lastmod: Dict[str, float] = {}
+        if dedup not in (None, "skip", "cluster"):
+            raise ValueError(f"Unknown dedup mode: {dedup}")
+        self.dedup = dedup
+        self.dedup_index = NearDuplicateIndex(max_distance=dedup_distance) if dedup else None
+        # The user agent is sent per request, so a shared transport keeps its own headers
+        self.transport = transport or HTTPTransport(pool_size=max(1, max_workers))
+        self.session = self.transport.session
+        self.headers = {'User-Agent': user_agent}
+        self.robots = RobotsCache(self.session, user_agent, self.rate_limiter, robots_ttl, timeout) \
+            if respect_robots else None
+        self.visited_urls: URLSet = make_url_set(url_set, url_set_capacity, url_set_error_rate)
         self.scraped_content: List[PageContent] = []
+        self.sinks: List[PageSink] = list(sinks or [])
+        self.keep_in_memory = keep_in_memory
+        self.checkpoint = CrawlCheckpoint(checkpoint_path, checkpoint_interval) if checkpoint_path else None
+        self._resumed_level = False
+        self.timings = StageTimer()
+        self.parse_workers = parse_workers
+        self.max_bytes = max_bytes
+        self.content_types = tuple(content_types) if content_types is not None else None
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_pool_users = 0
+        self._parse_pool_lock = threading.Lock()
+        self._fingerprints: Dict[str, int] = {}  # SimHashes computed by parse workers, until dedup
+        self._reserved = threading.local()  # URL whose rate-limit wait crawl_async already did
+        self._reset_counters()
        
     def normalize_url(self, url: str) -> str:
         """
         Normalize URL by removing fragments and query parameters
+        (except those kept by the URL policy)
        
         Args:
             url: Raw URL string
@@ -88,21 +261,12 @@ class WebScraper:
         Returns:
             Normalized URL string
         """
-        parsed = urlparse(url)
-        # Remove fragment and some query parameters that don't affect content
-        normalized = urlunparse((
-            parsed.scheme,
-            parsed.netloc,
-            parsed.path,
-            parsed.params,
-            '',  # Remove query for now - could be made configurable
-            ''   # Remove fragment
-        ))
-        return normalized.rstrip('/')
+        return self.url_policy.normalize(url)
    
     def is_valid_url(self, url: str, base_domain: str) -> bool:
         """
-        Check if URL is valid and within the same domain
+        Check if URL is valid and allowed by the URL policy
+        (by default: within the same domain and not a file or admin page)
        
         Args:
             url: URL to validate
@@ -111,132 +275,54 @@ class WebScraper:
         Returns:
             True if URL is valid and within domain
         """
-        try:
-            parsed = urlparse(url)
-           
-            # Check if it's a valid HTTP/HTTPS URL
-            if parsed.scheme not in ['http', 'https']:
-                return False
-               
-            # Check if it's within the same domain
-            if parsed.netloc != base_domain:
-                return False
-               
-            # Skip common non-content URLs
-            skip_extensions = {'.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
-                             '.zip', '.rar', '.tar', '.gz', '.jpg', '.jpeg', '.png',
-                             '.gif', '.svg', '.ico', '.css', '.js', '.xml', '.json'}
-           
-            if any(parsed.path.lower().endswith(ext) for ext in skip_extensions):
-                return False
-               
-            # Skip URLs with certain patterns
-            skip_patterns = ['/admin', '/login', '/logout', '/register', '/search',
-                           '/download', '/upload', '/api/', '/ajax/']
-           
-            if any(pattern in parsed.path.lower() for pattern in skip_patterns):
-                return False
-               
-            return True
-           
-        except Exception as e:
-            logger.error(f"Error validating URL {url}: {e}")
-            return False
+        return self.url_policy.is_allowed(url, base_domain)
    
-    def extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
+    def extract_links(self, page: Union[ExtractedPage, BeautifulSoup], base_url: str) -> List[str]:
         """
-        Extract all valid links from a BeautifulSoup object
+        Extract all valid links from a parsed page
        
         Args:
-            soup: BeautifulSoup object of the page
+            page: ExtractedPage from the extraction engine, or a BeautifulSoup object
             base_url: Base URL for resolving relative links
            
         Returns:
-            List of absolute URLs
+            List of absolute URLs, without duplicates, in page order
         """
-        links = []
-        base_domain = urlparse(base_url).netloc
+        if isinstance(page, ExtractedPage):
+            hrefs = page.links
+        else:
+            hrefs = [link['href'] for link in page.find_all('a', href=True)]
        
-        # Extract links from <a> tags
-        for link in soup.find_all('a', href=True):
-            href = link['href'].strip()
-            if href:
-                absolute_url = urljoin(base_url, href)
-                normalized_url = self.normalize_url(absolute_url)
-               
-                if self.is_valid_url(normalized_url, base_domain):
-                    links.append(normalized_url)
-       
-        return list(set(links))  # Remove duplicates
+        return self.url_policy.resolve_links(hrefs, base_url)
    
-    def extract_content(self, soup: BeautifulSoup) -> Dict[str, any]:
+    def extract_content(self, page: Union[ExtractedPage, BeautifulSoup, bytes, str]) -> Dict[str, any]:
         """
-        Extract meaningful content from a BeautifulSoup object
+        Extract meaningful content from a page
+
+        Title, meta description, headers and the main content area are all
+        collected in a single pass by the extraction engine (see extractor.py).
        
         Args:
-            soup: BeautifulSoup object of the page
+            page: ExtractedPage, raw HTML, or a BeautifulSoup object of the page
            
         Returns:
             Dictionary containing extracted content
         """
-        # Extract title
-        title = ""
-        if soup.title:
-            title = soup.title.get_text().strip()
-       
-        # Extract meta description
-        meta_desc = ""
-        meta_tag = soup.find('meta', attrs={'name': 'description'})
-        if meta_tag and meta_tag.get('content'):
-            meta_desc = meta_tag['content'].strip()
-       
-        # Extract headers
-        headers = []
-        for tag in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            header_text = tag.get_text().strip()
-            if header_text:
-                headers.append(f"{tag.name.upper()}: {header_text}")
-       
-        # Remove unwanted elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'header',
-                           'aside', 'iframe', 'noscript']):
-            element.decompose()
-       
-        # Extract main content
-        main_content = ""
-       
-        # Try to find main content areas
-        content_selectors = [
-            'main', 'article', '[role="main"]', '.content', '.main-content',
-            '.post-content', '.entry-content', '#content', '#main'
-        ]
-       
-        content_element = None
-        for selector in content_selectors:
-            content_element = soup.select_one(selector)
-            if content_element:
-                break
-       
-        # If no main content area found, use body
-        if not content_element:
-            content_element = soup.find('body')
-       
-        if content_element:
-            # Extract text content
-            text_content = content_element.get_text(separator=' ', strip=True)
-            # Clean up whitespace
-            main_content = re.sub(r'\s+', ' ', text_content).strip()
-       
+        if isinstance(page, BeautifulSoup):
+            page = str(page)
+        if not isinstance(page, ExtractedPage):
+            page = extract_page(page, parser=self.parser)
+
         return {
-            'title': title,
-            'content': main_content,
-            'meta_description': meta_desc,
-            'headers': headers
+            'title': page.title,
+            'content': page.content,
+            'meta_description': page.meta_description,
+            'headers': page.headers
         }
    
     def fetch_page(self, url: str) -> Optional[PageContent]:
         """
-        Fetch and parse a single page
+        Fetch and parse a single page, waiting for the domain's rate limit
        
         Args:
             url: URL to fetch
@@ -244,39 +330,21 @@ class WebScraper:
         Returns:
             PageContent object or None if failed
         """
+        if not self.allowed_by_robots(url):
+            return None
+        if getattr(self._reserved, 'url', None) != url:
+            self.rate_limiter.acquire(urlparse(url).netloc)
+        return self._fetch_page(url)
+
+    def _fetch_page(self, url: str) -> Optional[PageContent]:
+        """Fetch and parse a single page without rate limiting"""
         try:
-            logger.info(f"Fetching: {url}")
-           
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-           
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-           
-            # Extract content
-            content_data = self.extract_content(soup)
-           
-            # Extract links
-            links = self.extract_links(soup, url)
-           
-            # Create content hash for deduplication
-            content_hash = hashlib.md5(content_data['content'].encode()).hexdigest()
-           
-            # Create PageContent object
-            page_content = PageContent(
-                url=url,
-                title=content_data['title'],
-                content=content_data['content'],
-                links=links,
-                meta_description=content_data['meta_description'],
-                headers=content_data['headers'],
-                timestamp=time.strftime('%Y-%m-%d %H:%M:%S'),
-                status_code=response.status_code,
-                content_hash=content_hash
-            )
-           
-            return page_content
+            response = self._download(url)
+            return self.parse_page(url, response.content, response.status_code)
            
+        except ResponseRejected:
+            # Not a page (a file or an oversized response); _download logged it
+            return None
         except requests.RequestException as e:
             logger.error(f"Request error for {url}: {e}")
             return None
@@ -284,13 +352,278 @@ class WebScraper:
             logger.error(f"Error processing {url}: {e}")
             return None
    
-    def crawl_recursive(self, start_url: str, max_depth: int = None) -> List[PageContent]:
+    def scrape_page(self, url: str) -> PageContent:
+        """
+        Fetch and parse a single page like ``fetch_page``, but raise on failure
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            PageContent object
+
+        Raises:
+            Everything ``download`` raises, and parse errors
+        """
+        response = self.download(url)
+        return self.parse_page(url, response.content, response.status_code)
+
+    def download(self, url: str):
+        """
+        Download a page without parsing it, waiting for the domain's rate limit
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            Response object with ``content`` and ``status_code``
+
+        Raises:
+            requests.RequestException: If the request fails or returns an error status
+            transport.ResponseRejected: If the response has an unaccepted
+                content type or exceeds ``max_bytes`` (a RequestException)
+            DisallowedByRobots: If robots.txt forbids fetching the URL
+        """
+        if not self.allowed_by_robots(url):
+            raise DisallowedByRobots(f"Disallowed by robots.txt: {url}")
+        self.rate_limiter.acquire(urlparse(url).netloc)
+        return self._download(url)
+
+    def _download(self, url: str, sitemap: bool = False):
+        """Download a page (or a sitemap, which may be any type and larger) without rate limiting"""
+        logger.info(f"Fetching: {url}")
+        limits = {'max_bytes': MAX_SITEMAP_BYTES, 'content_types': None} if sitemap else \
+            {'max_bytes': self.max_bytes, 'content_types': self.content_types}
+
+        start = time.perf_counter()
+        try:
+            if self.http_cache is not None:
+                response = self.http_cache.fetch(self.session, url, headers=self.headers, timeout=self.timeout,
+                                                 fresh_since=self.sitemap_lastmod.get(url), **limits)
+            else:
+                response = fetch_limited(self.session, url, headers=self.headers, timeout=self.timeout, **limits)
+            response.raise_for_status()
+        except ResponseRejected as e:
+            FETCHES.inc(outcome="rejected")
+            logger.info(f"Skipped: {e}")
+            raise
+        except Exception:
+            FETCHES.inc(outcome="error")
+            raise
+        elapsed = time.perf_counter() - start
+
+        source = "cache" if getattr(response, 'from_cache', False) else "network"
+        FETCHES.inc(outcome="ok")
+        FETCH_SECONDS.observe(elapsed, source=source)
+        FETCH_BYTES.inc(len(response.content), source=source)
+        self.timings.add("fetch", elapsed, len(response.content))
+        return response
+
+    def allowed_by_robots(self, url: str) -> bool:
+        """
+        Check a URL against its host's robots.txt (fetched on first use)
+
+        Args:
+            url: URL to check
+
+        Returns:
+            True if the URL may be fetched or robots.txt is not respected
+        """
+        if self.robots is None or self.robots.can_fetch(url):
+            return True
+        logger.info(f"Disallowed by robots.txt: {url}")
+        return False
+
+    def sitemap_urls(self, start_url: str) -> List[str]:
+        """
+        Read the pages listed in a host's sitemaps
+
+        Sitemaps are taken from robots.txt, falling back to /sitemap.xml.
+        Pages are normalized and filtered by the URL policy, and their
+        ``lastmod`` hints are kept in ``sitemap_lastmod``.
+
+        Args:
+            start_url: Any URL on the host
+
+        Returns:
+            Normalized page URLs in sitemap order
+        """
+        parsed = urlparse(start_url)
+        sitemaps = self.robots.sitemaps(start_url) if self.robots is not None else []
+        if not sitemaps:
+            sitemaps = [f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"]
+
+        def fetch(sitemap_url: str) -> bytes:
+            self.rate_limiter.acquire(urlparse(sitemap_url).netloc)
+            return self._download(sitemap_url, sitemap=True).content
+
+        urls = []
+        for entry in read_sitemaps(sitemaps, fetch, max_urls=self.max_sitemap_urls):
+            url = self.url_policy.normalize(entry.url)
+            if not self.url_policy.is_allowed(url, parsed.netloc):
+                continue
+            urls.append(url)
+            if entry.lastmod is not None:
+                self.sitemap_lastmod[url] = entry.lastmod
+        return urls
+
+    def parse_page(self, url: str, content: bytes, status_code: int = 200) -> PageContent:
+        """
+        Parse a downloaded page into a PageContent object
+
+        During a crawl with ``parse_workers`` the page is parsed in a worker
+        process; if the worker pool breaks, this and the following pages are
+        parsed in-process instead.
+
+        Args:
+            url: URL the page was fetched from
+            content: Raw response body
+            status_code: HTTP status code of the response
+
+        Returns:
+            PageContent object
+        """
+        pool = self._parse_pool
+        if pool is not None:
+            try:
+                page_content, fingerprint, elapsed = \
+                    pool.submit(_parse_in_worker, url, content, status_code).result()
+            except BrokenProcessPool as e:
+                if self._parse_pool is pool:
+                    self._parse_pool = None
+                    pool.shutdown(wait=False)
+                    logger.warning(f"Parse worker pool broke ({e}), parsing in-process for the rest of the crawl")
+                pool = None
+            else:
+                if fingerprint is not None:
+                    self._fingerprints[url] = fingerprint
+        if pool is None:
+            start = time.perf_counter()
+
+            # Parse HTML and extract everything in one pass
+            page = extract_page(content, parser=self.parser)
+
+            # Extract content
+            content_data = self.extract_content(page)
+
+            # Extract links
+            links = self.extract_links(page, url)
+
+            # Create PageContent object
+            page_content = _build_page_content(url, content_data, links, status_code)
+            elapsed = time.perf_counter() - start
+
+        PARSE_SECONDS.observe(elapsed)
+        self.timings.add("parse", elapsed)
+        return page_content
+
+    @contextmanager
+    def parsing_processes(self) -> Iterator[None]:
+        """
+        Parse pages in ``parse_workers`` worker processes while the block runs
+
+        Blocks may overlap, also from different threads (e.g. batches sharing
+        one scraper): the first starts the pool and the last shuts it down.
+        Without ``parse_workers`` pages are parsed in the calling thread.
+        """
+        if self.parse_workers < 1:
+            yield
+            return
+
+        with self._parse_pool_lock:
+            self._parse_pool_users += 1
+            if self._parse_pool is None:
+                # Forking a process that runs fetch threads is unsafe, start clean interpreters
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                shingle_size = self.dedup_index.shingle_size if self.dedup_index is not None else None
+                self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                                       mp_context=multiprocessing.get_context(method),
+                                                       initializer=_init_parse_worker,
+                                                       initargs=(self.parser, self.url_policy, shingle_size))
+        try:
+            yield
+        finally:
+            with self._parse_pool_lock:
+                self._parse_pool_users -= 1
+                # parse_page drops the pool from self._parse_pool if it breaks
+                pool = self._parse_pool if self._parse_pool_users == 0 else None
+                if self._parse_pool_users == 0:
+                    self._parse_pool = None
+                    self._fingerprints.clear()
+            if pool is not None:
+                pool.shutdown()
+
+    def _keep_page(self, page_content: PageContent) -> bool:
+        """
+        Run near-duplicate detection on a freshly scraped page
+
+        Links of duplicate pages are still followed by the crawlers; only the
+        page itself is dropped (``dedup="skip"``) or marked (``"cluster"``).
+
+        Args:
+            page_content: Scraped page
+
+        Returns:
+            False if the page should be dropped
+        """
+        if self.dedup_index is None or not page_content.content:
+            return True
+
+        fingerprint = self._fingerprints.pop(page_content.url, None)
+        if fingerprint is not None:
+            canonical = self.dedup_index.add_fingerprint(page_content.url, fingerprint)
+        else:
+            canonical = self.dedup_index.add(page_content.url, page_content.content)
+        if canonical is None:
+            return True
+
+        logger.info(f"Near duplicate: {page_content.url} ~ {canonical}")
+        page_content.duplicate_of = canonical
+        return self.dedup != "skip"
+
+    def _emit(self, page_content: PageContent, collected: List[PageContent], checkpoint: bool = True) -> None:
+        """
+        Hand a scraped page to the sinks and, if enabled, to an in-memory list
+
+        Args:
+            page_content: Scraped page
+            collected: List the page is appended to when keep_in_memory is set
+            checkpoint: Also append the page to the crawl checkpoint
+        """
+        if checkpoint and self.checkpoint is not None and collected is self.scraped_content:
+            self.checkpoint.add_page(asdict(page_content))
+        for sink in self.sinks:
+            sink.write(page_content)
+        if self.keep_in_memory:
+            collected.append(page_content)
+
+        self._page_count += 1
+        self._content_length += len(page_content.content)
+        self._links_found += len(page_content.links)
+        self._domains.add(urlparse(page_content.url).netloc)
+
+    def _reset_counters(self) -> None:
+        """Reset the running totals reported by get_content_stats"""
+        self._page_count = 0
+        self._content_length = 0
+        self._links_found = 0
+        self._domains: Set[str] = set()
+        self.timings.clear()
+        self._crawl_started = time.perf_counter()
+
+    def crawl_recursive(self, start_url: str, max_depth: int = None, resume: bool = False) -> List[PageContent]:
         """
         Recursively crawl website starting from a given URL
+
+        When ``max_workers`` is greater than one the crawl runs on the async
+        engine (see ``crawl_async``), otherwise pages are fetched one by one.
+        Both modes visit the same pages at the same depths.
        
         Args:
             start_url: Starting URL for crawling
             max_depth: Maximum depth to crawl (overrides instance setting)
+            resume: Continue the crawl saved in the checkpoint file instead of
+                starting over (requires ``checkpoint_path``)
            
         Returns:
             List of PageContent objects
@@ -298,41 +631,272 @@ class WebScraper:
         if max_depth is None:
             max_depth = self.max_depth
            
-        urls_to_visit = [(start_url, 0)]  # (url, depth)
+        if self.max_workers > 1 and not _event_loop_running():
+            return asyncio.run(self.crawl_async(start_url, max_depth, resume))
+
+        level, depth, done = self._begin_crawl(start_url, max_depth, resume)
+       
+        with self.parsing_processes():
+            while level and depth <= max_depth:
+                batch = self._start_level(level, depth)
+
+                for url in batch:
+                    if url not in done:
+                        self._record_fetch(done, url, self.fetch_page(url))
+
+                level = self._finish_level(batch, done, depth, max_depth)
+                done = {}
+                depth += 1
+       
+        return self._end_crawl()
+
+    async def crawl_async(self, start_url: str, max_depth: int = None, resume: bool = False) -> List[PageContent]:
+        """
+        Recursively crawl a website keeping up to ``max_workers`` requests in flight
+
+        The crawl proceeds breadth-first one depth level at a time, so every
+        page is visited at its shortest link distance from ``start_url``
+        exactly like the sequential crawl. Politeness is enforced per domain
+        by the rate limiter; waiting for one domain does not hold back
+        requests to other domains. Fetched pages go through near-duplicate
+        detection and the sinks on a separate thread, in batch order, while
+        the rest of the level is still being fetched.
+
+        Args:
+            start_url: Starting URL for crawling
+            max_depth: Maximum depth to crawl (overrides instance setting)
+            resume: Continue the crawl saved in the checkpoint file instead of
+                starting over (requires ``checkpoint_path``)
+
+        Returns:
+            List of PageContent objects, in breadth-first order
+        """
+        if max_depth is None:
+            max_depth = self.max_depth
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        emitting: List[asyncio.Future] = []
+        emitted = 0
+
+        def emit_ready() -> None:
+            # Hand the finished prefix of the level to the emitter thread, so
+            # dedup and sinks run in batch order while fetches continue
+            nonlocal emitted
+            ready = []
+            while emitted < len(batch) and batch[emitted] in done:
+                ready.append(done[batch[emitted]])
+                emitted += 1
+            if ready:
+                emitting.append(loop.run_in_executor(emitter, self._emit_pages, ready, False))
+
+        def fetch_reserved(url: str) -> Optional[PageContent]:
+            # The event loop already waited for the URL's rate-limit slot
+            self._reserved.url = url
+            try:
+                return self.fetch_page(url)
+            finally:
+                self._reserved.url = None
+
+        async def fetch(url: str) -> None:
+            page_content = None
+            # robots.txt may need fetching, so check it off the event loop.
+            # The rate-limit wait happens before taking a worker slot, so a
+            # slow domain does not keep the workers from other domains.
+            if self.robots is None or await loop.run_in_executor(executor, self.allowed_by_robots, url):
+                wait = self.rate_limiter.reserve(urlparse(url).netloc)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                async with semaphore:
+                    page_content = await loop.run_in_executor(executor, fetch_reserved, url)
+            self._record_fetch(done, url, page_content)
+            emit_ready()
+
+        level, depth, done = self._begin_crawl(start_url, max_depth, resume)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                ThreadPoolExecutor(max_workers=1) as emitter, self.parsing_processes():
+            while level and depth <= max_depth:
+                batch = self._start_level(level, depth)
+                emitted = 0
+
+                await asyncio.gather(*(fetch(url) for url in batch if url not in done))
+                emit_ready()
+                kept = await asyncio.gather(*emitting)
+                emitting.clear()
+                if self.checkpoint is not None:
+                    # Only whole levels go to the checkpoint, so a resumed
+                    # level is emitted once
+                    for pages in kept:
+                        for page_content in pages:
+                            self.checkpoint.add_page(asdict(page_content))
+
+                level = self._next_level(batch, done, depth, max_depth)
+                done = {}
+                depth += 1
+
+        return self._end_crawl()
+
+    def _begin_crawl(self,
+                     start_url: str,
+                     max_depth: int,
+                     resume: bool) -> Tuple[List[str], int, Dict[str, Optional[PageContent]]]:
+        """
+        Reset crawl state, or restore it from the checkpoint when resuming
+
+        Pages emitted before the checkpoint are replayed to the sinks and the
+        in-memory list, so outputs of a resumed crawl are complete.
+
+        Returns:
+            Tuple of (URLs of the level to crawl next, its depth, fetch results
+            already recorded for that level)
+        """
         self.visited_urls.clear()
         self.scraped_content.clear()
-       
-        while urls_to_visit:
-            current_url, depth = urls_to_visit.pop(0)
-           
-            # Skip if already visited or max depth reached
-            if current_url in self.visited_urls or depth > max_depth:
-                continue
-           
-            self.visited_urls.add(current_url)
-           
-            # Fetch page content
-            page_content = self.fetch_page(current_url)
-           
+        self.sitemap_lastmod.clear()
+        self._reset_counters()
+        if self.dedup_index is not None:
+            self.dedup_index.clear()
+        self._resumed_level = False
+
+        if self.checkpoint is None:
+            if resume:
+                logger.warning("resume=True has no effect without a checkpoint_path")
+            return self._seed(start_url), 0, {}
+
+        state = self.checkpoint.load(start_url, max_depth) if resume else None
+        if state is None:
+            if resume:
+                logger.warning(f"No checkpoint for {start_url} at depth {max_depth}, starting over")
+            self.checkpoint.reset(start_url, max_depth)
+            return self._seed(start_url), 0, {}
+
+        self.visited_urls.update(state['visited'])
+        for data in self.checkpoint.pages():
+            page_content = PageContent(**data)
+            if self.dedup_index is not None and page_content.content:
+                self.dedup_index.add(page_content.url, page_content.content)
+            self._emit(page_content, self.scraped_content, checkpoint=False)
+
+        if state['complete']:
+            logger.info(f"Checkpointed crawl was already complete ({self._page_count} pages)")
+            return [], state['depth'] + 1, {}
+
+        done = {url: PageContent(**data) if data is not None else None for url, data in state['done'].items()}
+        self._resumed_level = True
+        logger.info(f"Resuming crawl at depth {state['depth']}: {len(state['visited'])} URLs visited, "
+                    f"{self._page_count} pages restored, {len(done)}/{len(state['level'])} done in current level")
+        return state['level'], state['depth'], done
+
+    def _seed(self, start_url: str) -> List[str]:
+        """
+        Build the first level of a fresh crawl: the start URL and, with
+        ``use_sitemaps``, every page listed in the host's sitemaps
+        """
+        level = [start_url]
+        self.visited_urls.add(start_url)
+        if self.use_sitemaps:
+            for url in self.sitemap_urls(start_url):
+                if url not in self.visited_urls:
+                    self.visited_urls.add(url)
+                    level.append(url)
+            logger.info(f"Seeded crawl with {len(level) - 1} sitemap URLs")
+        return level
+
+    def _start_level(self, level: List[str], depth: int) -> List[str]:
+        """
+        Checkpoint the start of a depth level
+
+        Returns:
+            URLs of the level to fetch, in discovery order
+        """
+        if self._resumed_level:
+            # The level was restored from the checkpoint
+            self._resumed_level = False
+        elif self.checkpoint is not None:
+            self.checkpoint.start_level(depth, level)
+        return level
+
+    def _record_fetch(self, done: Dict[str, Optional[PageContent]], url: str,
+                      page_content: Optional[PageContent]) -> None:
+        """Store a fetch result of the current level (and checkpoint it)"""
+        done[url] = page_content
+        if self.checkpoint is not None:
+            self.checkpoint.record(url, asdict(page_content) if page_content else None)
+
+    def _finish_level(self,
+                      batch: List[str],
+                      done: Dict[str, Optional[PageContent]],
+                      depth: int,
+                      max_depth: int) -> List[str]:
+        """
+        Emit a finished level's pages in batch order and collect the next level
+
+        Returns:
+            Unvisited links for the next depth level, in discovery order
+        """
+        self._emit_pages([done.get(url) for url in batch])
+        return self._next_level(batch, done, depth, max_depth)
+
+    def _emit_pages(self, pages: List[Optional[PageContent]], checkpoint: bool = True) -> List[PageContent]:
+        """
+        Run near-duplicate detection on fetched pages and emit the kept ones
+
+        Args:
+            pages: Fetch results in batch order (None for failed fetches)
+            checkpoint: Also append the kept pages to the crawl checkpoint
+
+        Returns:
+            The kept pages
+        """
+        kept = [page_content for page_content in pages if page_content and self._keep_page(page_content)]
+        for page_content in kept:
+            self._emit(page_content, self.scraped_content, checkpoint)
+        return kept
+
+    def _next_level(self,
+                    batch: List[str],
+                    done: Dict[str, Optional[PageContent]],
+                    depth: int,
+                    max_depth: int) -> List[str]:
+        """
+        Collect the links of a finished level
+
+        Links are marked visited as soon as they are queued, so the frontier
+        holds every URL once.
+
+        Returns:
+            Unvisited links for the next depth level, in discovery order
+        """
+        next_level = []
+        if depth >= max_depth:
+            return next_level
+        for url in batch:
+            page_content = done.get(url)
             if page_content:
-                self.scraped_content.append(page_content)
-               
-                # Add found links to crawl queue if within depth limit
-                if depth < max_depth:
-                    for link in page_content.links:
-                        if link not in self.visited_urls:
-                            urls_to_visit.append((link, depth + 1))
-           
-            # Respectful crawling - add delay
-            if self.delay > 0:
-                time.sleep(self.delay)
-       
-        logger.info(f"Crawling completed. Scraped {len(self.scraped_content)} pages.")
+                for link in page_content.links:
+                    if link not in self.visited_urls:
+                        self.visited_urls.add(link)
+                        next_level.append(link)
+        return next_level
+
+    def _end_crawl(self) -> List[PageContent]:
+        """Mark the checkpoint complete and return the scraped pages"""
+        if self.checkpoint is not None:
+            self.checkpoint.finish()
+        self.timings.add("crawl", time.perf_counter() - self._crawl_started)
+        logger.info(f"Crawling completed. Scraped {self._page_count} pages.")
         return self.scraped_content
-   
+
     def crawl_concurrent(self, urls: List[str]) -> List[PageContent]:
         """
         Crawl multiple URLs concurrently
+
+        Each worker waits for the per-domain rate limit in ``download``,
+        so results are collected as soon as they complete (see
+        ``iter_concurrent``). With
+        ``parse_workers`` the threads only download and the pages are parsed
+        in worker processes.
        
         Args:
             urls: List of URLs to crawl
@@ -342,24 +906,55 @@ class WebScraper:
         """
         results = []
        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all URLs for processing
-            future_to_url = {executor.submit(self.fetch_page, url): url for url in urls}
-           
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    page_content = future.result()
-                    if page_content:
-                        results.append(page_content)
-                except Exception as e:
-                    logger.error(f"Error processing {url}: {e}")
-               
-                # Add delay to respect rate limits
-                if self.delay > 0:
-                    time.sleep(self.delay)
+        for url, page_content in self.iter_concurrent(urls):
+            if isinstance(page_content, (ResponseRejected, DisallowedByRobots)):
+                # Not a page, or not ours to fetch; _download logged rejections
+                continue
+            if isinstance(page_content, requests.RequestException):
+                logger.error(f"Request error for {url}: {page_content}")
+            elif isinstance(page_content, Exception):
+                logger.error(f"Error processing {url}: {page_content}")
+            elif self._keep_page(page_content):
+                self._emit(page_content, results)
        
         return results
+
+    def iter_concurrent(self, urls: Iterable[str]) -> Iterator[Tuple[str, Union[PageContent, Exception]]]:
+        """
+        Fetch and parse URLs concurrently, yielding each result as it completes
+
+        At most twice ``max_workers`` URLs are in flight, so ``urls`` may be a
+        lazy iterable and a slow consumer holds back the fetching. Closing
+        the iterator cancels the URLs not started yet.
+
+        Args:
+            urls: URLs to fetch
+
+        Returns:
+            Iterator of (url, PageContent) tuples in completion order; for a
+            URL that could not be fetched or parsed the exception takes the
+            place of the PageContent (see ``scrape_page``)
+        """
+        urls = iter(urls)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, self.parsing_processes():
+            pending = {executor.submit(self.scrape_page, url): url
+                       for url in itertools.islice(urls, 2 * self.max_workers)}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url = pending.pop(future)
+                        # Keep the workers busy while the caller handles this result
+                        for next_url in itertools.islice(urls, 1):
+                            pending[executor.submit(self.scrape_page, next_url)] = next_url
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            result = e
+                        yield url, result
+            finally:
+                for future in pending:
+                    future.cancel()
    
     def export_to_json(self, filename: str = "scraped_content.json") -> None:
         """
@@ -369,9 +964,14 @@ class WebScraper:
             filename: Output filename
         """
         try:
-            data = [asdict(content) for content in self.scraped_content]
+            # Written page by page instead of building one big list first
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write("[")
+                for i, content in enumerate(self.scraped_content):
+                    item = json.dumps(asdict(content), indent=2, ensure_ascii=False)
+                    f.write(",\n  " if i else "\n  ")
+                    f.write(item.replace("\n", "\n  "))
+                f.write("\n]" if self.scraped_content else "]")
             logger.info(f"Content exported to {filename}")
         except Exception as e:
             logger.error(f"Error exporting to JSON: {e}")
@@ -389,11 +989,7 @@ class WebScraper:
                     writer = csv.DictWriter(f, fieldnames=asdict(self.scraped_content[0]).keys())
                     writer.writeheader()
                     for content in self.scraped_content:
-                        row = asdict(content)
-                        # Convert lists to strings for CSV
-                        row['links'] = '; '.join(row['links'])
-                        row['headers'] = '; '.join(row['headers'])
-                        writer.writerow(row)
+                        writer.writerow(page_to_csv_row(content))
             logger.info(f"Content exported to {filename}")
         except Exception as e:
             logger.error(f"Error exporting to CSV: {e}")
@@ -401,30 +997,21 @@ class WebScraper:
     def export_for_llm(self, filename: str = "content_for_llm.txt") -> None:
         """
         Export content in a format optimized for LLM processing
+
+        Pages marked as near duplicates are left out.
        
         Args:
             filename: Output filename
         """
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write("WEBSITE DOCUMENTATION CONTENT\n")
-                f.write("=" * 50 + "\n\n")
-               
-                for i, content in enumerate(self.scraped_content, 1):
-                    f.write(f"PAGE {i}: {content.title}\n")
-                    f.write(f"URL: {content.url}\n")
-                    f.write(f"META DESCRIPTION: {content.meta_description}\n")
-                    f.write("-" * 30 + "\n")
-                   
-                    if content.headers:
-                        f.write("HEADERS:\n")
-                        for header in content.headers:
-                            f.write(f"- {header}\n")
-                        f.write("\n")
-                   
-                    f.write("CONTENT:\n")
-                    f.write(content.content)
-                    f.write("\n\n" + "=" * 50 + "\n\n")
+                f.write(LLM_HEADER)
+                number = 0
+                for content in self.scraped_content:
+                    if content.duplicate_of:
+                        continue
+                    number += 1
+                    f.write(format_page_for_llm(content, number))
            
             logger.info(f"LLM-optimized content exported to {filename}")
         except Exception as e:
@@ -433,23 +1020,45 @@ class WebScraper:
     def get_content_stats(self) -> Dict[str, any]:
         """
         Get statistics about scraped content
+
+        Totals are kept as pages are scraped, so they are available even
+        when pages are not kept in memory. ``timings`` breaks down the time
+        spent fetching, parsing and crawling.
        
         Returns:
             Dictionary with content statistics
         """
-        if not self.scraped_content:
-            return {"total_pages": 0}
+        if not self._page_count:
+            stats = {"total_pages": 0, "timings": self.timings.summary()}
+            if self.http_cache is not None:
+                stats["http_cache"] = self.http_cache.stats()
+            return stats
        
-        total_content_length = sum(len(content.content) for content in self.scraped_content)
-        unique_domains = len(set(urlparse(content.url).netloc for content in self.scraped_content))
-       
-        return {
-            "total_pages": len(self.scraped_content),
-            "total_content_length": total_content_length,
-            "average_content_length": total_content_length // len(self.scraped_content),
-            "unique_domains": unique_domains,
-            "total_links_found": sum(len(content.links) for content in self.scraped_content)
+        stats = {
+            "total_pages": self._page_count,
+            "total_content_length": self._content_length,
+            "average_content_length": self._content_length // self._page_count,
+            "unique_domains": len(self._domains),
+            "total_links_found": self._links_found,
+            "near_duplicates": self.dedup_index.duplicate_count() if self.dedup_index is not None else 0,
+            "timings": self.timings.summary()
         }
+        if self.http_cache is not None:
+            stats["http_cache"] = self.http_cache.stats()
+        stats["transport"] = self.transport.stats()
+        if self.robots is not None:
+            stats["robots_blocked"] = self.robots.blocked
+        if self.sitemap_lastmod:
+            stats["sitemap_lastmod_hints"] = len(self.sitemap_lastmod)
+        return stats
+
+def _event_loop_running() -> bool:
+    """Return True when called from inside a running asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
 
 # Convenience functions
 def scrape_single_page(url: str, **kwargs) -> Optional[PageContent]:
@@ -466,20 +1075,21 @@ def scrape_single_page(url: str, **kwargs) -> Optional[PageContent]:
     scraper = WebScraper(**kwargs)
     return scraper.fetch_page(url)
 
-def scrape_website(start_url: str, max_depth: int = 2, **kwargs) -> List[PageContent]:
+def scrape_website(start_url: str, max_depth: int = 2, resume: bool = False, **kwargs) -> List[PageContent]:
     """
     Scrape entire website recursively
    
     Args:
         start_url: Starting URL
         max_depth: Maximum crawling depth
+        resume: Resume from ``checkpoint_path`` instead of starting over
         **kwargs: Additional arguments for WebScraper
        
     Returns:
         List of PageContent objects
     """
     scraper = WebScraper(max_depth=max_depth, **kwargs)
-    return scraper.crawl_recursive(start_url)
+    return scraper.crawl_recursive(start_url, resume=resume)
 
 def scrape_urls(urls: List[str], **kwargs) -> List[PageContent]:
     """
@@ -0,0 +1,199 @@
+"""
+Single-Flight Module
+
+Coalesces identical concurrent calls: while a call for a key is running,
+further callers with the same key wait for it and share its result instead
+of repeating the work.
+
+Features:
+- Blocking calls shared by key, including the exception if the call fails
+- Streamed calls shared by key: the producer runs once in a background
+  thread and every caller receives all items, late joiners starting with
+  the ones already produced
+- Nothing is cached: once a call finishes, the next caller runs it again
+- Executed and shared call counters per flight
+- URL keys that treat trivially different spellings of a URL as the same
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from metrics import SINGLE_FLIGHT_SHARED
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def url_key(url: str) -> str:
+    """
+    Key of a URL for coalescing: lowercased scheme and host, no default
+    port, no fragment, "/" for an empty path; the query is kept
+
+    Args:
+        url: Absolute URL
+
+    Returns:
+        Normalized URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    if parts.username:
+        netloc = f"{parts.username}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+class _Call:
+    """A blocking call in flight"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _Stream:
+    """A streamed call in flight, buffering its items for every subscriber"""
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self.condition = threading.Condition()
+
+    def produce(self, iterator: Iterator[Any]) -> None:
+        try:
+            for item in iterator:
+                with self.condition:
+                    self.items.append(item)
+                    self.condition.notify_all()
+        except BaseException as e:
+            self.error = e
+        finally:
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+
+    def subscribe(self) -> Iterator[Any]:
+        position = 0
+        while True:
+            with self.condition:
+                while position >= len(self.items) and not self.finished:
+                    self.condition.wait()
+                if position < len(self.items):
+                    item = self.items[position]
+                    position += 1
+                elif self.error is not None:
+                    raise self.error
+                else:
+                    return
+            yield item
+
+
+class SingleFlight:
+    """
+    Registry of the calls in flight for one kind of work
+
+    A single instance is safe to share between threads.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the registry
+
+        Args:
+            name: Name of the flight in statistics and metrics
+        """
+        self.name = name
+        self.executed = 0
+        self.shared = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._streams: Dict[Hashable, _Stream] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a call, or wait for the identical one already running
+
+        Args:
+            key: Identity of the call
+            function: Function to run
+            *args, **kwargs: Arguments of the function
+
+        Returns:
+            The result of the one call for key (its exception is raised in
+            every caller)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+        if not leader:
+            SINGLE_FLIGHT_SHARED.inc(flight=self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stream(self, key: Hashable, function: Callable[..., Iterator[Any]], *args, **kwargs) -> Iterator[Any]:
+        """
+        Run a streamed call, or subscribe to the identical one already running
+
+        The iterator returned by function is consumed in a background thread,
+        so callers that stop reading do not stop it for the others.
+
+        Args:
+            key: Identity of the call
+            function: Function returning the iterator
+            *args, **kwargs: Arguments of the function
+
+        Returns:
+            Iterator over all items of the one call for key
+        """
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = _Stream()
+                self.executed += 1
+                threading.Thread(target=self._produce, args=(key, stream, function, args, kwargs),
+                                 daemon=True).start()
+            else:
+                self.shared += 1
+                SINGLE_FLIGHT_SHARED.inc(flight=self.name)
+        return stream.subscribe()
+
+    def stats(self) -> Dict[str, int]:
+        """Calls run, calls that shared a running call, and calls running now"""
+        with self._lock:
+            return {'executed': self.executed, 'shared': self.shared,
+                    'in_flight': len(self._calls) + len(self._streams)}
+
+    def _produce(self, key: Hashable, stream: _Stream, function: Callable[..., Iterator[Any]],
+                 args: tuple, kwargs: dict) -> None:
+        try:
+            stream.produce(function(*args, **kwargs))
+        except BaseException as e:
+            with stream.condition:
+                stream.error = e
+                stream.finished = True
+                stream.condition.notify_all()
+        finally:
+            with self._lock:
+                del self._streams[key]
@@ -0,0 +1,151 @@
+"""
+Streaming Output Sinks
+
+Sinks receive scraped pages one at a time while a crawl is running, so
+results reach disk immediately and a crawl does not have to keep every page
+in memory until it ends.
+
+Features:
+- JSONL, CSV and LLM-text sinks sharing the formats of the WebScraper exports
+- Periodic flushing so a crash loses at most a few pages
+- Context-manager support
+"""
+
+import csv
+import json
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO, Union
+
+LLM_HEADER = "WEBSITE DOCUMENTATION CONTENT\n" + "=" * 50 + "\n\n"
+
+
+def page_to_csv_row(page: Any) -> Dict[str, Any]:
+    """
+    Convert a PageContent object into a CSV row
+
+    Args:
+        page: PageContent object
+
+    Returns:
+        Dictionary with list fields joined into strings
+    """
+    row = asdict(page)
+    # Convert lists to strings for CSV
+    row['links'] = '; '.join(row['links'])
+    row['headers'] = '; '.join(row['headers'])
+    return row
+
+
+def format_page_for_llm(page: Any, number: int) -> str:
+    """
+    Format one page the way export_for_llm writes it
+
+    Args:
+        page: PageContent object
+        number: Position of the page in the export
+
+    Returns:
+        Text block for the page
+    """
+    parts = [
+        f"PAGE {number}: {page.title}\n",
+        f"URL: {page.url}\n",
+        f"META DESCRIPTION: {page.meta_description}\n",
+        "-" * 30 + "\n",
+    ]
+    if page.headers:
+        parts.append("HEADERS:\n")
+        parts.extend(f"- {header}\n" for header in page.headers)
+        parts.append("\n")
+    parts.append("CONTENT:\n")
+    parts.append(page.content)
+    parts.append("\n\n" + "=" * 50 + "\n\n")
+    return ''.join(parts)
+
+
+class PageSink(ABC):
+    """
+    Base class for streaming page outputs
+
+    Subclasses must implement ``write``; ``close`` flushes and closes the file.
+    """
+
+    def __init__(self, path: Union[str, Path], flush_every: int = 1, newline: Optional[str] = None):
+        """
+        Open the output file
+
+        Args:
+            path: Output filename
+            flush_every: Flush to disk after this many pages
+            newline: Passed to open() (CSV needs '')
+        """
+        self.path = Path(path)
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+        self._file: TextIO = open(self.path, 'w', encoding='utf-8', newline=newline)
+
+    @abstractmethod
+    def write(self, page: Any) -> None:
+        """
+        Write one page
+
+        Args:
+            page: PageContent object
+        """
+
+    def _written(self) -> None:
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the output file"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JSONLSink(PageSink):
+    """Writes one JSON object per page and line"""
+
+    def write(self, page: Any) -> None:
+        self._file.write(json.dumps(asdict(page), ensure_ascii=False))
+        self._file.write("\n")
+        self._written()
+
+
+class CSVSink(PageSink):
+    """Writes one CSV row per page, with the header taken from the first page"""
+
+    def __init__(self, path: Union[str, Path], flush_every: int = 1):
+        super().__init__(path, flush_every, newline='')
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write(self, page: Any) -> None:
+        row = page_to_csv_row(page)
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=row.keys())
+            self._writer.writeheader()
+        self._writer.writerow(row)
+        self._written()
+
+
+class LLMTextSink(PageSink):
+    """Writes pages in the export_for_llm text format, leaving out near duplicates"""
+
+    def __init__(self, path: Union[str, Path], flush_every: int = 1):
+        super().__init__(path, flush_every)
+        self._file.write(LLM_HEADER)
+
+    def write(self, page: Any) -> None:
+        if getattr(page, 'duplicate_of', None):
+            return
+        self._file.write(format_page_for_llm(page, self.count + 1))
+        self._written()
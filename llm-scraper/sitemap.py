@@ -0,0 +1,171 @@
+"""
+Sitemap Module
+
+Reads XML sitemaps so a crawl can start from every page a site announces
+instead of discovering them link by link.
+
+Features:
+- Sitemap index files followed recursively
+- Gzip-compressed sitemaps (detected by content, not file name),
+  decompressed while parsing and abandoned past the size limit
+- Streaming XML parsing with namespaces ignored
+- ``lastmod`` hints parsed into timestamps
+- Limits on the number of sitemap files and URLs read
+"""
+
+import gzip
+import io
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import XMLPullParser
+
+logger = logging.getLogger(__name__)
+
+_GZIP_MAGIC = b'\x1f\x8b'
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024  # size limit of one (uncompressed) sitemap file in the sitemap protocol
+_BLOCK_SIZE = 1 << 16
+
+
+class SitemapTooLarge(ValueError):
+    """The (decompressed) sitemap exceeds the size limit"""
+
+
+@dataclass
+class SitemapEntry:
+    """One page listed in a sitemap"""
+    url: str
+    lastmod: Optional[float] = None  # Unix timestamp
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a W3C datetime (``2024-05-01``, ``2024-05-01T10:00:00Z``, ...)
+
+    Args:
+        value: lastmod text
+
+    Returns:
+        Unix timestamp, or None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    # fromisoformat only accepts 3 or 6 fraction digits before Python 3.11
+    if '.' in value:
+        head, _, tail = value.partition('.')
+        digits = len(tail) - len(tail.lstrip('0123456789'))
+        value = head + '.' + tail[:digits].ljust(6, '0')[:6] + tail[digits:]
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _blocks(content: bytes, max_bytes: Optional[int]) -> Iterator[bytes]:
+    """Yield a sitemap document in blocks, decompressing gzip data on the fly"""
+    stream = gzip.GzipFile(fileobj=io.BytesIO(content)) if content[:2] == _GZIP_MAGIC else io.BytesIO(content)
+    size = 0
+    while True:
+        block = stream.read(_BLOCK_SIZE)
+        if not block:
+            return
+        size += len(block)
+        if max_bytes is not None and size > max_bytes:
+            raise SitemapTooLarge(f"Sitemap exceeds {max_bytes} bytes")
+        yield block
+
+
+def parse_sitemap(content: bytes,
+                  max_bytes: Optional[int] = MAX_SITEMAP_BYTES) -> Tuple[List[SitemapEntry], List[str]]:
+    """
+    Parse a sitemap or sitemap index
+
+    Args:
+        content: Raw (optionally gzip-compressed) sitemap document
+        max_bytes: Largest accepted document after decompression (None for no limit)
+
+    Returns:
+        Tuple of (page entries, child sitemap URLs)
+
+    Raises:
+        SitemapTooLarge: The document exceeds max_bytes
+    """
+    entries: List[SitemapEntry] = []
+    children: List[str] = []
+    parser = XMLPullParser(events=('end',))
+    loc = lastmod = None
+
+    def consume():
+        nonlocal loc, lastmod
+        for _, element in parser.read_events():
+            tag = element.tag.rsplit('}', 1)[-1]
+            if tag == 'loc':
+                loc = (element.text or '').strip()
+            elif tag == 'lastmod':
+                lastmod = element.text
+            elif tag in ('url', 'sitemap'):
+                if loc:
+                    if tag == 'url':
+                        entries.append(SitemapEntry(loc, parse_lastmod(lastmod)))
+                    else:
+                        children.append(loc)
+                loc = lastmod = None
+                element.clear()
+
+    # Feed in blocks so large sitemaps are never held as one element tree
+    # (nor, when compressed, as one decompressed string)
+    for block in _blocks(content, max_bytes):
+        parser.feed(block)
+        consume()
+    parser.close()
+    consume()
+    return entries, children
+
+
+def read_sitemaps(sitemap_urls: Iterable[str],
+                  fetch: Callable[[str], bytes],
+                  max_urls: int = 50000,
+                  max_sitemaps: int = 100) -> List[SitemapEntry]:
+    """
+    Collect the pages listed in sitemaps, following sitemap indexes
+
+    Args:
+        sitemap_urls: Sitemaps (or sitemap indexes) to start from
+        fetch: Function returning the body of a URL; may raise on failure
+        max_urls: Stop after this many pages
+        max_sitemaps: Stop after reading this many sitemap files
+
+    Returns:
+        Sitemap entries in document order, without duplicate URLs
+    """
+    pending = list(sitemap_urls)
+    seen_sitemaps = set()
+    entries = {}
+
+    while pending and len(seen_sitemaps) < max_sitemaps and len(entries) < max_urls:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in seen_sitemaps:
+            continue
+        seen_sitemaps.add(sitemap_url)
+
+        try:
+            pages, children = parse_sitemap(fetch(sitemap_url))
+        except Exception as e:  # network errors, bad gzip data, ParseError, SitemapTooLarge
+            logger.warning(f"Could not read sitemap {sitemap_url}: {e}")
+            continue
+
+        logger.info(f"Sitemap {sitemap_url}: {len(pages)} pages, {len(children)} sitemaps")
+        pending.extend(children)
+        for entry in pages:
+            if len(entries) >= max_urls:
+                break
+            entries.setdefault(entry.url, entry)
+
+    return list(entries.values())
@@ -1,22 +1,196 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import httpx
 import ollama
 import requests
-from bs4 import BeautifulSoup
+
+from context_packer import CHARS_PER_TOKEN, estimate_tokens, pack_context
+from extractor import ARTICLE_SELECTORS, extract_page
+from http_cache import HTTPCache
+from metrics import FETCH_BYTES, FETCH_SECONDS, FETCHES, PARSE_SECONDS, record_llm_response
+from ollama_pool import BackendPool
+from singleflight import SingleFlight, url_key
+from summary_cache import SummaryCache, summary_key
+from transport import HTML_CONTENT_TYPES, HTTPTransport, ResponseRejected
 
 # --- CONFIGURATION ---
 MODEL_NAME = "phi3:mini"
-OLLAMA_HOST = "http://127.0.0.1:11434" 
-client = ollama.Client(host=OLLAMA_HOST)
+OLLAMA_HOST = (os.environ.get("SUMMARIZER_OLLAMA_HOST") or os.environ.get("OLLAMA_HOST")
+               or "http://127.0.0.1:11434")
+# Comma-separated Ollama servers to spread the model calls over (see ollama_pool.py)
+OLLAMA_HOSTS = [host.strip() for host in os.environ.get("SUMMARIZER_OLLAMA_HOSTS", OLLAMA_HOST).split(",")
+                if host.strip()]
+OLLAMA_MAX_CONNECTIONS = 8  # concurrent requests (and keep-alive connections) per Ollama server
+OLLAMA_RETRIES = 2  # retries when connecting to Ollama fails
+MODEL_CHECK_TTL = 60  # seconds the list of installed models is reused
+
+ollama_stats = {'requests': 0, 'error_responses': 0}
+_ollama_stats_lock = threading.Lock()
+
+def _count_ollama_response(response: httpx.Response) -> None:
+    """Counts requests sent to Ollama (httpx response hook)."""
+    with _ollama_stats_lock:
+        ollama_stats['requests'] += 1
+        if response.status_code >= 400:
+            ollama_stats['error_responses'] += 1
+
+# Pooled HTTP client for pages and the Ollama REST API, shared with the
+# scrapers the app creates. Size the pool to the number of fetch workers.
+HTTP_POOL_SIZE = 16
+HTTP_RETRIES = 3
+transport = HTTPTransport(pool_size=HTTP_POOL_SIZE, retries=HTTP_RETRIES)
+
+# Pages are streamed: non-HTML responses are dropped after their headers and
+# downloads stop at MAX_PAGE_BYTES
+MAX_PAGE_BYTES = 10 * 1024 * 1024
+
+# On-disk cache of fetched pages, revalidated with ETag/Last-Modified
+HTTP_CACHE_PATH = Path(__file__).parent / ".cache" / "http_cache.sqlite3"
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Content-addressed cache of generated summaries
+SUMMARY_CACHE_PATH = Path(__file__).parent / ".cache" / "summary_cache.sqlite3"
+SUMMARY_CACHE_TTL = 7 * 24 * 3600  # seconds
+SUMMARY_CACHE_MAX_ENTRIES = 10000
+
+# The Ollama server pool (ollama_pool), the first server's client (client),
+# http_cache and summary_cache are module attributes created on first use,
+# so importing this module opens no files and no connections. Assigning one
+# of them replaces it.
+_lazy_lock = threading.RLock()
+
+def _lazy(name: str, factory: Callable[[], Any]) -> Any:
+    """Returns the module attribute name, creating it with factory on first use."""
+    value = globals().get(name)
+    if value is None:
+        with _lazy_lock:
+            value = globals().get(name)
+            if value is None:
+                value = globals()[name] = factory()
+    return value
+
+def _ollama_url(host: str) -> str:
+    """Adds the scheme and port Ollama assumes to a bare host such as OLLAMA_HOST=0.0.0.0."""
+    if '://' in host:
+        return host
+    return f"http://{host}" if ':' in host else f"http://{host}:11434"
+
+def get_ollama_pool() -> BackendPool:
+    """
+    Returns the pool of Ollama servers.
+    Requests go to the least busy healthy server that has the model; servers
+    that fail are ejected and health-checked again after a backoff.
+    """
+    return _lazy('ollama_pool', lambda: BackendPool.from_hosts(
+        [_ollama_url(host) for host in OLLAMA_HOSTS],
+        max_concurrency=OLLAMA_MAX_CONNECTIONS,
+        retries=OLLAMA_RETRIES,
+        event_hooks={'response': [_count_ollama_response]}
+    ))
+
+def get_client() -> ollama.Client:
+    """Returns the ollama.Client of the first Ollama server."""
+    return _lazy('client', lambda: get_ollama_pool().backends[0].client)
+
+def get_http_cache() -> HTTPCache:
+    """Returns the HTTP cache of fetched pages."""
+    return _lazy('http_cache', lambda: HTTPCache(HTTP_CACHE_PATH, max_bytes=HTTP_CACHE_MAX_BYTES))
+
+def get_summary_cache() -> SummaryCache:
+    """Returns the cache of generated summaries."""
+    return _lazy('summary_cache', lambda: SummaryCache(SUMMARY_CACHE_PATH, ttl=SUMMARY_CACHE_TTL,
+                                                       max_entries=SUMMARY_CACHE_MAX_ENTRIES))
+
+_LAZY_ATTRIBUTES = {
+    'ollama_pool': get_ollama_pool,
+    'client': get_client,
+    'http_cache': get_http_cache,
+    'summary_cache': get_summary_cache,
+}
+
+def __getattr__(name: str):
+    getter = _LAZY_ATTRIBUTES.get(name)
+    if getter is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getter()
+
+# Concurrent requests for the same page share one fetch, and concurrent
+# model calls for the same text, model and prompt share one generation
+fetch_flight = SingleFlight("fetch")
+llm_flight = SingleFlight("llm")
+llm_stream_flight = SingleFlight("llm_stream")
+
+PROMPT_TEMPLATE = """
+    Based on the following article text, please provide a concise, easy-to-read summary.
+    Focus on the main points and key takeaways. Keep the summary to 3-5 paragraphs.
+
+    --- TEXT ---
+    {text}
+    --- END TEXT ---
+
+    Summary:
+    """
+
+# Long texts are packed into the prompt: sentences are ranked by TF-IDF
+# centrality and the most informative ones that fit CONTEXT_TOKEN_BUDGET are
+# kept in their original order (see context_packer.py), so boilerplate at the
+# top of a page cannot crowd out the article and one short model call suffices.
+# With chunked=True they are summarized map-reduce style instead: the text is
+# split into chunks, the chunks are summarized concurrently and the partial
+# summaries are merged. Set OLLAMA_NUM_PARALLEL on the Ollama server to at
+# least MAX_PARALLEL_CHUNKS.
+MAX_CHARS = 8000  # Adjust based on your model's context window
+CONTEXT_TOKEN_BUDGET = MAX_CHARS // CHARS_PER_TOKEN
+CHUNK_CHARS = 6000
+MAX_PARALLEL_CHUNKS = 4
+
+CHUNK_PROMPT_TEMPLATE = """
+    The following text is one part of a longer article. Summarize the main points
+    of this part in one short paragraph. Do not add an introduction.
+
+    --- TEXT ---
+    {text}
+    --- END TEXT ---
+
+    Summary of this part:
+    """
+
+REDUCE_PROMPT_TEMPLATE = """
+    The following are summaries of consecutive parts of one article. Combine them
+    into a single concise, easy-to-read summary of the whole article.
+    Focus on the main points and key takeaways. Keep the summary to 3-5 paragraphs.
+
+    --- PART SUMMARIES ---
+    {text}
+    --- END PART SUMMARIES ---
+
+    Summary:
+    """
+
+def list_models(max_age: float = MODEL_CHECK_TTL) -> list:
+    """
+    Returns the models installed on the healthy Ollama servers.
+    Health-checks the servers not checked in the last max_age seconds first.
+    """
+    pool = get_ollama_pool()
+    pool.check_health(max_age)
+    return pool.models()
 
 def check_model_availability(model_name: str = MODEL_NAME) -> bool:
-    """Checks if the specified model is available locally via Ollama."""
+    """Checks if the specified model is available on any of the Ollama servers."""
     try:
-        # First check if Ollama is running by trying to connect
-        response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
-        response.raise_for_status()
-        
-        # Parse the response to check for models
-        models_data = response.json()
-        models = models_data.get('models', [])
+        # Connects to Ollama unless the servers were checked recently
+        models = list_models()
+        pool = get_ollama_pool()
+        if not pool.healthy():
+            print(f"Could not connect to Ollama at {', '.join(pool.hosts)}. Is Ollama running?")
+            return False
         
         # Check if our model is in the list
         for model in models:
@@ -24,117 +198,261 @@ def check_model_availability(model_name: str = MODEL_NAME) -> bool:
                 return True
         return False
         
-    except requests.exceptions.ConnectionError:
-        print(f"Could not connect to Ollama at {OLLAMA_HOST}. Is Ollama running?")
-        return False
-    except requests.exceptions.RequestException as e:
-        print(f"Error connecting to Ollama: {e}")
-        return False
     except Exception as e:
         print(f"Unexpected error checking model availability: {e}")
         return False
 
-def get_text_from_url(url: str) -> str | None:
+def transport_stats() -> dict:
+    """Returns connection pool statistics for page fetches and Ollama calls."""
+    with _ollama_stats_lock:
+        ollama_counts = dict(ollama_stats)
+    return {
+        'http': transport.stats(),
+        'ollama': {**ollama_counts, 'max_connections': OLLAMA_MAX_CONNECTIONS, **get_ollama_pool().stats()},
+        'coalesced': {flight.name: flight.stats() for flight in (fetch_flight, llm_flight, llm_stream_flight)},
+    }
+
+def get_text_from_url(url: str, use_cache: bool = True) -> str | None:
     """
     Fetches and extracts the main text content from a given URL.
+    Unchanged pages are served from the HTTP cache after a conditional request
+    unless use_cache is False.
+    Concurrent calls for the same URL wait for one fetch and share its text.
     Returns the text or None if fetching fails.
     """
+    return fetch_flight.do((url_key(url), use_cache), _fetch_text, url, use_cache)
+
+def _fetch_text(url: str, use_cache: bool) -> str | None:
+    """Fetches and extracts the text of one page (see get_text_from_url)."""
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        start = time.perf_counter()
+        limits = {'max_bytes': MAX_PAGE_BYTES, 'content_types': HTML_CONTENT_TYPES}
+        if use_cache:
+            response = get_http_cache().fetch(transport.session, url, headers=headers, timeout=10, **limits)
+        else:
+            response = transport.fetch_limited(url, headers=headers, timeout=10, **limits)
         response.raise_for_status()
+        source = "cache" if getattr(response, 'from_cache', False) else "network"
+        FETCHES.inc(outcome="ok")
+        FETCH_SECONDS.observe(time.perf_counter() - start, source=source)
+        FETCH_BYTES.inc(len(response.content), source=source)
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Try to find main content areas first
-        main_content = None
-        content_selectors = ['main', 'article', '.content', '.post-content', '.entry-content']
-        
-        for selector in content_selectors:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-        
-        # If no main content found, use all paragraphs
-        if main_content:
-            paragraphs = main_content.find_all('p')
-        else:
-            paragraphs = soup.find_all('p')
-            
-        if not paragraphs:
-            # Fallback to getting all text if no paragraphs found
-            return soup.get_text(strip=True, separator=' ')
-            
-        full_text = ' '.join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-        return full_text
+        # Paragraphs of the main content area (or of the whole page) in one pass;
+        # falls back to all text if the page has no paragraphs
+        with PARSE_SECONDS.time():
+            page = extract_page(response.content, content_selectors=ARTICLE_SELECTORS, boilerplate_tags=())
+        return page.article_text()
 
+    except ResponseRejected as e:
+        FETCHES.inc(outcome="rejected")
+        print(f"Skipping URL {url}: {e}")
+        return None
     except requests.exceptions.RequestException as e:
+        FETCHES.inc(outcome="error")
         print(f"Error fetching URL {url}: {e}")
         return None
     except Exception as e:
         print(f"Error parsing content from {url}: {e}")
         return None
 
-def summarize_text(text_content: str, model: str = MODEL_NAME) -> str:
+def split_into_chunks(text: str, chunk_chars: int = CHUNK_CHARS) -> list[str]:
     """
-    Sends the extracted text to the Ollama model for summarization.
+    Splits text into chunks of at most chunk_chars characters.
+    Breaks on paragraph boundaries where possible, then on sentence
+    boundaries, and only cuts inside a sentence when it is longer than a chunk.
     """
-    if not text_content:
-        return "Could not generate a summary because no text was provided."
+    pieces = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= chunk_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+            while len(sentence) > chunk_chars:
+                cut = sentence.rfind(' ', 0, chunk_chars)
+                if cut <= 0:
+                    cut = chunk_chars
+                pieces.append(sentence[:cut])
+                sentence = sentence[cut:].lstrip()
+            if sentence:
+                pieces.append(sentence)
 
-    # Truncate text if it's too long (Ollama has context limits)
-    max_chars = 8000  # Adjust based on your model's context window
-    if len(text_content) > max_chars:
-        text_content = text_content[:max_chars] + "..."
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > chunk_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
 
-    prompt = f"""
-    Based on the following article text, please provide a concise, easy-to-read summary.
-    Focus on the main points and key takeaways. Keep the summary to 3-5 paragraphs.
+def _generate(prompt_template: str, text: str, model: str, use_cache: bool) -> str:
+    """
+    Runs one prompt through the model, going through the summary cache.
+    Concurrent calls for the same text, model and prompt share one model call.
+    """
+    cache_key = summary_key(text, model, prompt_template)
+    if use_cache:
+        cached = get_summary_cache().get(cache_key)
+        if cached is not None:
+            return cached
 
-    --- TEXT ---
-    {text_content}
-    --- END TEXT ---
+    return llm_flight.do(cache_key, _call_model, cache_key, prompt_template, text, model)
 
-    Summary:
+def _call_model(cache_key: str, prompt_template: str, text: str, model: str) -> str:
+    """Sends one prompt to the model and stores the answer in the summary cache."""
+    start = time.perf_counter()
+    response = get_ollama_pool().chat(
+        model=model,
+        messages=[{'role': 'user', 'content': prompt_template.format(text=text)}]
+    )
+    record_llm_response(model, response, time.perf_counter() - start)
+    summary = response['message']['content']
+    get_summary_cache().put(cache_key, summary, model)
+    return summary
+
+def _generate_stream(prompt_template: str, text: str, model: str, use_cache: bool) -> Iterator[str]:
     """
-    
+    Like _generate, but yields the response piece by piece as the model produces it.
+    Concurrent calls for the same text, model and prompt share one streamed model call.
+    """
+    cache_key = summary_key(text, model, prompt_template)
+    if use_cache:
+        cached = get_summary_cache().get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    yield from llm_stream_flight.stream(cache_key, _stream_model, cache_key, prompt_template, text, model)
+
+def _stream_model(cache_key: str, prompt_template: str, text: str, model: str) -> Iterator[str]:
+    """Streams one prompt through the model and stores the answer in the summary cache."""
+    parts = []
+    start = time.perf_counter()
+    for chunk in get_ollama_pool().chat_stream(
+        model=model,
+        messages=[{'role': 'user', 'content': prompt_template.format(text=text)}]
+    ):
+        token = chunk['message']['content']
+        if token:
+            parts.append(token)
+            yield token
+        if chunk.get('done'):
+            # The final chunk carries the token counts
+            record_llm_response(model, chunk, time.perf_counter() - start)
+    get_summary_cache().put(cache_key, ''.join(parts), model)
+
+def _reduce_input(chunks: list[str], model: str, use_cache: bool) -> str:
+    """Summarizes chunks concurrently and returns the text for the final reduce pass."""
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHUNKS) as executor:
+        partials = list(executor.map(
+            lambda chunk: _generate(CHUNK_PROMPT_TEMPLATE, chunk, model, use_cache), chunks
+        ))
+
+        # Merge in a tree while the partial summaries don't fit into one prompt
+        combined = "\n\n".join(partials)
+        while len(combined) > MAX_CHARS and len(partials) > 1:
+            groups = split_into_chunks(combined, CHUNK_CHARS)
+            if len(groups) >= len(partials):
+                break
+            partials = list(executor.map(
+                lambda group: _generate(REDUCE_PROMPT_TEMPLATE, group, model, use_cache), groups
+            ))
+            combined = "\n\n".join(partials)
+
+    return combined[:MAX_CHARS]
+
+def _prepare(text_content: str, chunked: bool | None, model: str, use_cache: bool,
+             prompt_template: str = PROMPT_TEMPLATE) -> tuple[str, str]:
+    """Returns the prompt template and text for the final (or only) model call."""
+    if chunked:
+        chunks = split_into_chunks(text_content)
+        if len(chunks) > 1:
+            # The default prompt expects an article, not merged part summaries
+            if prompt_template == PROMPT_TEMPLATE:
+                prompt_template = REDUCE_PROMPT_TEMPLATE
+            return prompt_template, _reduce_input(chunks, model, use_cache)
+
+    if chunked is None and estimate_tokens(text_content) > CONTEXT_TOKEN_BUDGET:
+        return prompt_template, pack_context(text_content, CONTEXT_TOKEN_BUDGET)
+
+    # Truncate text if it's too long (Ollama has context limits)
+    if len(text_content) > MAX_CHARS:
+        text_content = text_content[:MAX_CHARS] + "..."
+
+    return prompt_template, text_content
+
+def summarize_text(text_content: str,
+                   model: str = MODEL_NAME,
+                   use_cache: bool = True,
+                   chunked: bool | None = None,
+                   prompt_template: str = PROMPT_TEMPLATE) -> str:
+    """
+    Sends the extracted text to the Ollama model for summarization.
+    Texts over CONTEXT_TOKEN_BUDGET are packed down to their most informative
+    sentences; chunked=True summarizes them in chunks (map-reduce) instead
+    and chunked=False truncates them to MAX_CHARS as before.
+    prompt_template (with a {text} placeholder) replaces the default prompt,
+    also for the final pass of a chunked summary.
+    Summaries of text already seen with the same model and prompt are
+    returned from the summary cache unless use_cache is False.
+    """
+    if not text_content:
+        return "Could not generate a summary because no text was provided."
+
     try:
-        # Use direct ollama.chat instead of client.chat
-        response = ollama.chat(
-            model=model,
-            messages=[{'role': 'user', 'content': prompt}],
-            stream=False
-        )
-        return response['message']['content']
+        prompt_template, text = _prepare(text_content, chunked, model, use_cache, prompt_template)
+        return _generate(prompt_template, text, model, use_cache)
     except Exception as e:
         print(f"Error communicating with Ollama model: {e}")
         return f"Error: Failed to get a summary from the AI model. Details: {str(e)}"
 
+def summarize_text_stream(text_content: str,
+                          model: str = MODEL_NAME,
+                          use_cache: bool = True,
+                          chunked: bool | None = None) -> Iterator[str]:
+    """
+    Streaming version of summarize_text: yields the summary piece by piece
+    as the model generates it (a cached summary is yielded in one piece).
+    With chunked=True the chunk summaries of a long text are computed first
+    and only the final reduce pass is streamed.
+    Raises on model errors so the caller can report them.
+    """
+    if not text_content:
+        yield "Could not generate a summary because no text was provided."
+        return
+
+    prompt_template, text = _prepare(text_content, chunked, model, use_cache)
+    yield from _generate_stream(prompt_template, text, model, use_cache)
+
 def test_ollama_connection():
     """Test function to debug Ollama connection issues."""
     print("Testing Ollama connection...")
     
-    try:
-        # Test basic connection
-        response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
-        print(f"Connection status: {response.status_code}")
-        
-        if response.status_code == 200:
-            models_data = response.json()
-            print(f"Available models: {[model.get('name') for model in models_data.get('models', [])]}")
-        
-        # Test ollama library directly
-        models = ollama.list()
-        print(f"Ollama library response: {models}")
-        
-    except Exception as e:
-        print(f"Connection test failed: {e}")
+    for backend in get_ollama_pool().backends:
+        try:
+            # Test basic connection
+            response = transport.get(f"{backend.host}/api/tags", timeout=5)
+            print(f"{backend.host}: connection status {response.status_code}")
+            
+            if response.status_code == 200:
+                models_data = response.json()
+                print(f"Available models: {[model.get('name') for model in models_data.get('models', [])]}")
+            
+            # Test ollama library directly
+            models = backend.client.list()
+            print(f"Ollama library response: {models}")
+            
+        except Exception as e:
+            print(f"Connection test of {backend.host} failed: {e}")
 
 if __name__ == "__main__":
     # Run connection test
@@ -0,0 +1,144 @@
+"""
+Summary Cache Module
+
+Persistent, content-addressed cache of LLM summaries.
+
+Features:
+- Entries keyed by a SHA-256 of the prepared text, model name and prompt template
+- Time-to-live expiry
+- Entry-count bound with least-recently-used eviction
+- Hit / miss counters
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+def summary_key(text: str, model: str, prompt_template: str) -> str:
+    """
+    Build the cache key for a summarization request
+
+    Args:
+        text: Text exactly as it is inserted into the prompt
+        model: Model name
+        prompt_template: Prompt template the text is inserted into
+
+    Returns:
+        Hex digest identifying the request
+    """
+    digest = hashlib.sha256()
+    for part in (model, prompt_template, text):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    SQLite-backed summary cache with TTL and LRU eviction
+
+    A single instance is safe to share between threads.
+    """
+
+    def __init__(self,
+                 path: Union[str, Path] = ".cache/summary_cache.sqlite3",
+                 ttl: float = 7 * 24 * 3600,
+                 max_entries: int = 10000):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file to store summaries in
+            ttl: Seconds a summary stays valid (0 = never expires)
+            max_entries: Maximum number of stored summaries before LRU eviction
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_access ON summaries (last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a summary
+
+        Args:
+            key: Key from summary_key
+
+        Returns:
+            Cached summary or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl and now - row[1] > self.ttl):
+                if row is not None:
+                    self._conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE summaries SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, summary: str, model: str = "") -> None:
+        """
+        Store a summary
+
+        Args:
+            key: Key from summary_key
+            summary: Generated summary
+            model: Model that produced the summary
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?)",
+                (key, model, summary, now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM summaries WHERE key IN "
+                    "(SELECT key FROM summaries ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hit/miss counters and entry count
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self) -> None:
+        """Remove every stored summary"""
+        with self._lock:
+            self._conn.execute("DELETE FROM summaries")
+            self._conn.commit()
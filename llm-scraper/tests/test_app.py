@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import ROOT
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    import app
+    monkeypatch.setattr(app, "JOBS_PATH", tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(app, "_job_queue", None)
+    return app
+
+
+def test_import_opens_no_files_and_starts_no_threads(tmp_path):
+    jobs_path = tmp_path / "jobs.sqlite3"
+    code = "import threading, app; print(app.JOBS_PATH, threading.active_count())"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+                            env=dict(os.environ, SUMMARIZER_JOBS_PATH=str(jobs_path))).stdout.split()
+    assert output == [str(jobs_path), "1"]
+    assert not jobs_path.exists()
+
+
+def test_job_api(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "summarize_job", lambda params: {"url": params["url"], "summary": "Short."})
+    client = app_module.app.test_client()
+
+    response = client.post("/api/jobs", json={"url": "example.com/page"})
+    assert response.status_code == 202
+    job_id = response.json["id"]
+    assert app_module.JOBS_PATH.exists()
+
+    for _ in range(500):
+        job = client.get(response.json["status_url"]).json
+        if job["status"] == "done":
+            break
+        time.sleep(0.01)
+    assert job["result"] == {"url": "https://example.com/page", "summary": "Short."}
+    assert client.get("/api/jobs").json["done"] == 1
+    assert client.get("/api/jobs/unknown").status_code == 404
+    assert client.post("/api/jobs", json={}).status_code == 400
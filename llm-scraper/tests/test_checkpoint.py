@@ -0,0 +1,95 @@
+import pytest
+
+from checkpoint import CrawlCheckpoint
+from fixtures import serve_site, site_urls
+from scrapper import WebScraper
+
+
+@pytest.fixture(scope="module")
+def site(tmp_path_factory):
+    with serve_site(str(tmp_path_factory.mktemp("site")), pages=60) as server:
+        yield server
+
+
+def start_url(site):
+    return site_urls(site.base_url, 1)[0]
+
+
+def count_fetches(scraper, fail_after=None):
+    """Wrap the scraper's fetch to count calls, raising KeyboardInterrupt after fail_after of them"""
+    fetch = scraper._fetch_page
+    calls = []
+
+    def counted(url):
+        calls.append(url)
+        if fail_after is not None and len(calls) > fail_after:
+            raise KeyboardInterrupt
+        return fetch(url)
+
+    scraper._fetch_page = counted
+    return calls
+
+
+def test_state_round_trip(tmp_path):
+    checkpoint = CrawlCheckpoint(tmp_path / "crawl.sqlite3", interval=2)
+    checkpoint.reset("http://example.com", 2)
+    checkpoint.start_level(1, ["http://example.com/a", "http://example.com/b"])
+    checkpoint.record("http://example.com/a", {"url": "http://example.com/a"})
+    checkpoint.record("http://example.com/b", None)
+    checkpoint.add_page({"url": "http://example.com"})
+    checkpoint.close()
+
+    reopened = CrawlCheckpoint(tmp_path / "crawl.sqlite3")
+    assert reopened.load("http://example.com", 3) is None
+    state = reopened.load("http://example.com", 2)
+    assert state["depth"] == 1 and not state["complete"]
+    assert state["level"] == ["http://example.com/a", "http://example.com/b"]
+    assert state["visited"] == {"http://example.com/a", "http://example.com/b"}
+    assert state["done"] == {"http://example.com/a": {"url": "http://example.com/a"}, "http://example.com/b": None}
+    assert list(reopened.pages()) == [{"url": "http://example.com"}]
+
+    reopened.finish()
+    assert reopened.load("http://example.com", 2)["complete"]
+    reopened.close()
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_interrupted_crawl_resumes_where_it_stopped(site, tmp_path, workers):
+    path = str(tmp_path / "crawl.sqlite3")
+    options = dict(delay=0, max_workers=workers, max_depth=3)
+    reference = [page.url for page in WebScraper(**options).crawl_recursive(start_url(site))]
+    assert len(reference) > 30
+
+    interrupted = WebScraper(checkpoint_path=path, checkpoint_interval=5, **options)
+    count_fetches(interrupted, fail_after=25)
+    with pytest.raises(KeyboardInterrupt):
+        interrupted.crawl_recursive(start_url(site))
+    interrupted.checkpoint.close()
+
+    resumed = WebScraper(checkpoint_path=path, **options)
+    fetched = count_fetches(resumed)
+    assert [page.url for page in resumed.crawl_recursive(start_url(site), resume=True)] == reference
+    # Pages committed before the interruption are not fetched again
+    assert len(fetched) < len(reference) - 10
+    resumed.checkpoint.close()
+
+    # A finished crawl is replayed from the checkpoint without any request
+    replayed = WebScraper(checkpoint_path=path, **options)
+    fetched = count_fetches(replayed)
+    assert [page.url for page in replayed.crawl_recursive(start_url(site), resume=True)] == reference
+    assert fetched == []
+    replayed.checkpoint.close()
+
+
+def test_without_resume_the_crawl_starts_over(site, tmp_path):
+    path = str(tmp_path / "crawl.sqlite3")
+    options = dict(delay=0, max_depth=1, checkpoint_path=path)
+    first = WebScraper(**options)
+    pages = first.crawl_recursive(start_url(site))
+    first.checkpoint.close()
+
+    again = WebScraper(**options)
+    fetched = count_fetches(again)
+    assert len(again.crawl_recursive(start_url(site))) == len(pages)
+    assert len(fetched) == len(pages)
+    again.checkpoint.close()
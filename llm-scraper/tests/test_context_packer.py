@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from context_packer import MAX_SENTENCE_CHARS, estimate_tokens, pack_context, score_sentences, split_sentences
+
+ARTICLE = [
+    "The scheduler assigns each job to the worker with the shortest queue of pending jobs.",
+    "Workers report their queue length to the scheduler after every finished job.",
+    "When a worker stops reporting, the scheduler moves its pending jobs to other workers.",
+    "Jobs that fail on a worker are retried on another worker up to three times.",
+    "The scheduler keeps the retry count of every job in its queue state.",
+]
+BOILERPLATE = ["Accept cookies.", "Home | Docs | Blog | Contact", "Subscribe to our newsletter for updates."]
+
+
+def make_text(repeat=6, seed=0):
+    """Article paragraphs with boilerplate repeated between them"""
+    rng = random.Random(seed)
+    paragraphs = []
+    for i in range(repeat):
+        sentences = ARTICLE[:]
+        rng.shuffle(sentences)
+        paragraphs.append(f"Part {i} of the guide. " + " ".join(sentences))
+        paragraphs.append(" ".join(BOILERPLATE))
+    return "\n\n".join(paragraphs)
+
+
+def test_text_within_budget_is_unchanged():
+    text = make_text(1)
+    assert pack_context(text, estimate_tokens(text)) == text
+
+
+@pytest.mark.parametrize("budget", [20, 50, 120, 300])
+def test_packed_text_fits_the_budget(budget):
+    text = make_text()
+    packed = pack_context(text, budget)
+    assert packed
+    assert estimate_tokens(packed) <= budget
+
+
+def test_packed_sentences_keep_document_order_without_repeats():
+    text = make_text()
+    sentences = [sentence for _, sentence in split_sentences(text)]
+    packed = [sentence for _, sentence in split_sentences(pack_context(text, 200))]
+
+    positions = [sentences.index(sentence) for sentence in packed]
+    assert positions == sorted(positions)
+    assert len(set(packed)) == len(packed)
+    assert set(ARTICLE) <= set(packed)
+
+
+def test_article_sentences_are_packed_before_boilerplate():
+    scores, _ = score_sentences(ARTICLE + BOILERPLATE)
+    assert min(scores[:len(ARTICLE)]) > max(scores[len(ARTICLE):])
+    packed = pack_context(make_text(), 120)
+    assert all(sentence in packed for sentence in ARTICLE)
+    assert "Subscribe" not in packed
+
+
+def test_repeated_sentences_score_zero():
+    scores, _ = score_sentences([ARTICLE[0], ARTICLE[1], ARTICLE[0]])
+    assert scores[0] > 0 and scores[2] == 0
+
+
+def test_split_sentences_keeps_paragraphs_and_splits_long_runs():
+    text = "First one. Second one!\n\n  Third   one?\n\n" + "word " * 300
+    sentences = split_sentences(text)
+    assert sentences[:3] == [(0, "First one."), (0, "Second one!"), (1, "Third one?")]
+    assert all(paragraph == 2 and len(sentence) <= MAX_SENTENCE_CHARS for paragraph, sentence in sentences[3:])
+    assert " ".join(sentence for _, sentence in sentences[3:]) == ("word " * 300).strip()
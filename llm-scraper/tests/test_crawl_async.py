@@ -0,0 +1,76 @@
+import time
+
+from rate_limiter import DomainRateLimiter
+from scrapper import WebScraper
+from url_policy import URLPolicy
+
+HTML = {"Content-Type": "text/html"}
+
+
+def page(title, links=()):
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><head><title>{title}</title></head><body><p>{title} text.</p>{anchors}</body></html>".encode()
+
+
+def two_host_site(server):
+    """Start page on 127.0.0.1 linking to six pages on it and six on localhost; returns fetch times by path"""
+    fast_base = server.base_url.replace("127.0.0.1", "localhost")
+    slow = [f"/slow-{i}" for i in range(6)]
+    fast = [f"/fast-{i}" for i in range(6)]
+    fetched = {}
+
+    def route(path):
+        def reply(handler):
+            fetched[path] = time.monotonic()
+            return 200, HTML, page(path)
+        return reply
+
+    server.routes["/"] = (200, HTML, page("start", slow + [fast_base + path for path in fast]))
+    for path in slow + fast:
+        server.routes[path] = route(path)
+    return slow, fast, fetched
+
+
+def test_waiting_for_a_slow_host_does_not_block_other_hosts(server):
+    slow, fast, fetched = two_host_site(server)
+    limiter = DomainRateLimiter()
+    limiter.set_rate(server.base_url.split("//", 1)[1], 4)
+    scraper = WebScraper(max_workers=2, max_depth=1, rate_limiter=limiter, respect_robots=False,
+                         url_policy=URLPolicy(allowed_domains=["127.0.0.1", "localhost"]))
+
+    start = time.monotonic()
+    pages = scraper.crawl_recursive(server.url("/"))
+    assert len(pages) == 13
+    # The slow host gets one request every 0.25 s; the fast pages do not queue behind them
+    assert fetched[slow[-1]] - start >= 1.2
+    assert max(fetched[path] for path in fast) - start < 0.6
+
+
+def test_async_crawl_goes_through_fetch_page(server):
+    slow, fast, _ = two_host_site(server)
+    calls = []
+
+    class TracingScraper(WebScraper):
+        def fetch_page(self, url):
+            calls.append(url)
+            return super().fetch_page(url)
+
+    scraper = TracingScraper(delay=0, max_workers=4, max_depth=1, respect_robots=False,
+                             url_policy=URLPolicy(allowed_domains=["127.0.0.1", "localhost"]))
+    assert len(scraper.crawl_recursive(server.url("/"))) == 13
+    assert len(calls) == 13
+
+
+def test_async_and_sequential_crawls_visit_the_same_pages(server):
+    server.routes["/"] = (200, HTML, page("start", ["/a", "/b"]))
+    server.routes["/a"] = (200, HTML, page("a", ["/c", "/b"]))
+    server.routes["/b"] = (200, HTML, page("b", ["/d"]))
+    server.routes["/c"] = (200, HTML, page("c", ["/"]))
+    server.routes["/d"] = (200, HTML, page("d", ["/e"]))
+    server.routes["/e"] = (200, HTML, page("e"))
+
+    crawls = [[page.url for page in WebScraper(delay=0, max_workers=workers, max_depth=2,
+                                               respect_robots=False).crawl_recursive(server.url("/"))]
+              for workers in (1, 4)]
+    assert crawls[0] == crawls[1]
+    assert [url.rsplit("/", 1)[1] for url in crawls[0]] == ["", "a", "b", "c", "d"]
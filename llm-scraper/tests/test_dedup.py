@@ -0,0 +1,73 @@
+import hashlib
+import random
+
+from dedup import NearDuplicateIndex, hamming_distance, simhash
+
+WORDS = ("crawler page content link summary model token cache request server "
+         "parser domain queue worker text index").split()
+
+
+def reference_simhash(text, shingle_size=3):
+    """Textbook SimHash: one weight per bit, +1/-1 for every feature occurrence"""
+    words = text.lower().split()
+    if len(words) < shingle_size:
+        shingles = [' '.join(words)] if words else []
+    else:
+        shingles = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def random_text(rng, length):
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+
+def test_simhash_matches_bitwise_reference():
+    rng = random.Random(0)
+    texts = ["", "one", "two words", "exactly three words"] + [random_text(rng, n) for n in (5, 50, 500)]
+    for text in texts:
+        for shingle_size in (1, 3):
+            assert simhash(text, shingle_size) == reference_simhash(text, shingle_size)
+
+
+def test_similar_texts_have_close_fingerprints():
+    rng = random.Random(1)
+    text = random_text(rng, 400)
+    edited = text + " footer"
+    other = random_text(rng, 400)
+    assert hamming_distance(simhash(text), simhash(edited)) <= 3
+    assert hamming_distance(simhash(text), simhash(other)) > 10
+
+
+def test_index_finds_fingerprints_within_max_distance():
+    index = NearDuplicateIndex(max_distance=3)
+    base = random.Random(2).getrandbits(64)
+    assert index.add_fingerprint("a", base) is None
+    # Three flipped bits, one in each of three bands
+    assert index.add_fingerprint("b", base ^ (1 | 1 << 20 | 1 << 40)) == "a"
+    # Four flipped bits, one in every band, are out of range
+    assert index.add_fingerprint("c", base ^ (1 | 1 << 20 | 1 << 40 | 1 << 60)) is None
+    assert index.clusters == {"a": ["b"], "c": []}
+    assert index.duplicate_count() == 1
+
+
+def test_index_returns_closest_match():
+    index = NearDuplicateIndex(max_distance=3)
+    base = 0xFFFF_0000_FFFF_0000
+    index.add_fingerprint("far", base ^ 0b111)
+    index.add_fingerprint("near", base ^ 0b1 << 32)
+    assert index.find(base) == "near"
+
+
+def test_add_text_and_clear():
+    index = NearDuplicateIndex()
+    text = random_text(random.Random(3), 300)
+    assert index.add("page1", text) is None
+    assert index.add("page2", text) == "page1"
+    index.clear()
+    assert index.find(simhash(text)) is None
+    assert index.duplicate_count() == 0
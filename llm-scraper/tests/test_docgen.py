@@ -0,0 +1,119 @@
+import json
+import threading
+
+import pytest
+
+import docgen
+from docgen import DocGenerator, DocStore, section_path
+
+
+@pytest.fixture
+def summaries(monkeypatch):
+    """Replace the LLM with a stub that records which prompts it was asked"""
+    calls = []
+    lock = threading.Lock()
+
+    def summarize(text, model=None, use_cache=True, chunked=None, prompt_template=None):
+        kind = {docgen.PAGE_PROMPT_TEMPLATE: "page", docgen.SECTION_PROMPT_TEMPLATE: "section",
+                docgen.SITE_PROMPT_TEMPLATE: "site"}[prompt_template]
+        first_line = text.splitlines()[0]
+        with lock:
+            calls.append((kind, first_line))
+        if "Broken" in first_line:
+            return "Error: model unavailable"
+        return f"{kind} summary of {first_line}"
+
+    monkeypatch.setattr(docgen, "summarize_text", summarize)
+    return calls
+
+
+def page(path, content="Some text.", **fields):
+    url = f"http://docs.example.com{path}"
+    data = dict(url=url, title=f"Title {path}", content=content, links=[], meta_description="", headers=[],
+                timestamp="2024-01-01 00:00:00", status_code=200, content_hash=f"hash:{content}")
+    data.update(fields)
+    return data
+
+
+SITE = [
+    page("/guide/install/linux.html"),
+    page("/guide/install/windows.html"),
+    page("/api/index.html"),
+    page("/guide/install/copy.html", duplicate_of="http://docs.example.com/guide/install/linux.html"),
+    page("/empty.html", content="  "),
+]
+
+
+@pytest.fixture
+def generator(tmp_path):
+    generator = DocGenerator(store=DocStore(tmp_path / "docs.sqlite3"), model="test", use_cache=False)
+    yield generator
+    generator.store.close()
+
+
+def test_section_path():
+    assert section_path("http://docs.example.com/guide/install/linux.html") == "docs.example.com/guide/install"
+    assert section_path("http://docs.example.com/a/b/c/d.html", depth=1) == "docs.example.com/a"
+    assert section_path("http://docs.example.com/") == "docs.example.com"
+
+
+def test_generates_page_section_and_site_summaries(generator, summaries):
+    docs = generator.generate(SITE)
+    assert [section.path for section in docs.sections] == ["docs.example.com/api", "docs.example.com/guide/install"]
+    assert [doc.url for doc in docs.sections[1].pages] == [
+        "http://docs.example.com/guide/install/linux.html", "http://docs.example.com/guide/install/windows.html",
+    ]
+    # A one-page section reuses its page summary; only the two-page section and the site are summarized
+    assert docs.sections[0].summary == "page summary of Title: Title /api/index.html"
+    assert docs.overview.startswith("site summary")
+    assert docs.stats == {"pages": 3, "pages_summarized": 3, "pages_failed": 0,
+                          "sections": 2, "sections_summarized": 1, "site_summarized": 1}
+
+    markdown = docs.to_markdown("Docs")
+    assert markdown.startswith("# Docs\n\nsite summary")
+    assert "## docs.example.com/guide/install" in markdown
+    assert "### [Title /api/index.html](http://docs.example.com/api/index.html)" in markdown
+
+
+def test_rerun_reuses_unchanged_summaries(generator, summaries):
+    generator.generate(SITE)
+    summaries.clear()
+    docs = generator.generate(SITE)
+    assert summaries == []
+    assert docs.stats["pages_summarized"] == docs.stats["sections_summarized"] == docs.stats["site_summarized"] == 0
+
+
+def test_changed_page_regenerates_only_its_section_and_the_site(generator, summaries):
+    generator.generate(SITE)
+    summaries.clear()
+    changed = [page("/guide/install/linux.html", content="New text.")] + SITE[1:]
+    generator.generate(changed)
+    assert sorted(kind for kind, _ in summaries) == ["page", "section", "site"]
+    assert ("page", "Title: Title /guide/install/linux.html") in summaries
+
+
+def test_removed_pages_are_pruned(generator, summaries):
+    generator.generate(SITE)
+    summaries.clear()
+    docs = generator.generate(SITE[:2])
+    assert [section.path for section in docs.sections] == ["docs.example.com/guide/install"]
+    assert summaries == []
+
+    # The removed page was forgotten, so it is summarized again when it comes back
+    generator.generate(SITE)
+    assert ("page", "Title: Title /api/index.html") in summaries
+
+
+def test_failed_pages_are_counted_and_left_out(generator, summaries):
+    docs = generator.generate(SITE[:2] + [page("/guide/install/broken.html", title="Broken")])
+    assert docs.stats["pages_failed"] == 1
+    assert len(docs.sections[0].pages) == 2
+
+
+def test_main_writes_markdown(tmp_path, summaries):
+    (tmp_path / "pages.json").write_text(json.dumps(SITE))
+    output = tmp_path / "docs.md"
+    code = docgen.main([str(tmp_path / "pages.json"), "-o", str(output), "--store", str(tmp_path / "docs.sqlite3"),
+                        "--title", "Example"])
+    assert code == 0
+    assert output.read_text(encoding="utf-8").startswith("# Example\n")
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from bench_extract import engine_article_text, engine_scraper_parse, legacy_article_text, legacy_scraper_parse
+from extractor import available_parsers, decode_html, extract_page
+from fixtures import make_page
+
+PARSERS = available_parsers()
+
+EDGE_CASES = [
+    # No content container: falls back to <body>, boilerplate and scripts skipped
+    b"<html><head><title> T </title><script>var x = '<p>no</p>';</script></head>"
+    b"<body><nav><a href='/nav'>Nav</a></nav><p>One</p><div>Two <b>bold</b></div>"
+    b"<footer>Foot</footer></body></html>",
+    # Container chosen by priority, not by document order
+    b"<html><body><div class='content'><p>Second choice</p></div>"
+    b"<article><h2>Art</h2><p>First choice</p><a href='a.html'>A</a></article></body></html>",
+    # Selectors by attribute and id, nested headers and void elements
+    b"<html><head><meta name='description' content=' Desc '></head><body>"
+    b"<div role='main'><h1>Title <span>here</span></h1>Line<br>break<img src='x.png'></div>"
+    b"<div id='content'>Not this</div></body></html>",
+    # No paragraphs at all
+    b"<html><body><main>Just text<ul><li>item</li></ul></main></body></html>",
+]
+
+
+def fixture_pages(count=10):
+    rng = random.Random(0)
+    return [make_page(i, count, rng).encode("utf-8") for i in range(count)]
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_matches_beautifulsoup_on_fixture_pages(parser):
+    for html in fixture_pages():
+        assert engine_scraper_parse(html, parser) == legacy_scraper_parse(html)
+        assert engine_article_text(html, parser) == legacy_article_text(html)
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("html", EDGE_CASES)
+def test_matches_beautifulsoup_on_edge_cases(parser, html):
+    assert engine_scraper_parse(html, parser) == legacy_scraper_parse(html)
+    assert engine_article_text(html, parser) == legacy_article_text(html)
+
+
+@pytest.mark.skipif(len(PARSERS) < 2, reason="lxml is not installed")
+def test_parsers_agree():
+    for html in fixture_pages() + EDGE_CASES:
+        assert extract_page(html, parser="lxml") == extract_page(html, parser="html.parser")
+
+
+def test_extracted_fields():
+    page = extract_page(EDGE_CASES[2], parser="html.parser")
+    assert page.meta_description == "Desc"
+    assert page.headers == ["H1: Title here"]
+    assert page.content == "Title here Line break"
+    # Links inside boilerplate are not followed
+    assert extract_page(EDGE_CASES[0], parser="html.parser").links == []
+
+
+def test_decode_html():
+    assert decode_html("already text") == "already text"
+    assert decode_html(b"\xef\xbb\xbfcaf\xc3\xa9") == "café"
+    assert decode_html(b'<meta charset="iso-8859-1">caf\xe9') == '<meta charset="iso-8859-1">café'
+    assert decode_html(b"caf\xe9") == "café"
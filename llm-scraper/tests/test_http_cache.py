@@ -0,0 +1,124 @@
+import time
+
+import pytest
+import requests
+
+from http_cache import HTTPCache
+
+PAGE = b"<html><body><p>Version one</p></body></html>"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HTTPCache(tmp_path / "http_cache.sqlite3")
+    yield cache
+    cache.close()
+
+
+def etag_route(versions):
+    """Serve versions[-1] with its index as ETag, answering 304 to a matching If-None-Match"""
+    def route(handler):
+        etag = f'"v{len(versions)}"'
+        if handler.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"Content-Type": "text/html", "ETag": etag}, versions[-1]
+    return route
+
+
+def test_revalidates_with_etag(server, cache):
+    versions = [PAGE]
+    server.routes["/page"] = etag_route(versions)
+    session = requests.Session()
+
+    first = cache.fetch(session, server.url("/page"))
+    assert first.content == PAGE and not first.from_cache
+    assert "If-None-Match" not in server.requests[-1][1]
+
+    second = cache.fetch(session, server.url("/page"))
+    assert server.requests[-1][1]["If-None-Match"] == '"v1"'
+    assert second.content == PAGE and second.from_cache
+    assert cache.stats()["not_modified"] == 1
+
+    versions.append(b"<html><body><p>Version two</p></body></html>")
+    third = cache.fetch(session, server.url("/page"))
+    assert third.content == versions[-1] and not third.from_cache
+    assert cache.fetch(session, server.url("/page")).content == versions[-1]
+
+
+def test_revalidates_with_last_modified(server, cache):
+    stamp = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    def route(handler):
+        if handler.headers.get("If-Modified-Since") == stamp:
+            return 304, {}, b""
+        return 200, {"Content-Type": "text/html", "Last-Modified": stamp}, PAGE
+
+    server.routes["/page"] = route
+    session = requests.Session()
+    cache.fetch(session, server.url("/page"))
+    response = cache.fetch(session, server.url("/page"))
+    assert response.from_cache and response.content == PAGE
+    assert server.requests[-1][1]["If-Modified-Since"] == stamp
+
+
+def test_fresh_entries_are_served_without_a_request(server, tmp_path):
+    cache = HTTPCache(tmp_path / "fresh.sqlite3", max_age=60)
+    server.routes["/page"] = etag_route([PAGE])
+    session = requests.Session()
+    cache.fetch(session, server.url("/page"))
+    assert cache.fetch(session, server.url("/page")).from_cache
+    assert len(server.requests) == 1
+    cache.close()
+
+
+def test_fresh_since_skips_revalidation_of_newer_copies(server, cache):
+    server.routes["/page"] = etag_route([PAGE])
+    session = requests.Session()
+    cache.fetch(session, server.url("/page"))
+
+    assert cache.fetch(session, server.url("/page"), fresh_since=time.time() - 3600).from_cache
+    assert len(server.requests) == 1
+    cache.fetch(session, server.url("/page"), fresh_since=time.time() + 3600)
+    assert len(server.requests) == 2
+
+
+def test_uncacheable_responses_are_not_stored(server, cache):
+    server.routes["/missing"] = (404, {"Content-Type": "text/html"}, b"gone")
+    session = requests.Session()
+    response = cache.fetch(session, server.url("/missing"))
+    assert response.status_code == 404
+    with pytest.raises(requests.HTTPError):
+        response.raise_for_status()
+    assert cache.stats()["entries"] == 0
+
+
+def test_evicts_least_recently_used_entries(server, tmp_path):
+    cache = HTTPCache(tmp_path / "small.sqlite3", max_bytes=2500)
+    for name in ("a", "b", "c"):
+        server.routes[f"/{name}"] = (200, {"Content-Type": "text/html", "ETag": f'"{name}"'}, name.encode() * 1000)
+    session = requests.Session()
+    for name in ("a", "b", "c"):
+        cache.fetch(session, server.url(f"/{name}"))
+
+    stats = cache.stats()
+    assert stats["evictions"] >= 1
+    assert stats["size_bytes"] <= 2500
+    # The oldest entry went first: "c" is revalidated, "a" is fetched without validators
+    cache.fetch(session, server.url("/c"))
+    assert server.requests[-1][1].get("If-None-Match") == '"c"'
+    cache.fetch(session, server.url("/a"))
+    assert "If-None-Match" not in server.requests[-1][1]
+    cache.close()
+
+
+def test_entries_survive_reopening(server, tmp_path):
+    server.routes["/page"] = etag_route([PAGE])
+    session = requests.Session()
+    cache = HTTPCache(tmp_path / "persist.sqlite3")
+    cache.fetch(session, server.url("/page"))
+    cache.close()
+
+    reopened = HTTPCache(tmp_path / "persist.sqlite3")
+    assert reopened.fetch(session, server.url("/page")).from_cache
+    assert reopened.stats()["size_bytes"] == len(PAGE)
+    reopened.close()
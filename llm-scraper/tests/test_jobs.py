@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, QueueFullError
+
+
+def wait_for(queue, job_id, statuses=(DONE, FAILED), timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} is still {queue.get(job_id)['status']}")
+
+
+def echo(params):
+    return {"echo": params["value"]}
+
+
+def test_jobs_run_and_report_results(tmp_path):
+    queue = JobQueue(echo, tmp_path / "jobs.sqlite3")
+    queue.start()
+    job = wait_for(queue, queue.submit(value=42))
+    assert job["status"] == DONE
+    assert job["result"] == {"echo": 42}
+    assert job["params"] == {"value": 42}
+    assert job["started_at"] >= job["created_at"]
+
+
+def test_failures_are_recorded(tmp_path):
+    def fail(params):
+        raise ValueError("no content")
+
+    queue = JobQueue(fail, tmp_path / "jobs.sqlite3")
+    queue.start()
+    job = wait_for(queue, queue.submit(value=1))
+    assert job["status"] == FAILED
+    assert job["error"] == "no content"
+    assert queue.stats()["failed"] == 1
+
+
+def test_queued_jobs_survive_a_restart(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    stopped = JobQueue(echo, path)
+    ids = [stopped.submit(value=i) for i in range(3)]
+    assert stopped.get(ids[2])["queue_position"] == 2
+
+    restarted = JobQueue(echo, path)
+    restarted.start()
+    assert [wait_for(restarted, job_id)["result"] for job_id in ids] == [{"echo": i} for i in range(3)]
+
+
+def test_running_jobs_are_requeued_after_a_restart(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    release = threading.Event()
+
+    def hang(params):
+        release.wait()
+        return None
+
+    crashed = JobQueue(hang, path)
+    crashed.start()
+    job_id = crashed.submit(value=7)
+    wait_for(crashed, job_id, statuses=(RUNNING,))
+
+    restarted = JobQueue(echo, path)
+    restarted.start()
+    job = wait_for(restarted, job_id)
+    release.set()
+    assert job["result"] == {"echo": 7}
+
+
+def test_submit_fails_when_the_queue_is_full(tmp_path):
+    queue = JobQueue(echo, tmp_path / "jobs.sqlite3", max_queued=2)
+    queue.submit(value=1)
+    queue.submit(value=2)
+    with pytest.raises(QueueFullError):
+        queue.submit(value=3)
+    assert queue.stats()["queued"] == 2
+    assert queue.stats()["workers"] == 0
+
+
+def test_unknown_job(tmp_path):
+    queue = JobQueue(echo, tmp_path / "jobs.sqlite3")
+    assert queue.get("missing") is None
+    assert queue.stats()[QUEUED] == 0
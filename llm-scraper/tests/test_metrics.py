@@ -0,0 +1,87 @@
+import pytest
+
+from metrics import Counter, Gauge, Histogram, MetricsRegistry, StageTimer
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_counter_and_gauge_render(registry):
+    fetches = Counter("fetches_total", "Fetches by outcome", ["outcome"], registry=registry)
+    jobs = Gauge("jobs", "Jobs by status", ["status"], registry=registry)
+    fetches.inc(outcome="ok")
+    fetches.inc(2, outcome="ok")
+    fetches.inc(0.5, outcome='bad "quoted"\nvalue')
+    jobs.set(3, status="queued")
+    jobs.set(1, status="queued")
+
+    assert fetches.value(outcome="ok") == 3
+    assert registry.render() == (
+        "# HELP fetches_total Fetches by outcome\n"
+        "# TYPE fetches_total counter\n"
+        'fetches_total{outcome="bad \\"quoted\\"\\nvalue"} 0.5\n'
+        'fetches_total{outcome="ok"} 3\n'
+        "# HELP jobs Jobs by status\n"
+        "# TYPE jobs gauge\n"
+        'jobs{status="queued"} 1\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    latency = Histogram("latency_seconds", "Latency", buckets=(0.1, 1), registry=registry)
+    for value in (0.05, 0.1, 0.5, 2):
+        latency.observe(value)
+
+    assert latency.render()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 2.65",
+        "latency_seconds_count 4",
+    ]
+    assert latency.summary() == {"count": 4, "sum": 2.65, "mean": 2.65 / 4}
+
+
+def test_histogram_timer_and_labels(registry):
+    latency = Histogram("stage_seconds", "Stage time", ["stage"], registry=registry)
+    with latency.time(stage="parse"):
+        pass
+    assert latency.summary(stage="parse")["count"] == 1
+    assert latency.summary(stage="fetch")["count"] == 0
+    assert 'stage_seconds_bucket{stage="parse",le="0.005"} 1' in latency.render()
+
+
+def test_labels_and_names_are_checked(registry):
+    counter = Counter("requests_total", "Requests", ["model"], registry=registry)
+    with pytest.raises(ValueError):
+        counter.inc(backend="x")
+    with pytest.raises(ValueError):
+        Gauge("requests_total", "Duplicate", registry=registry)
+
+
+def test_stage_timer():
+    timer = StageTimer()
+    timer.add("fetch", 0.5, 100)
+    timer.add("fetch", 1.5, 50)
+    timer.add("parse", 0.25)
+    assert timer.summary() == {
+        "fetch": {"count": 2, "total_seconds": 2.0, "mean_seconds": 1.0, "max_seconds": 1.5, "bytes": 150},
+        "parse": {"count": 1, "total_seconds": 0.25, "mean_seconds": 0.25, "max_seconds": 0.25},
+    }
+    timer.clear()
+    assert timer.summary() == {}
+
+
+def test_metrics_route(tmp_path, monkeypatch):
+    import app
+    monkeypatch.setattr(app, "JOBS_PATH", tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(app, "_job_queue", None)
+
+    response = app.app.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    assert "# TYPE scraper_fetch_seconds histogram" in body
+    assert 'jobs{status="queued"} 0' in body
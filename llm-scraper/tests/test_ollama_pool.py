@@ -0,0 +1,82 @@
+import socket
+
+import pytest
+
+from ollama_pool import BackendPool, NoBackendAvailable, OllamaBackend
+from stub_ollama import StubOllama
+
+MODEL = "phi3:mini"
+MESSAGES = [{"role": "user", "content": "Summarize this page"}]
+
+
+def unused_url():
+    """URL of a local port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+@pytest.fixture
+def stubs():
+    servers = [StubOllama(latency=0, tokens_per_second=0, response_tokens=5).start() for _ in range(2)]
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+def test_requests_are_spread_over_backends(stubs):
+    pool = BackendPool.from_hosts([stub.url for stub in stubs], max_concurrency=2)
+    for _ in range(6):
+        response = pool.chat(MODEL, MESSAGES)
+        assert response["message"]["content"]
+    assert [stub.stats()["requests"] for stub in stubs] == [3, 3]
+    stats = pool.stats()
+    assert stats["healthy"] == 2 and stats["in_flight"] == 0 and stats["max_concurrency"] == 4
+
+
+def test_failed_backend_is_ejected_and_request_retried(stubs):
+    pool = BackendPool([OllamaBackend(unused_url(), retries=0), OllamaBackend(stubs[0].url)])
+    for _ in range(3):
+        assert pool.chat(MODEL, MESSAGES)["message"]["content"]
+    assert stubs[0].stats()["requests"] == 3
+    assert pool.healthy() == [pool.backends[1]]
+    dead = pool.stats()["backends"][0]
+    assert dead["failures"] == 1 and dead["ejections"] == 1
+
+
+def test_no_backend_available():
+    pool = BackendPool([OllamaBackend(unused_url(), retries=0)])
+    with pytest.raises(NoBackendAvailable):
+        pool.chat(MODEL, MESSAGES)
+    with pytest.raises(NoBackendAvailable):
+        pool.chat(MODEL, MESSAGES)
+
+
+def test_models_route_requests(stubs):
+    other = StubOllama(latency=0, tokens_per_second=0, response_tokens=5, models=["llama3:8b"]).start()
+    try:
+        pool = BackendPool.from_hosts([stubs[0].url, other.url])
+        pool.check_health()
+        assert {entry["name"] for entry in pool.models()} == {MODEL, "llama3:8b"}
+        for _ in range(3):
+            pool.chat("llama3:8b", MESSAGES)
+        assert other.stats()["requests"] == 3
+        assert stubs[0].stats()["requests"] == 0
+        with pytest.raises(NoBackendAvailable):
+            pool.chat("mistral", MESSAGES)
+    finally:
+        other.stop()
+
+
+def test_health_check_ejects_unreachable_backends(stubs):
+    pool = BackendPool([OllamaBackend(stubs[0].url), OllamaBackend(unused_url())], health_timeout=1)
+    pool.check_health()
+    assert pool.healthy() == [pool.backends[0]]
+
+
+def test_chat_stream(stubs):
+    pool = BackendPool([OllamaBackend(unused_url(), retries=0), OllamaBackend(stubs[0].url)])
+    chunks = list(pool.chat_stream(MODEL, MESSAGES))
+    assert len(chunks) > 1
+    assert chunks[-1]["done"]
+    assert pool.stats()["in_flight"] == 0
@@ -0,0 +1,127 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+import pipeline
+from pipeline import SummaryPipeline
+from scrapper import WebScraper
+
+
+def article(topic, words=60):
+    body = " ".join(f"{topic} sentence number {i} explains the topic in some detail." for i in range(words // 8))
+    return f"<html><head><title>{topic}</title></head><body><article><p>{body}</p></article></body></html>".encode()
+
+
+HTML = {"Content-Type": "text/html"}
+
+
+@pytest.fixture
+def summaries(monkeypatch):
+    """Replace the model call, recording the texts it was given"""
+    calls = []
+
+    def summarize(text, model=None, use_cache=True):
+        calls.append(text)
+        if "Slow" in text:
+            time.sleep(0.5)
+        return f"Summary of {len(text)} characters."
+
+    monkeypatch.setattr(pipeline, "summarize_text", summarize)
+    return calls
+
+
+def scraper(**kwargs):
+    options = dict(delay=0, max_workers=4, respect_robots=False)
+    return WebScraper(**{**options, **kwargs})
+
+
+def test_results_cover_every_input(server, summaries):
+    server.routes["/a"] = (200, HTML, article("Alpha"))
+    server.routes["/b"] = (200, HTML, article("Beta"))
+    server.routes["/b-copy"] = (200, HTML, article("Beta"))
+    server.routes["/short"] = (200, HTML, b"<html><body><p>Too short.</p></body></html>")
+    urls = [server.url(path) for path in ("/a", "/b", "/missing", "/short", "/a")]
+
+    results = list(SummaryPipeline(scraper=scraper()).run(urls + ["  ", server.url("/b-copy")]))
+    by_index = {result["index"]: result for result in results}
+    assert sorted(by_index) == [0, 1, 2, 3, 4, 6]
+
+    assert (by_index[2]["status"], by_index[2]["stage"]) == ("error", "fetch")
+    assert (by_index[3]["status"], by_index[3]["stage"]) == ("error", "extract")
+    # Of a repeated or near-identical page, whichever is extracted first is summarized
+    for first, second in ((0, 4), (1, 6)):
+        ok, duplicate = sorted((by_index[first], by_index[second]), key=lambda result: result["status"] != "ok")
+        assert ok["status"] == "ok" and ok["summary"].startswith("Summary of") and ok["elapsed"] >= 0
+        assert duplicate["status"] == "duplicate" and duplicate["duplicate_of"] == ok["url"]
+    assert by_index[0]["title"] == "Alpha"
+    assert len(summaries) == 2
+    assert not any(key in result for result in results for key in ("started", "queued_at", "content", "text"))
+
+
+def test_results_arrive_in_completion_order(server, summaries):
+    server.routes["/slow"] = (200, HTML, article("Slow"))
+    for name in ("one", "two", "three"):
+        server.routes[f"/{name}"] = (200, HTML, article(name.title()))
+    urls = [server.url(path) for path in ("/slow", "/one", "/two", "/three")]
+
+    results = list(SummaryPipeline(scraper=scraper(), summarize_workers=2).run(urls))
+    assert [result["index"] for result in results][-1] == 0
+
+
+def test_closing_the_results_stops_the_batch(server, summaries):
+    server.routes["/page"] = (200, HTML, article("Endless"))
+    fed = itertools.count()
+
+    def urls():
+        for i in fed:
+            yield server.url(f"/page?n={i}")
+
+    results = SummaryPipeline(scraper=scraper(), queue_size=4, dedup=False).run(urls())
+    assert [next(results)["status"] for _ in range(3)] == ["ok"] * 3
+    results.close()
+
+    time.sleep(0.5)
+    requested = len(server.requests)
+    time.sleep(0.5)
+    assert len(server.requests) == requested
+    # Bounded queues kept the feed from reading far ahead
+    assert next(fed) < 60
+    assert not any(thread.name.startswith("pipeline-") for thread in threading.enumerate())
+
+
+def test_extraction_runs_in_parse_processes(server, summaries):
+    server.routes["/a"] = (200, HTML, article("Alpha"))
+    server.routes["/b"] = (200, HTML, article("Beta"))
+    shared = scraper(parse_workers=1)
+    parse_page = shared.parse_page
+    pooled = []
+
+    def parse(*args):
+        pooled.append(shared._parse_pool is not None)
+        return parse_page(*args)
+
+    shared.parse_page = parse
+    results = list(SummaryPipeline(scraper=shared).run([server.url("/a"), server.url("/b")]))
+    assert sorted(result["title"] for result in results) == ["Alpha", "Beta"]
+    assert pooled == [True, True]
+    # The pool is shut down with the extract stage
+    assert shared._parse_pool is None
+
+
+def test_fetches_keep_the_per_host_delay(server, summaries):
+    for i in range(4):
+        server.routes[f"/{i}"] = (200, HTML, article(f"Topic{i}"))
+    start = time.monotonic()
+    results = list(SummaryPipeline(scraper=scraper(delay=0.2, max_workers=8)).run(
+        [server.url(f"/{i}") for i in range(4)]))
+    assert len(results) == 4
+    assert time.monotonic() - start >= 0.55
+
+
+def test_shared_scraper_is_polite():
+    shared = pipeline.shared_scraper()
+    assert shared is pipeline.shared_scraper()
+    assert shared.delay > 0
+    assert shared.parse_workers >= 1
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from rate_limiter import DomainRateLimiter, TokenBucket
+
+
+def test_burst_is_free_then_requests_are_spaced():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+
+def test_reservations_queue_up_behind_each_other():
+    bucket = TokenBucket(rate=10)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[0] == 0
+    assert waits[1:] == pytest.approx([0.1, 0.2, 0.3], abs=0.02)
+
+
+def test_concurrent_callers_get_distinct_slots():
+    bucket = TokenBucket(rate=100)
+    waits = []
+    lock = threading.Lock()
+
+    def take():
+        wait = bucket.reserve()
+        with lock:
+            waits.append(wait)
+
+    threads = [threading.Thread(target=take) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # One slot every 10 ms, no two callers sharing one
+    assert sorted(waits)[-1] == pytest.approx(0.19, abs=0.03)
+    assert len({round(wait, 2) for wait in waits}) >= 18
+
+
+def test_acquire_sleeps_for_its_slot():
+    bucket = TokenBucket(rate=20)
+    bucket.acquire()
+    assert bucket.acquire() == pytest.approx(0.05, abs=0.02)
+    assert bucket.reserve() == pytest.approx(0.05, abs=0.02)
+
+
+def test_no_rate_means_no_limit():
+    for bucket in (TokenBucket(None), TokenBucket(0)):
+        assert [bucket.reserve() for _ in range(100)] == [0] * 100
+
+
+def test_domains_have_separate_budgets():
+    limiter = DomainRateLimiter(requests_per_second=1)
+    assert limiter.reserve("a.example") == 0
+    assert limiter.reserve("b.example") == 0
+    assert limiter.reserve("a.example") == pytest.approx(1, abs=0.02)
+    assert limiter.bucket("a.example") is limiter.bucket("a.example")
+
+
+def test_domain_override():
+    limiter = DomainRateLimiter(requests_per_second=1)
+    limiter.set_rate("fast.example", 100, burst=3)
+    assert [limiter.reserve("fast.example") for _ in range(3)] == [0, 0, 0]
+    assert limiter.reserve("fast.example") == pytest.approx(0.01, abs=0.005)
+    limiter.set_rate("free.example", None)
+    assert max(limiter.reserve("free.example") for _ in range(10)) == 0
+
+
+def test_unlimited_by_default():
+    limiter = DomainRateLimiter()
+    assert max(limiter.reserve("a.example") for _ in range(10)) == 0
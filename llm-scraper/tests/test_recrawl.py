@@ -0,0 +1,149 @@
+import json
+import sqlite3
+import time
+
+import pytest
+
+from checkpoint import CrawlCheckpoint
+from recrawl import Recrawler, load_crawl_pages
+from scrapper import WebScraper
+
+
+def html(title, links=(), text="Some documentation text."):
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><head><title>{title}</title></head><body><p>{text}</p>{anchors}</body></html>".encode()
+
+
+class Site:
+    """Pages of a LocalServer that answer conditional requests with 304 while their ETag matches"""
+
+    def __init__(self, server):
+        self.server = server
+        self.pages = {}
+
+    def set(self, path, body):
+        etag = f'"{len(self.pages)}-{hash(body)}"'
+        self.pages[path] = (etag, body)
+
+        def reply(handler):
+            current_etag, current_body = self.pages[path]
+            if handler.headers.get("If-None-Match") == current_etag:
+                return 304, {"ETag": current_etag}, b""
+            return 200, {"Content-Type": "text/html", "ETag": current_etag}, current_body
+
+        self.server.routes[path] = reply
+
+
+@pytest.fixture
+def site(server):
+    site = Site(server)
+    site.set("/", html("Home", ["/a", "/b"]))
+    site.set("/a", html("A"))
+    site.set("/b", html("B"))
+    return site
+
+
+@pytest.fixture
+def recrawler(tmp_path):
+    recrawler = Recrawler(WebScraper(delay=0, max_depth=2, max_workers=2), tmp_path / "state.sqlite3",
+                          initial_interval=100, min_interval=10, max_interval=1000, backoff=2, speedup=0.5)
+    yield recrawler
+    recrawler.store.close()
+
+
+def test_first_recrawl_adds_every_page(site, recrawler):
+    result = recrawler.recrawl(site.server.url("/"))
+    assert sorted(page.url for page in result.added) == [site.server.url(p) for p in ("/", "/a", "/b")]
+    states = recrawler.store.pages(site.server.url("/"))
+    assert {state.interval for state in states.values()} == {100}
+
+
+def test_only_due_pages_are_checked(site, recrawler):
+    start = site.server.url("/")
+    recrawler.recrawl(start)
+    requested = len(site.server.requests)
+
+    result = recrawler.recrawl(start)
+    assert result.not_due == 3 and result.requests == 0
+    assert len(site.server.requests) == requested
+
+
+def test_intervals_grow_when_unchanged_and_shrink_when_changed(site, recrawler):
+    start = site.server.url("/")
+    recrawler.recrawl(start)
+    site.set("/a", html("A", text="Rewritten documentation text."))
+
+    result = recrawler.recrawl(start, check_all=True)
+    assert [page.url for page in result.changed] == [site.server.url("/a")]
+    assert result.not_modified == 2
+    intervals = {url: state.interval for url, state in recrawler.store.pages(start).items()}
+    assert intervals == {start: 200, site.server.url("/a"): 50, site.server.url("/b"): 200}
+    assert any(headers.get("If-None-Match") for path, headers in site.server.requests if path == "/b")
+
+
+def test_removed_pages_are_reported_and_forgotten(site, recrawler):
+    start = site.server.url("/")
+    recrawler.recrawl(start)
+    del site.server.routes["/b"]
+
+    result = recrawler.recrawl(start, check_all=True)
+    assert result.removed == [site.server.url("/b")]
+    assert site.server.url("/b") not in recrawler.store.pages(start)
+
+
+def test_seed_schedules_pages_from_their_crawl_time(recrawler):
+    start = "http://example.com/"
+    old = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - 1000))
+    pages = [
+        {"url": start, "content_hash": "h0", "links": ["http://example.com/a"], "timestamp": old},
+        {"url": "http://example.com/a", "content_hash": "h1", "links": []},
+        {"url": "http://example.com/orphan", "content_hash": "h2"},
+        {"url": "http://example.com/no-hash"},
+    ]
+    assert recrawler.seed(start, pages) == 3
+    assert recrawler.seed(start, pages) == 0
+
+    states = recrawler.store.pages(start)
+    assert {url: state.depth for url, state in states.items()} == {
+        start: 0, "http://example.com/a": 1, "http://example.com/orphan": 2,
+    }
+    assert states[start].next_due < time.time() < states["http://example.com/a"].next_due
+
+
+def test_skipped_pages_wait_until_due_again(site, recrawler):
+    start = site.server.url("/")
+    recrawler.recrawl(start)
+    site.server.routes["/robots.txt"] = (200, {"Content-Type": "text/plain"}, b"User-agent: *\nDisallow: /b\n")
+    # A new scraper, so robots.txt is fetched again
+    fresh = Recrawler(WebScraper(delay=0, max_depth=2), recrawler.store)
+    before = recrawler.store.pages(start)[site.server.url("/b")]
+    result = fresh.recrawl(start, check_all=True)
+    assert result.skipped == 1
+    after = recrawler.store.pages(start)[site.server.url("/b")]
+    assert after.content_hash == before.content_hash and after.next_due >= before.next_due
+
+
+def test_load_crawl_pages_leaves_a_checkpoint_untouched(tmp_path):
+    path = tmp_path / "crawl.sqlite3"
+    checkpoint = CrawlCheckpoint(path)
+    checkpoint.reset("http://example.com", 1)
+    checkpoint.add_page({"url": "http://example.com", "content_hash": "h"})
+    checkpoint.close()
+    # Hand the file over in rollback-journal mode, the way another tool might write it
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+    before = path.read_bytes()
+
+    assert list(load_crawl_pages(path)) == [{"url": "http://example.com", "content_hash": "h"}]
+    assert path.read_bytes() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["crawl.sqlite3"]
+
+
+def test_load_crawl_pages_reads_exports(tmp_path):
+    pages = [{"url": "http://example.com", "content_hash": "h", "links": ["http://example.com/a"]}]
+    (tmp_path / "pages.json").write_text(json.dumps(pages))
+    (tmp_path / "pages.jsonl").write_text("".join(json.dumps(page) + "\n" for page in pages))
+    (tmp_path / "pages.csv").write_text("url,content_hash,links\nhttp://example.com,h,http://example.com/a\n")
+    for name in ("pages.json", "pages.jsonl", "pages.csv"):
+        assert [dict(page) for page in load_crawl_pages(tmp_path / name)] == pages
@@ -0,0 +1,104 @@
+import pytest
+import requests
+
+from rate_limiter import DomainRateLimiter
+from robots import RobotsCache
+
+ROBOTS = b"""User-agent: *
+Disallow: /private
+Crawl-delay: 2
+
+User-agent: special-bot
+Disallow: /
+
+Sitemap: http://example.com/sitemap.xml
+"""
+
+
+@pytest.fixture
+def robots(server):
+    server.routes["/robots.txt"] = (200, {"Content-Type": "text/plain"}, ROBOTS)
+    return RobotsCache(requests.Session(), "test-bot")
+
+
+def test_rules(server, robots):
+    assert robots.can_fetch(server.url("/public"))
+    assert not robots.can_fetch(server.url("/private/page"))
+    assert robots.blocked == 1
+    assert robots.crawl_delay(server.url("/")) == 2
+    assert robots.sitemaps(server.url("/")) == ["http://example.com/sitemap.xml"]
+
+
+def test_rules_are_per_user_agent(server):
+    server.routes["/robots.txt"] = (200, {"Content-Type": "text/plain"}, ROBOTS)
+    cache = RobotsCache(requests.Session(), "special-bot")
+    assert not cache.can_fetch(server.url("/public"))
+
+
+def test_fetched_once_until_cleared(server, robots):
+    for path in ("/a", "/b", "/private"):
+        robots.can_fetch(server.url(path))
+    assert server.paths() == ["/robots.txt"]
+    robots.clear()
+    robots.can_fetch(server.url("/a"))
+    assert server.paths() == ["/robots.txt", "/robots.txt"]
+
+
+def test_ttl_expiry(server):
+    server.routes["/robots.txt"] = (200, {}, ROBOTS)
+    cache = RobotsCache(requests.Session(), "test-bot", ttl=0)
+    cache.can_fetch(server.url("/a"))
+    cache.can_fetch(server.url("/b"))
+    assert len(server.paths()) == 2
+
+
+@pytest.mark.parametrize("status, allowed", [(401, False), (403, False), (404, True), (500, True)])
+def test_error_statuses(server, status, allowed):
+    server.routes["/robots.txt"] = (status, {}, b"User-agent: *\nDisallow: /\n")
+    cache = RobotsCache(requests.Session(), "test-bot")
+    assert cache.can_fetch(server.url("/page")) is allowed
+
+
+def test_unreachable_host_allows_all():
+    cache = RobotsCache(requests.Session(), "test-bot", timeout=1)
+    assert cache.can_fetch("http://127.0.0.1:9/page")
+
+
+def test_crawl_delay_slows_the_rate_limiter(server):
+    server.routes["/robots.txt"] = (200, {}, ROBOTS)
+    domain = server.base_url.split("//", 1)[1]
+
+    limiter = DomainRateLimiter()
+    RobotsCache(requests.Session(), "test-bot", rate_limiter=limiter).can_fetch(server.url("/"))
+    assert limiter.bucket(domain).rate == pytest.approx(0.5)
+
+    # A configured rate that is already slower is kept
+    strict = DomainRateLimiter(requests_per_second=0.1)
+    RobotsCache(requests.Session(), "test-bot", rate_limiter=strict).can_fetch(server.url("/"))
+    assert strict.bucket(domain).rate == pytest.approx(0.1)
+
+
+def test_oversized_robots_txt_is_treated_as_unavailable(server):
+    server.routes["/robots.txt"] = (200, {}, b"User-agent: *\nDisallow: /\n" + b"#" * 2000)
+    cache = RobotsCache(requests.Session(), "test-bot", max_bytes=1000)
+    assert cache.can_fetch(server.url("/page"))
+
+
+def test_robots_request_waits_for_the_rate_limit(server):
+    server.routes["/robots.txt"] = (200, {}, b"User-agent: *\nDisallow:\n")
+    domain = server.base_url.split("//", 1)[1]
+    limiter = DomainRateLimiter(requests_per_second=10)
+    RobotsCache(requests.Session(), "test-bot", rate_limiter=limiter).can_fetch(server.url("/"))
+    # The robots.txt request used the host's first slot
+    assert limiter.reserve(domain) == pytest.approx(0.1, abs=0.02)
+
+
+def test_cached_hosts_are_bounded(server):
+    server.routes["/robots.txt"] = (200, {}, ROBOTS)
+    cache = RobotsCache(requests.Session(), "test-bot", max_hosts=2)
+    port = server.base_url.rsplit(":", 1)[1]
+    hosts = [f"http://{host}:{port}" for host in ("127.0.0.1", "localhost", "127.0.0.2")]
+    for host in hosts:
+        cache.can_fetch(host + "/page")
+    assert list(cache._entries) == hosts[1:]
+    assert cache._host_locks == {}
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight, url_key
+
+
+def run_threads(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    calls = []
+    results = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.2)
+        return "result"
+
+    run_threads(5, lambda: results.append(flight.do("key", work)))
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"executed": 1, "shared": 4, "in_flight": 0}
+
+
+def test_finished_calls_are_not_cached():
+    flight = SingleFlight("test")
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.stats()["executed"] == 2
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight("test")
+    started = threading.Barrier(2, timeout=5)
+
+    def work(value):
+        started.wait()  # deadlocks unless both keys run at once
+        return value
+
+    results = {}
+    threads = [threading.Thread(target=lambda k=k: results.update({k: flight.do(k, work, k)})) for k in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {"a": "a", "b": "b"}
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight("test")
+    errors = []
+
+    def fail():
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    def call():
+        try:
+            flight.do("key", fail)
+        except ValueError as e:
+            errors.append(e)
+
+    run_threads(3, call)
+    assert len(errors) == 3
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_stream_is_produced_once_for_all_subscribers():
+    flight = SingleFlight("test")
+    produced = []
+    gate = threading.Event()
+
+    def tokens():
+        for token in ("a", "b", "c"):
+            gate.wait()
+            produced.append(token)
+            yield token
+
+    first = flight.stream("key", tokens)
+    second = flight.stream("key", tokens)
+    gate.set()
+    assert list(first) == ["a", "b", "c"]
+    # The second subscriber receives the items produced before it started reading
+    assert list(second) == ["a", "b", "c"]
+    assert produced == ["a", "b", "c"]
+    assert flight.stats() == {"executed": 1, "shared": 1, "in_flight": 0}
+
+
+def test_stream_errors_reach_subscribers():
+    flight = SingleFlight("test")
+
+    def broken():
+        yield "a"
+        raise RuntimeError("stream failed")
+
+    iterator = flight.stream("key", broken)
+    assert next(iterator) == "a"
+    with pytest.raises(RuntimeError):
+        next(iterator)
+
+
+def test_url_key():
+    assert url_key("HTTP://Example.COM:80/#frag") == "http://example.com/"
+    assert url_key("https://example.com:443/a?b=1") == "https://example.com/a?b=1"
+    assert url_key("https://example.com:8443") == "https://example.com:8443/"
+    assert url_key("https://example.com/a?b=1") != url_key("https://example.com/a?b=2")
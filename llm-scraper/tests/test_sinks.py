@@ -0,0 +1,83 @@
+import csv
+import json
+
+import pytest
+
+from scrapper import PageContent, WebScraper
+from sinks import CSVSink, JSONLSink, LLMTextSink, PageSink
+
+
+def make_pages():
+    return [
+        PageContent(url=f"http://example.com/{i}", title=f"Page {i}", content=f"Content of page {i}.",
+                    links=["http://example.com/a", "http://example.com/b"], meta_description="Meta",
+                    headers=["H1: Title", "H2: Part"], timestamp="2024-01-01 00:00:00", status_code=200,
+                    content_hash=f"hash{i}", duplicate_of="http://example.com/0" if i == 2 else None)
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def scraper():
+    scraper = WebScraper(delay=0)
+    scraper.scraped_content = make_pages()
+    return scraper
+
+
+def write_all(sink, pages):
+    with sink:
+        for page in pages:
+            sink.write(page)
+
+
+def test_jsonl_sink_writes_one_page_per_line(tmp_path):
+    write_all(JSONLSink(tmp_path / "pages.jsonl"), make_pages())
+    lines = (tmp_path / "pages.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["url"] for line in lines] == [f"http://example.com/{i}" for i in range(3)]
+    assert json.loads(lines[0])["links"] == ["http://example.com/a", "http://example.com/b"]
+
+
+def test_csv_sink_matches_export(scraper, tmp_path):
+    write_all(CSVSink(tmp_path / "sink.csv"), scraper.scraped_content)
+    scraper.export_to_csv(str(tmp_path / "export.csv"))
+    assert (tmp_path / "sink.csv").read_bytes() == (tmp_path / "export.csv").read_bytes()
+    with open(tmp_path / "sink.csv", newline="", encoding="utf-8") as f:
+        assert next(csv.DictReader(f))["links"] == "http://example.com/a; http://example.com/b"
+
+
+def test_llm_text_sink_matches_export_and_skips_duplicates(scraper, tmp_path):
+    sink = LLMTextSink(tmp_path / "sink.txt")
+    write_all(sink, scraper.scraped_content)
+    scraper.export_for_llm(str(tmp_path / "export.txt"))
+    assert (tmp_path / "sink.txt").read_text(encoding="utf-8") == (tmp_path / "export.txt").read_text(encoding="utf-8")
+    assert sink.count == 2
+
+
+def test_pages_reach_disk_before_close(tmp_path):
+    sink = JSONLSink(tmp_path / "pages.jsonl", flush_every=2)
+    pages = make_pages()
+    sink.write(pages[0])
+    sink.write(pages[1])
+    assert len((tmp_path / "pages.jsonl").read_text(encoding="utf-8").splitlines()) == 2
+    sink.close()
+    sink.close()
+
+
+def test_sink_without_write_cannot_be_created(tmp_path):
+    class Incomplete(PageSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(tmp_path / "out.txt")
+    assert not (tmp_path / "out.txt").exists()
+    with pytest.raises(TypeError):
+        PageSink(tmp_path / "out.txt")
+
+
+def test_scraper_writes_crawled_pages_to_sinks(server, tmp_path):
+    server.routes["/"] = (200, {"Content-Type": "text/html"},
+                          b"<html><head><title>Home</title></head><body><p>Welcome to the docs.</p></body></html>")
+    with JSONLSink(tmp_path / "pages.jsonl") as sink:
+        WebScraper(delay=0, max_depth=0, sinks=[sink]).crawl_recursive(server.url("/"))
+    [line] = (tmp_path / "pages.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(line)["title"] == "Home"
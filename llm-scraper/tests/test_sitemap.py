@@ -0,0 +1,64 @@
+import gzip
+
+import pytest
+
+from sitemap import SitemapTooLarge, parse_lastmod, parse_sitemap, read_sitemaps
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+URLSET = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset {NS}>
+  <url><loc>https://example.com/a</loc><lastmod>2024-05-01</lastmod></url>
+  <url><loc> https://example.com/b </loc></url>
+</urlset>""".encode()
+INDEX = f"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex {NS}>
+  <sitemap><loc>https://example.com/pages.xml.gz</loc></sitemap>
+  <sitemap><loc>https://example.com/more.xml</loc></sitemap>
+</sitemapindex>""".encode()
+
+
+def test_parse_urlset():
+    entries, children = parse_sitemap(URLSET)
+    assert [entry.url for entry in entries] == ["https://example.com/a", "https://example.com/b"]
+    assert entries[0].lastmod == parse_lastmod("2024-05-01T00:00:00Z")
+    assert entries[1].lastmod is None
+    assert children == []
+
+
+def test_gzip_is_detected_by_content():
+    assert parse_sitemap(gzip.compress(URLSET)) == parse_sitemap(URLSET)
+
+
+def test_size_limit_applies_to_decompressed_data():
+    bomb = gzip.compress(b"<urlset>" + b" " * 5_000_000 + b"</urlset>")
+    assert len(bomb) < 10_000
+    with pytest.raises(SitemapTooLarge):
+        parse_sitemap(bomb, max_bytes=1_000_000)
+    with pytest.raises(SitemapTooLarge):
+        parse_sitemap(URLSET, max_bytes=100)
+
+
+def test_parse_lastmod():
+    assert parse_lastmod("2024-05-01T10:00:00.5Z") == parse_lastmod("2024-05-01T10:00:00Z") + 0.5
+    assert parse_lastmod("2024-05-01T12:00:00+02:00") == parse_lastmod("2024-05-01T10:00:00Z")
+    assert parse_lastmod("yesterday") is None
+    assert parse_lastmod(None) is None
+
+
+def test_read_sitemaps_follows_indexes_and_skips_bad_files():
+    documents = {
+        "https://example.com/sitemap.xml": INDEX,
+        "https://example.com/pages.xml.gz": gzip.compress(URLSET),
+        "https://example.com/more.xml": b"<urlset><url><loc>https://example.com/a</loc></url>",
+    }
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return documents[url]
+
+    entries = read_sitemaps(["https://example.com/sitemap.xml", "https://example.com/missing.xml"], fetch)
+    assert [entry.url for entry in entries] == ["https://example.com/a", "https://example.com/b"]
+    assert fetched == ["https://example.com/sitemap.xml", "https://example.com/missing.xml",
+                       "https://example.com/pages.xml.gz", "https://example.com/more.xml"]
+    assert len(read_sitemaps(["https://example.com/pages.xml.gz"], fetch, max_urls=1)) == 1
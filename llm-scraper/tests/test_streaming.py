@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+import summarizer_llm
+from summary_cache import SummaryCache
+
+ARTICLE = "Streaming summaries show the first words while the model is still writing. " * 5
+
+
+class FakePool:
+    """Stands in for the Ollama backend pool, streaming a fixed answer"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.calls = 0
+
+    def chat_stream(self, model, messages, **kwargs):
+        self.calls += 1
+        for token in self.tokens:
+            yield {"message": {"content": token}, "done": False}
+        yield {"message": {"content": ""}, "done": True, "eval_count": len(self.tokens)}
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    pool = FakePool(["Summaries ", "stream ", "token by token."])
+    monkeypatch.setitem(summarizer_llm.__dict__, "ollama_pool", pool)
+    monkeypatch.setitem(summarizer_llm.__dict__, "summary_cache", SummaryCache(tmp_path / "summaries.sqlite3"))
+    return pool
+
+
+@pytest.fixture
+def client(pool, monkeypatch):
+    import app
+    monkeypatch.setattr(app, "get_text_from_url", lambda url: ARTICLE)
+    return app.app.test_client()
+
+
+def events(response):
+    """(event, data) pairs of a server-sent event stream"""
+    parsed = []
+    for block in response.get_data(as_text=True).split("\n\n"):
+        if not block:
+            continue
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        parsed.append((fields.get("event", "message"), json.loads(fields["data"])))
+    return parsed
+
+
+def test_summarize_text_stream_yields_tokens_then_caches(pool):
+    assert list(summarizer_llm.summarize_text_stream(ARTICLE)) == pool.tokens
+    # The cached summary comes back in one piece without a model call
+    assert list(summarizer_llm.summarize_text_stream(ARTICLE)) == ["".join(pool.tokens)]
+    assert pool.calls == 1
+    assert list(summarizer_llm.summarize_text_stream(ARTICLE, use_cache=False)) == pool.tokens
+    assert pool.calls == 2
+
+
+def test_post_renders_the_page_and_streams_through_stream(client):
+    response = client.post("/", data={"url": "example.com/article"})
+    assert response.status_code == 200
+    assert b"EventSource" in response.data
+    assert b"/stream?url=https" in response.data
+
+
+def test_stream_sends_meta_tokens_and_done_in_order(client, pool):
+    response = client.get("/stream?url=https://example.com/article")
+    assert response.mimetype == "text/event-stream"
+    assert events(response) == [
+        ("meta", {"original_length": len(ARTICLE)}),
+        *(("message", {"token": token}) for token in pool.tokens),
+        ("done", {}),
+    ]
+
+
+@pytest.mark.parametrize("text", [None, "Too short."])
+def test_stream_reports_unusable_pages(client, monkeypatch, pool, text):
+    import app
+    monkeypatch.setattr(app, "get_text_from_url", lambda url: text)
+    [(event, data)] = events(client.get("/stream?url=https://example.com/article"))
+    assert event == "error" and data["error"]
+    assert pool.calls == 0
+
+
+def test_stream_reports_model_errors(client, pool):
+    def broken(model, messages, **kwargs):
+        raise ConnectionError("backend down")
+        yield
+
+    pool.chat_stream = broken
+    parsed = events(client.get("/stream?url=https://example.com/article&no_cache=1"))
+    assert [event for event, _ in parsed] == ["meta", "error"]
+    assert "backend down" in parsed[-1][1]["error"]
+
+
+def test_blocking_fallback(client, monkeypatch, pool):
+    import app
+    monkeypatch.setattr(app, "STREAM_SUMMARIES", False)
+    monkeypatch.setattr(summarizer_llm, "_generate", lambda prompt, text, model, use_cache: "A blocking summary.")
+    response = client.post("/", data={"url": "https://example.com/article"})
+    assert b"A blocking summary." in response.data
+    assert b"EventSource" not in response.data
@@ -0,0 +1,68 @@
+import gzip
+
+import pytest
+import requests
+
+from transport import ResponseRejected, ResponseTooLarge, UnsupportedContentType, fetch_limited
+
+HTML = {"Content-Type": "text/html; charset=utf-8"}
+
+
+@pytest.fixture
+def session():
+    with requests.Session() as session:
+        yield session
+
+
+def test_accepts_html(server, session):
+    server.routes["/page"] = (200, HTML, b"<html><body>hi</body></html>")
+    response = fetch_limited(session, server.url("/page"))
+    assert response.status_code == 200
+    assert response.text == "<html><body>hi</body></html>"
+
+
+def test_rejects_other_content_types(server, session):
+    server.routes["/file"] = (200, {"Content-Type": "application/pdf"}, b"%PDF-1.4")
+    with pytest.raises(UnsupportedContentType) as excinfo:
+        fetch_limited(session, server.url("/file"))
+    assert isinstance(excinfo.value, ResponseRejected)
+    assert excinfo.value.response.status_code == 200
+    # Any type passes when none are required
+    assert fetch_limited(session, server.url("/file"), content_types=None).content == b"%PDF-1.4"
+
+
+def test_type_is_only_checked_for_successful_responses(server, session):
+    server.routes["/missing"] = (404, {"Content-Type": "application/json"}, b'{"error": "missing"}')
+    response = fetch_limited(session, server.url("/missing"))
+    assert response.status_code == 404
+    assert response.json() == {"error": "missing"}
+
+
+def test_untyped_responses_are_sniffed(server, session):
+    server.routes["/binary"] = (200, {}, b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR")
+    server.routes["/text"] = (200, {}, b"<html>plain</html>")
+    with pytest.raises(UnsupportedContentType):
+        fetch_limited(session, server.url("/binary"))
+    assert fetch_limited(session, server.url("/text")).content == b"<html>plain</html>"
+
+
+def test_rejects_declared_length_before_reading(server, session):
+    server.routes["/big"] = (200, HTML, b"x" * 5000)
+    with pytest.raises(ResponseTooLarge):
+        fetch_limited(session, server.url("/big"), max_bytes=1000)
+    assert len(fetch_limited(session, server.url("/big"), max_bytes=None).content) == 5000
+
+
+def test_rejects_chunked_body_over_the_cap(server, session):
+    server.routes["/stream"] = (200, HTML, [b"x" * 600] * 5)
+    with pytest.raises(ResponseTooLarge):
+        fetch_limited(session, server.url("/stream"), max_bytes=1000, chunk_size=256)
+    assert len(fetch_limited(session, server.url("/stream"), max_bytes=3000).content) == 3000
+
+
+def test_cap_applies_to_decoded_body(server, session):
+    bomb = gzip.compress(b"a" * 100_000)
+    server.routes["/bomb"] = (200, dict(HTML, **{"Content-Encoding": "gzip"}), bomb)
+    assert len(bomb) < 1000
+    with pytest.raises(ResponseTooLarge):
+        fetch_limited(session, server.url("/bomb"), max_bytes=10_000)
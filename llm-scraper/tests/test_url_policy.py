@@ -0,0 +1,54 @@
+import pickle
+
+from url_policy import URLPolicy
+
+
+def test_normalize_drops_fragment_query_and_trailing_slash():
+    policy = URLPolicy(keep_query_params=["page"])
+    assert policy.normalize("https://example.com/docs?utm_source=x&page=2#top") == \
+        "https://example.com/docs?page=2"
+    assert policy.normalize("https://example.com/docs/?utm_source=x#top") == "https://example.com/docs"
+
+
+def test_skips_files_and_non_content_paths():
+    policy = URLPolicy()
+    assert policy.is_allowed("https://example.com/guide", "example.com")
+    assert not policy.is_allowed("https://example.com/report.PDF", "example.com")
+    assert not policy.is_allowed("https://example.com/admin/users", "example.com")
+    assert not policy.is_allowed("mailto:someone@example.com", "example.com")
+
+
+def test_domains():
+    same_site = URLPolicy()
+    assert not same_site.is_allowed("https://other.com/page", "example.com")
+    assert not same_site.is_allowed("https://docs.example.com/page", "example.com")
+
+    policy = URLPolicy(allowed_domains=["Example.com"])
+    assert policy.is_allowed("https://docs.example.com/page", "anything.org")
+    assert policy.is_allowed("https://example.com:8443/page", "anything.org")
+    assert not policy.is_allowed("https://badexample.com/page", "anything.org")
+
+
+def test_include_and_exclude():
+    policy = URLPolicy(include=[r"/blog/"], exclude=[r"/blog/drafts/"])
+    assert policy.is_allowed("https://example.com/blog/post", "example.com")
+    assert not policy.is_allowed("https://example.com/about", "example.com")
+    assert not policy.is_allowed("https://example.com/blog/drafts/post", "example.com")
+
+
+def test_resolve_links():
+    policy = URLPolicy()
+    hrefs = ["/a", "b", "../c/", "/a#section", "https://other.com/x", "/logo.png", " ", "http://[broken/"]
+    assert policy.resolve_links(hrefs, "https://example.com/dir/page") == [
+        "https://example.com/a",
+        "https://example.com/dir/b",
+        "https://example.com/c",
+    ]
+
+
+def test_policy_survives_pickling():
+    policy = URLPolicy(allowed_domains=["example.com"], exclude=["private"], keep_query_params=["id"])
+    policy.normalize("https://example.com/warm?id=1")
+    copy = pickle.loads(pickle.dumps(policy))
+    assert copy.cache_info().currsize == 0
+    assert copy.resolve_links(["/x?id=2&ref=y", "/private"], "https://example.com/") == ["https://example.com/x?id=2"]
@@ -0,0 +1,82 @@
+import pytest
+
+from scrapper import PageContent, WebScraper
+from urlset import BloomFilter, FingerprintSet, make_url_set, url_fingerprint
+
+URLS = [f"https://docs.example.com/section-{i % 7}/page-{i}.html" for i in range(5000)]
+UNSEEN = [f"https://docs.example.com/other/page-{i}.html" for i in range(5000)]
+
+
+def test_fingerprint_set_is_exact_and_grows():
+    urls = FingerprintSet(capacity=16)
+    for url in URLS:
+        urls.add(url)
+    urls.update(URLS[:100])
+    assert len(urls) == len(URLS)
+    assert all(url in urls for url in URLS)
+    assert not any(url in urls for url in UNSEEN)
+    assert urls.nbytes >= 8 * len(URLS)
+    assert sorted(urls.fingerprints()) == sorted(url_fingerprint(url) for url in URLS)
+
+
+def test_fingerprint_set_cannot_be_iterated_as_urls():
+    with pytest.raises(TypeError):
+        list(FingerprintSet(URLS[:3]))
+
+
+def test_fingerprint_set_clear():
+    urls = FingerprintSet(URLS[:10])
+    urls.clear()
+    assert len(urls) == 0 and URLS[0] not in urls
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    bloom.update(URLS)  # five times the first slice's capacity
+    assert all(url in bloom for url in URLS)
+    false_positives = sum(url in bloom for url in UNSEEN)
+    assert false_positives / len(UNSEEN) < 0.01
+    assert len(bloom) <= len(URLS)
+    bloom.clear()
+    assert URLS[0] not in bloom
+
+
+def test_bloom_filter_rejects_bad_error_rates():
+    with pytest.raises(ValueError):
+        BloomFilter(error_rate=1)
+
+
+def test_make_url_set():
+    assert make_url_set() == set()
+    assert isinstance(make_url_set("fingerprint"), FingerprintSet)
+    assert isinstance(make_url_set("bloom"), BloomFilter)
+    with pytest.raises(ValueError):
+        make_url_set("list")
+
+
+def links_page(url, links):
+    return PageContent(url=url, title="", content="", links=links, meta_description="", headers=[],
+                       timestamp="", status_code=200, content_hash="")
+
+
+@pytest.mark.parametrize("kind", ["exact", "fingerprint", "bloom"])
+def test_frontier_queues_each_url_once(kind):
+    scraper = WebScraper(delay=0, url_set=kind, respect_robots=False)
+    scraper.visited_urls.update(["https://a/", "https://a/1", "https://a/2"])
+    done = {
+        "https://a/1": links_page("https://a/1", ["https://a/3", "https://a/", "https://a/4"]),
+        "https://a/2": links_page("https://a/2", ["https://a/4", "https://a/3", "https://a/5"]),
+        "https://a/broken": None,
+    }
+    level = scraper._next_level(["https://a/1", "https://a/2", "https://a/broken"], done, depth=1, max_depth=2)
+    assert level == ["https://a/3", "https://a/4", "https://a/5"]
+    assert all(url in scraper.visited_urls for url in level)
+    # Nothing is queued beyond the maximum depth
+    assert scraper._next_level(["https://a/1"], done, depth=2, max_depth=2) == []
+
+
+def test_page_records_use_slots():
+    page = links_page("https://a/", [])
+    assert not hasattr(page, "__dict__")
+    with pytest.raises(AttributeError):
+        page.extra = 1
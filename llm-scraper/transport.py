@@ -0,0 +1,234 @@
+"""
+HTTP Transport Module
+
+One pooled, retrying HTTP client that the scraper, the summarizer and the
+web app share instead of opening new connections for every request.
+
+Features:
+- Keep-alive connection pools sized to the number of workers
+- Per-host connection limit: workers wait for a free connection instead of
+  opening more
+- Retries with exponential backoff on connection errors and 429/5xx
+  responses, honoring Retry-After
+- Request, retry and per-host pool statistics
+- Streamed downloads that reject non-HTML responses as soon as the headers
+  arrive and stop reading at a size cap, so a mislinked large file or an
+  endless response costs a few KB instead of memory for the whole body
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+MAX_RESPONSE_BYTES = 10 * 1024 * 1024  # decoded body size at which a download is abandoned
+CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 1024  # bytes checked for binary data when a response has no Content-Type
+
+
+class ResponseRejected(requests.RequestException):
+    """A streamed download was abandoned because of its type or size"""
+
+
+class UnsupportedContentType(ResponseRejected):
+    """The response is not of an accepted content type"""
+
+
+class ResponseTooLarge(ResponseRejected):
+    """The response body exceeds the size cap"""
+
+
+def fetch_limited(session: requests.Session,
+                  url: str,
+                  max_bytes: Optional[int] = MAX_RESPONSE_BYTES,
+                  content_types: Optional[Iterable[str]] = HTML_CONTENT_TYPES,
+                  chunk_size: int = CHUNK_SIZE,
+                  **kwargs) -> requests.Response:
+    """
+    GET a URL, streaming the body and checking it while it arrives
+
+    Successful responses whose Content-Type is not accepted are closed
+    right after the headers; responses without a Content-Type are rejected
+    if their first bytes contain binary data. Content-Encoding (gzip,
+    deflate) is decoded chunk by chunk, so the cap limits the decoded size
+    and compressed bombs are stopped too.
+
+    Args:
+        session: requests session to send the request with
+        url: URL to fetch
+        max_bytes: Largest accepted body (None for no limit)
+        content_types: Accepted media types of 2xx responses (None accepts any)
+        chunk_size: Bytes read per chunk
+        **kwargs: Additional arguments for session.get (headers, timeout, ...)
+
+    Returns:
+        Response with the body read into ``content``
+
+    Raises:
+        UnsupportedContentType: The response is not of an accepted type
+        ResponseTooLarge: Content-Length or the body exceeds max_bytes
+        requests.RequestException: The request failed
+    """
+    response = session.get(url, stream=True, **kwargs)
+    try:
+        content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        check_type = content_types is not None and 200 <= response.status_code < 300
+        if check_type and content_type and content_type not in content_types:
+            raise UnsupportedContentType(f"Unsupported content type {content_type!r}: {url}", response=response)
+
+        length = response.headers.get('Content-Length', '')
+        if max_bytes is not None and length.isdigit() and int(length) > max_bytes:
+            raise ResponseTooLarge(f"Response of {length} bytes exceeds {max_bytes} bytes: {url}",
+                                   response=response)
+
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size):
+            if check_type and not content_type and not body and _looks_binary(chunk[:SNIFF_BYTES]):
+                raise UnsupportedContentType(f"Binary response without a content type: {url}", response=response)
+            body += chunk
+            if max_bytes is not None and len(body) > max_bytes:
+                raise ResponseTooLarge(f"Response exceeds {max_bytes} bytes: {url}", response=response)
+    except BaseException:
+        # Drops the connection instead of reading the rest of the body
+        response.close()
+        raise
+
+    response._content = bytes(body)
+    response._content_consumed = True
+    return response
+
+
+def _looks_binary(head: bytes) -> bool:
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')):  # UTF-16 text
+        return False
+    return b'\x00' in head
+
+
+class HTTPTransport:
+    """
+    Shared requests session with pooled connections and retries
+
+    A single instance is safe to share between threads.
+    """
+
+    def __init__(self,
+                 pool_size: int = 10,
+                 max_hosts: int = 10,
+                 retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 retry_statuses: Iterable[int] = RETRY_STATUSES,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Create the session and its connection pools
+
+        Args:
+            pool_size: Connections kept open per host; also the maximum number
+                of concurrent requests to one host (size it to the worker count)
+            max_hosts: Number of hosts whose pools are kept
+            retries: Retries per request (0 disables retrying)
+            backoff_factor: Retry delays are backoff_factor * 2^(n-1) seconds
+            retry_statuses: Response codes that are retried
+            headers: Default headers sent with every request
+        """
+        self.pool_size = pool_size
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=tuple(retry_statuses),
+            allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=pool_size,
+                                   max_retries=retry, pool_block=True)
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        if headers:
+            self.session.headers.update(headers)
+        self.session.hooks['response'].append(self._record)
+
+        self.requests = 0
+        self.error_responses = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a GET request through the pool
+
+        Args:
+            url: URL to fetch
+            **kwargs: Arguments for requests.Session.get (headers, timeout, ...)
+
+        Returns:
+            Response of the last attempt
+        """
+        return self.session.get(url, **kwargs)
+
+    def fetch_limited(self, url: str, **kwargs) -> requests.Response:
+        """
+        Streamed GET with content-type and size checks (see fetch_limited)
+
+        Args:
+            url: URL to fetch
+            **kwargs: Arguments for fetch_limited and requests.Session.get
+
+        Returns:
+            Response with the body read into ``content``
+        """
+        return fetch_limited(self.session, url, **kwargs)
+
+    def _record(self, response: requests.Response, *args, **kwargs) -> None:
+        retries = getattr(response.raw, 'retries', None)
+        with self._lock:
+            self.requests += 1
+            if response.status_code >= 400:
+                self.error_responses += 1
+            if retries is not None:
+                self.retries += len(retries.history)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get transport statistics
+
+        Returns:
+            Dictionary with request/retry counters and, per host, the
+            connections opened, requests sent and idle pooled connections
+        """
+        hosts = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.host}:{pool.port}" if pool.port else pool.host
+            hosts[host] = {
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                # The pool queue holds None for connections not opened yet
+                "idle_connections": sum(1 for conn in list(pool.pool.queue) if conn is not None)
+                if pool.pool is not None else 0,
+            }
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "error_responses": self.error_responses,
+                "retries": self.retries,
+                "pool_size": self.pool_size,
+                "hosts": hosts,
+            }
+
+    def close(self) -> None:
+        """Close every pooled connection"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
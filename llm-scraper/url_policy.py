@@ -0,0 +1,196 @@
+"""
+URL Policy Module
+
+Decides which links a crawl follows and how URLs are normalized, with all
+rules compiled once when the policy is created.
+
+Features:
+- Normalization that drops fragments and all query parameters except a
+  configurable allow list
+- Allowed domains (the start page's domain by default, subdomains optional)
+- Include / exclude regular expressions on the normalized URL
+- Skipped file extensions and path patterns, matched in a single call each
+- LRU cache so every distinct URL is parsed and checked only once
+"""
+
+import re
+import sys
+from functools import lru_cache
+from typing import Iterable, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+DEFAULT_SKIP_EXTENSIONS = (
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.zip', '.rar', '.tar', '.gz', '.jpg', '.jpeg', '.png',
+    '.gif', '.svg', '.ico', '.css', '.js', '.xml', '.json'
+)
+
+DEFAULT_SKIP_PATTERNS = (
+    '/admin', '/login', '/logout', '/register', '/search',
+    '/download', '/upload', '/api/', '/ajax/'
+)
+
+
+def _compile_any(patterns: Iterable[str]) -> Optional[Pattern]:
+    """Combine regular expressions into one alternation (None if there are none)"""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+class URLPolicy:
+    """
+    Precompiled link normalization and filtering rules
+    """
+
+    def __init__(self,
+                 allowed_domains: Optional[Iterable[str]] = None,
+                 include: Iterable[str] = (),
+                 exclude: Iterable[str] = (),
+                 keep_query_params: Iterable[str] = (),
+                 skip_extensions: Iterable[str] = DEFAULT_SKIP_EXTENSIONS,
+                 skip_patterns: Iterable[str] = DEFAULT_SKIP_PATTERNS,
+                 cache_size: int = 65536):
+        """
+        Compile the policy
+
+        Args:
+            allowed_domains: Domains links may point to; a domain also allows
+                its subdomains. None restricts links to the domain of the page
+                they were found on.
+            include: Regexes of which a normalized URL must match at least one
+                (all URLs pass when empty)
+            exclude: Regexes that reject a normalized URL when any matches
+            keep_query_params: Query parameters kept by normalization (all
+                others, and the fragment, are dropped)
+            skip_extensions: Path suffixes of non-content files
+            skip_patterns: Path substrings of non-content pages
+            cache_size: Number of URLs whose normalization and checks are cached
+        """
+        self.allowed_domains = frozenset(d.lower().lstrip('.') for d in allowed_domains) \
+            if allowed_domains is not None else None
+        self._include = _compile_any(include)
+        self._exclude = _compile_any(exclude)
+        self.keep_query_params = frozenset(keep_query_params)
+        self._skip_extensions = tuple(ext.lower() for ext in skip_extensions)
+        self._skip_patterns = _compile_any(re.escape(pattern.lower()) for pattern in skip_patterns)
+        self._cache_size = cache_size
+        self._make_caches()
+
+    def _make_caches(self) -> None:
+        self._classify = lru_cache(maxsize=self._cache_size)(self._classify_uncached)
+        self._join = lru_cache(maxsize=self._cache_size)(urljoin)
+
+    def __getstate__(self):
+        # The caches cannot be pickled; a policy sent to another process starts with empty ones
+        state = self.__dict__.copy()
+        del state['_classify'], state['_join']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._make_caches()
+
+    def normalize(self, url: str) -> str:
+        """
+        Normalize a URL: drop the fragment and unwanted query parameters,
+        and the trailing slash
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            Normalized URL
+        """
+        return self._classify(url)[0]
+
+    def is_allowed(self, url: str, base_domain: str) -> bool:
+        """
+        Check a normalized URL against the policy
+
+        Args:
+            url: Normalized URL
+            base_domain: Domain of the page the link was found on
+
+        Returns:
+            True if the crawler should follow the URL
+        """
+        _, netloc, allowed = self._classify(url)
+        return allowed and self._domain_allowed(netloc, base_domain)
+
+    def resolve_links(self, hrefs: Iterable[str], base_url: str) -> List[str]:
+        """
+        Resolve, normalize and filter the links of a page in one pass
+
+        Args:
+            hrefs: Link targets as written in the page
+            base_url: URL of the page
+
+        Returns:
+            Normalized absolute URLs to follow, without duplicates, in page order
+        """
+        base = urlsplit(base_url)
+        base_domain = base.netloc
+        origin = f"{base.scheme}://{base.netloc}"
+        links = {}
+
+        for href in hrefs:
+            href = href.strip()
+            if not href:
+                continue
+            try:
+                if href.startswith(('http://', 'https://')):
+                    absolute_url = href
+                elif href.startswith('/') and not href.startswith('//'):
+                    # Root-relative links only depend on the origin, so every
+                    # page of the site shares their join results
+                    absolute_url = self._join(origin, href)
+                else:
+                    absolute_url = urljoin(base_url, href)
+            except ValueError:  # malformed link, e.g. a broken IPv6 host
+                continue
+
+            normalized, netloc, allowed = self._classify(absolute_url)
+            if allowed and self._domain_allowed(netloc, base_domain):
+                links[normalized] = None
+
+        return list(links)
+
+    def _domain_allowed(self, netloc: str, base_domain: str) -> bool:
+        if self.allowed_domains is None:
+            return netloc == base_domain
+        host = netloc.lower().rsplit('@', 1)[-1].split(':', 1)[0]
+        while host:
+            if host in self.allowed_domains:
+                return True
+            host = host.partition('.')[2]
+        return False
+
+    def _classify_uncached(self, url: str) -> Tuple[str, str, bool]:
+        """Normalize a URL and run the domain-independent checks on it"""
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return url, '', False
+
+        query = ''
+        if parts.query and self.keep_query_params:
+            query = urlencode([(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                               if key in self.keep_query_params])
+        normalized = sys.intern(urlunsplit((parts.scheme, parts.netloc, parts.path, query, '')).rstrip('/'))
+
+        # Checks see the normalized path, as the trailing slash is gone
+        path = (parts.path if query else parts.path.rstrip('/')).lower()
+        allowed = bool(
+            parts.scheme in ('http', 'https')
+            and not path.endswith(self._skip_extensions)
+            and not (self._skip_patterns and self._skip_patterns.search(path))
+            and not (self._include and not self._include.search(normalized))
+            and not (self._exclude and self._exclude.search(normalized))
+        )
+        return normalized, parts.netloc, allowed
+
+    def cache_info(self):
+        """Hit/miss statistics of the normalization cache"""
+        return self._classify.cache_info()
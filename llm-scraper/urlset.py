@@ -0,0 +1,243 @@
+"""
+Compact URL Sets
+
+Memory-efficient replacements for a ``set`` of URL strings, used by the
+crawlers to remember which URLs were already seen.
+
+Features:
+- 64-bit URL fingerprints (BLAKE2b) instead of full URL strings
+- FingerprintSet: exact membership on fingerprints in a flat open-addressing
+  table, 16-32 bytes per URL
+- BloomFilter: probabilistic membership with a configurable false-positive
+  rate, about 2 bytes per URL at 0.1%, growing as URLs are added
+- make_url_set() to pick an implementation by name
+"""
+
+import hashlib
+import math
+from array import array
+from typing import Iterable, Iterator, List, Tuple, Union
+
+
+def url_fingerprint(url: str) -> int:
+    """
+    Hash a URL to a 64-bit fingerprint
+
+    Args:
+        url: URL string
+
+    Returns:
+        Fingerprint as an integer
+    """
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class FingerprintSet:
+    """
+    Set of URLs stored as 64-bit fingerprints
+
+    Fingerprints live in an ``array('Q')`` hash table with linear probing, so
+    each URL costs 8 bytes per slot instead of a string object plus a set
+    entry. Two different URLs share a fingerprint with probability about
+    n² / 2⁶⁵ (below one in 300,000 at ten million URLs).
+
+    URLs cannot be recovered from their fingerprints, so iterating the set
+    raises TypeError instead of yielding integers; ``fingerprints()``
+    iterates over the hashes.
+    """
+
+    _MAX_LOAD = 0.5
+
+    def __init__(self, urls: Iterable[str] = (), capacity: int = 1024):
+        """
+        Create the set
+
+        Args:
+            urls: Initial URLs
+            capacity: Expected number of URLs (the table grows as needed)
+        """
+        self.capacity = capacity
+        self._allocate(capacity)
+        self.update(urls)
+
+    def _allocate(self, capacity: int) -> None:
+        size = 1 << max(4, math.ceil(max(1, capacity) / self._MAX_LOAD - 1).bit_length())
+        self._table = array('Q', [0]) * size
+        self._mask = size - 1
+        self._count = 0
+
+    def _slot(self, fingerprint: int) -> int:
+        table = self._table
+        mask = self._mask
+        i = fingerprint & mask
+        while table[i] and table[i] != fingerprint:
+            i = (i + 1) & mask
+        return i
+
+    @staticmethod
+    def _fingerprint(url: str) -> int:
+        # 0 marks an empty slot
+        return url_fingerprint(url) or 1
+
+    def add(self, url: str) -> None:
+        """Add a URL to the set"""
+        self.add_fingerprint(self._fingerprint(url))
+
+    def add_fingerprint(self, fingerprint: int) -> None:
+        """Add a precomputed, non-zero fingerprint to the set"""
+        i = self._slot(fingerprint)
+        if self._table[i]:
+            return
+        self._table[i] = fingerprint
+        self._count += 1
+        if self._count > len(self._table) * self._MAX_LOAD:
+            self._grow()
+
+    def _grow(self) -> None:
+        old, count = self._table, self._count
+        self._allocate(len(old))
+        for fingerprint in old:
+            if fingerprint:
+                self._table[self._slot(fingerprint)] = fingerprint
+        self._count = count
+
+    def update(self, urls: Iterable[str]) -> None:
+        """Add several URLs to the set"""
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        return bool(self._table[self._slot(self._fingerprint(url))])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        raise TypeError("FingerprintSet only stores URL hashes and cannot be iterated; "
+                        "use an exact set to list URLs, or fingerprints() for the hashes")
+
+    def fingerprints(self) -> Iterator[int]:
+        """Iterate over the stored fingerprints (URLs cannot be recovered)"""
+        return (fingerprint for fingerprint in self._table if fingerprint)
+
+    def clear(self) -> None:
+        """Remove every URL"""
+        self._allocate(self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the hash table in bytes"""
+        return self._table.itemsize * len(self._table)
+
+
+class BloomFilter:
+    """
+    Probabilistic URL set with a bounded false-positive rate
+
+    ``url in bloom`` is never wrong for URLs that were added, but may be
+    True for a URL that was not (so a crawler would skip it). The filter is
+    scalable: once ``capacity`` URLs are stored, a new slice with twice the
+    capacity and half the error rate is added, which keeps the overall
+    false-positive rate below ``error_rate`` however many URLs arrive.
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001, urls: Iterable[str] = ()):
+        """
+        Create the filter
+
+        Args:
+            capacity: Number of URLs the first slice is sized for
+            error_rate: Target false-positive rate
+            urls: Initial URLs
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.clear()
+        self.update(urls)
+
+    @staticmethod
+    def _new_slice(capacity: int, error_rate: float) -> Tuple[bytearray, int, int, int]:
+        bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return bytearray((bits + 7) // 8), bits, hashes, capacity
+
+    @staticmethod
+    def _hashes(url: str) -> Tuple[int, int]:
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+
+    @staticmethod
+    def _positions(h1: int, h2: int, bits: int, hashes: int) -> Iterator[int]:
+        # Kirsch-Mitzenmacher double hashing
+        return ((h1 + i * h2) % bits for i in range(hashes))
+
+    def add(self, url: str) -> None:
+        """Add a URL to the filter"""
+        h1, h2 = self._hashes(url)
+        if self._contains(h1, h2):
+            return
+        filled, bits, hashes, capacity = self._slices[-1]
+        if self._slice_count >= capacity:
+            self._slices.append(self._new_slice(capacity * 2, self.error_rate / 2 ** (len(self._slices) + 1)))
+            self._slice_count = 0
+            filled, bits, hashes, capacity = self._slices[-1]
+        for position in self._positions(h1, h2, bits, hashes):
+            filled[position >> 3] |= 1 << (position & 7)
+        self._slice_count += 1
+        self._count += 1
+
+    def _contains(self, h1: int, h2: int) -> bool:
+        for filled, bits, hashes, _ in self._slices:
+            if all(filled[position >> 3] >> (position & 7) & 1
+                   for position in self._positions(h1, h2, bits, hashes)):
+                return True
+        return False
+
+    def update(self, urls: Iterable[str]) -> None:
+        """Add several URLs to the filter"""
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        return self._contains(*self._hashes(url))
+
+    def __len__(self) -> int:
+        """Approximate number of URLs added (false positives are not counted twice)"""
+        return self._count
+
+    def clear(self) -> None:
+        """Remove every URL"""
+        self._slices: List[Tuple[bytearray, int, int, int]] = [self._new_slice(self.capacity, self.error_rate / 2)]
+        self._slice_count = 0
+        self._count = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit arrays in bytes"""
+        return sum(len(filled) for filled, _, _, _ in self._slices)
+
+
+URLSet = Union[set, FingerprintSet, BloomFilter]
+
+
+def make_url_set(kind: str = "exact", capacity: int = 100000, error_rate: float = 0.001) -> URLSet:
+    """
+    Create a URL set by name
+
+    Args:
+        kind: "exact" (a plain set of strings), "fingerprint" or "bloom"
+        capacity: Expected number of URLs
+        error_rate: False-positive rate of the Bloom filter
+
+    Returns:
+        Empty URL set supporting ``add``, ``in``, ``len``, ``update`` and ``clear``
+    """
+    if kind == "exact":
+        return set()
+    if kind == "fingerprint":
+        return FingerprintSet(capacity=capacity)
+    if kind == "bloom":
+        return BloomFilter(capacity, error_rate)
+    raise ValueError(f"Unknown URL set kind: {kind}")